@@ -0,0 +1,262 @@
+"""Measure the throughput of the fast paths in zerver/lib/event_schema.py
+against the plain checkers they stand in for.
+
+    python benchmark_checker.py                  # all benchmarks
+    python benchmark_checker.py presence_batch   # just some of them
+    python benchmark_checker.py --json
+
+The events are corpus events (see checker_corpus.py), scaled up to the
+sizes we see in big realms.  Benchmarks that replay a mix of corpus
+events repeat each one by its weight, so CHECKER_CORPUS can point at
+the weighted corpus from minimize_corpus.py.
+"""
+
+import argparse
+import json
+import platform
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import pydantic
+from pydantic import BaseModel
+
+from checker_corpus import read_calls, read_weighted_calls
+from zerver.lib.event_schema import (
+    check_message,
+    check_muted_topics,
+    check_presence_batch,
+    check_typing_start,
+    check_user_topic_batch,
+    make_checker,
+    set_payload_limits,
+    validate_event_with_model_type,
+)
+from zerver.lib.event_types import (
+    EventMessage,
+    EventMutedTopics,
+    EventPresence,
+    EventTypingStart,
+    EventUserTopic,
+)
+
+Checker = Callable[[], None]
+
+
+@dataclass
+class Benchmark:
+    items: int
+    unit: str
+    baseline: Checker
+    fast: Checker
+
+
+@dataclass
+class Result:
+    name: str
+    items: int
+    unit: str
+    baseline_per_sec: float
+    fast_per_sec: float
+    speedup: float
+
+
+BENCHMARKS: dict[str, Callable[[], Benchmark]] = {}
+
+
+def benchmark(f: Callable[[], Benchmark]) -> Callable[[], Benchmark]:
+    BENCHMARKS[f.__name__] = f
+    return f
+
+
+def corpus_event(checker_name: str) -> dict[str, Any]:
+    return next(c["args"][1] for c in read_calls() if c["name"] == checker_name)
+
+
+@benchmark
+def presence_batch() -> Benchmark:
+    """10k presence events, each with one or two clients."""
+    event = corpus_event("check_presence")
+    [entry] = event["presence"].values()
+    events = [
+        dict(
+            event,
+            user_id=i,
+            presence={
+                "website": dict(entry, timestamp=i),
+                **({"ZulipMobile": dict(entry, client="ZulipMobile")} if i % 2 else {}),
+            },
+        )
+        for i in range(10000)
+    ]
+
+    def baseline() -> None:
+        for event in events:
+            validate_event_with_model_type(event, EventPresence)
+
+    return Benchmark(
+        len(events), "events", baseline, lambda: check_presence_batch("events", events)
+    )
+
+
+@benchmark
+def presence_map() -> Benchmark:
+    """One presence event with 10k clients in its map."""
+    event = corpus_event("check_presence")
+    [entry] = event["presence"].values()
+    event = dict(event, presence={f"client{i}": dict(entry) for i in range(10000)})
+
+    def baseline() -> None:
+        validate_event_with_model_type(event, EventPresence)
+
+    def fast() -> None:
+        check_presence_batch("events", [event])
+
+    return Benchmark(len(event["presence"]), "entries", baseline, fast)
+
+
+@benchmark
+def typing() -> Benchmark:
+    """Typing events, to streams and to direct message recipients."""
+    events = [
+        c["args"][1] for c in read_weighted_calls() if c["name"] == "check_typing_start"
+    ] * 5000
+    check = make_checker(EventTypingStart)
+
+    def baseline() -> None:
+        for event in events:
+            check("event", event)
+
+    def fast() -> None:
+        for event in events:
+            check_typing_start("event", event)
+
+    return Benchmark(len(events), "events", baseline, fast)
+
+
+@benchmark
+def muted_topics() -> Benchmark:
+    """A muted_topics event for a user with 5000 muted topics."""
+    event = corpus_event("check_muted_topics")
+    event = dict(
+        event, muted_topics=[("Denmark", f"topic {i}", 1735619531 + i) for i in range(5000)]
+    )
+
+    def baseline() -> None:
+        validate_event_with_model_type(event, EventMutedTopics)
+
+    return Benchmark(
+        len(event["muted_topics"]), "rows", baseline, lambda: check_muted_topics("event", event)
+    )
+
+
+@benchmark
+def user_topic_batch() -> Benchmark:
+    """A replay of 5000 user_topic events."""
+    event = corpus_event("check_user_topic")
+    events = [dict(event, stream_id=i, topic_name=f"topic {i}") for i in range(5000)]
+
+    def baseline() -> None:
+        for event in events:
+            validate_event_with_model_type(event, EventUserTopic)
+
+    return Benchmark(
+        len(events), "events", baseline, lambda: check_user_topic_batch("events", events)
+    )
+
+
+def plain_check(event: dict[str, Any], model: type[BaseModel]) -> None:
+    """validate_event_with_model_type as it was before the fast paths,
+    the cache and the limits."""
+    allowed_fields = set(model.model_fields.keys())
+    if not set(event.keys()).issubset(allowed_fields):
+        raise ValueError(f"Extra fields not allowed: {set(event.keys()) - allowed_fields}")
+    model.model_validate(event, strict=True)
+
+
+@benchmark
+def message() -> Benchmark:
+    """check_message on message events, against the plain checker."""
+    events = [c["args"][1] for c in read_weighted_calls() if c["name"] == "check_message"] * 200
+
+    def baseline() -> None:
+        for event in events:
+            plain_check(event, EventMessage)
+
+    def fast() -> None:
+        for event in events:
+            check_message("event", event)
+
+    return Benchmark(len(events), "events", baseline, fast)
+
+
+@benchmark
+def message_limits() -> Benchmark:
+    """check_message with the payload limits on, against the plain checker."""
+    bench = message()
+
+    def fast() -> None:
+        set_payload_limits()
+        try:
+            bench.fast()
+        finally:
+            set_payload_limits(None)
+
+    return Benchmark(bench.items, bench.unit, bench.baseline, fast)
+
+
+def best_times(baseline: Checker, fast: Checker, repeat: int) -> tuple[float, float]:
+    """Best-of-repeat times for both sides, taken alternately so that
+    load on the machine hits the baseline and the fast path alike."""
+    baseline()  # warm up
+    fast()
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        for i, f in enumerate((baseline, fast)):
+            start = time.perf_counter()
+            f()
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best[0], best[1]
+
+
+def run(name: str, repeat: int) -> Result:
+    bench = BENCHMARKS[name]()
+    baseline, fast = best_times(bench.baseline, bench.fast, repeat)
+    return Result(
+        name,
+        bench.items,
+        bench.unit,
+        bench.items / baseline,
+        bench.items / fast,
+        baseline / fast,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", choices=[*BENCHMARKS], metavar="name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = [run(name, args.repeat) for name in args.names or BENCHMARKS]
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return
+    print(
+        f"Python {platform.python_version()}, pydantic {pydantic.VERSION},"
+        f" best of {args.repeat} alternating runs"
+    )
+    width = max(len(r.name) for r in results)
+    print(f"{'benchmark'.ljust(width)}  {'size':>14}  {'baseline/s':>12}  {'fast/s':>12}  speedup")
+    for r in results:
+        size = f"{r.items} {r.unit}"
+        print(
+            f"{r.name.ljust(width)}  {size:>14}  {r.baseline_per_sec:>12,.0f}"
+            f"  {r.fast_per_sec:>12,.0f}  {r.speedup:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Reading real_world_checker_calls.txt, the corpus of checker calls
+recorded from Zulip's test_events.py.
+
+Each line is a Python literal of the form
+
+    {"name": "check_foo", "args": (var_name, event, ...), "kwargs": {...}}
+
+and may refer to the few names in CONTEXT.
+
+Set CHECKER_CORPUS to read another file of the same form instead, like
+the minimal corpus from minimize_corpus.py.  Its weighted corpus gives
+each call a "weight" (how many calls of the full corpus it stands for),
+which read_weighted_calls() replays.
+"""
+
+import os
+from collections.abc import Iterator
+from typing import Any
+
+from zerver.lib.types import AnonymousSettingGroupDict
+
+CORPUS_PATH = os.environ.get("CHECKER_CORPUS", "real_world_checker_calls.txt")
+
+
+class VisibilityPolicyType:
+    def __init__(self):
+        self.MUTED = 1
+        self.UNMUTED = 2
+        self.FOLLOWED = 3
+        self.INHERIT = 0
+
+
+VisiblityPolicy = VisibilityPolicyType()
+
+
+class UserTopicType:
+    def __init__(self):
+        self.VisibilityPolicy = VisiblityPolicy
+
+
+UserTopic = UserTopicType()
+
+CONTEXT = {
+    "AnonymousSettingGroupDict": AnonymousSettingGroupDict,
+    "UserTopic": UserTopic,
+}
+
+
+def read_calls(path: str = CORPUS_PATH) -> Iterator[dict[str, Any]]:
+    with open(path) as file:
+        for line in file:
+            yield eval(line, dict(CONTEXT))
+
+
+def read_weighted_calls(path: str = CORPUS_PATH) -> Iterator[dict[str, Any]]:
+    """Like read_calls, but yields each call `weight` times (once, for
+    calls without one), without the weight key."""
+    for call in read_calls(path):
+        weight = call.pop("weight", 1)
+        for _ in range(weight):
+            yield call
+
+
+def read_events(path: str = CORPUS_PATH) -> Iterator[dict[str, Any]]:
+    for call in read_calls(path):
+        yield call["args"][1]
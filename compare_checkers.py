@@ -0,0 +1,196 @@
+"""Run the legacy data_types checkers (zerver/lib/event_schema_legacy.py)
+and the pydantic ones (zerver/lib/event_schema.py) side by side on the
+same events, and report where they disagree and what each one costs.
+
+    python compare_checkers.py                    # corpus + generated events
+    python compare_checkers.py -n 100 --invalid 0.5 --seed 3
+    python compare_checkers.py --json
+
+Corpus calls (see checker_corpus.py) go to the checker of the same name
+in both modules, with the same arguments.  Generated events (see
+generate_events.py) go to each legacy event schema and the model that
+generate_pydantic.py made from it.  Any exception counts as rejecting
+the event; we only compare accept/reject, not the error messages.
+
+Exits with status 1 if the two families disagree on any event.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import zerver.lib.event_schema
+import zerver.lib.event_schema_legacy
+from checker_corpus import read_calls
+from generate_events import EVENT_MODELS, EventGenerator
+from generate_pydantic import event_model_name
+from zerver.lib.data_types import DictType, check_data
+from zerver.lib.event_schema import validate_event_with_model_type
+
+LEGACY_SCHEMAS: dict[str, DictType] = {
+    event_model_name(name): data_type
+    for name, data_type in vars(zerver.lib.event_schema_legacy).items()
+    if name.endswith("_event") and not name.startswith("check_") and type(data_type) is DictType
+}
+
+
+@dataclass
+class Case:
+    source: str  # "corpus" or "generated"
+    name: str  # the checker or model
+    event: Any
+    legacy: Callable[[], None]
+    pydantic: Callable[[], None]
+
+
+@dataclass
+class Disagreement:
+    source: str
+    name: str
+    legacy: str
+    pydantic: str
+    event: str
+
+
+@dataclass
+class Cost:
+    events: int = 0
+    legacy_seconds: float = 0.0
+    pydantic_seconds: float = 0.0
+
+
+@dataclass
+class Report:
+    events: int = 0
+    disagreements: list[Disagreement] = field(default_factory=list)
+    costs: dict[str, Cost] = field(default_factory=dict)
+
+
+def corpus_cases() -> Iterator[Case]:
+    for call in read_calls():
+        name, args, kwargs = call["name"], call["args"], call["kwargs"]
+        legacy = getattr(zerver.lib.event_schema_legacy, name)
+        pydantic = getattr(zerver.lib.event_schema, name)
+        yield Case(
+            "corpus",
+            name,
+            args[1],
+            lambda legacy=legacy, args=args, kwargs=kwargs: legacy(*args, **kwargs),
+            lambda pydantic=pydantic, args=args, kwargs=kwargs: pydantic(*args, **kwargs),
+        )
+
+
+def generated_cases(count: int, seed: int, invalid: float) -> Iterator[Case]:
+    models = [model for name, model in EVENT_MODELS.items() if name in LEGACY_SCHEMAS]
+    for record in EventGenerator(seed).records(models, count, invalid):
+        name, event = record["model"], record["event"]
+        schema, model = LEGACY_SCHEMAS[name], EVENT_MODELS[name]
+        yield Case(
+            "generated",
+            name,
+            event,
+            lambda schema=schema, event=event: check_data(schema, "event", event),
+            lambda model=model, event=event: validate_event_with_model_type(event, model),
+        )
+
+
+def run_checker(check: Callable[[], None], repeat: int) -> tuple[str, float]:
+    """Returns the outcome ("ok" or the exception's name) and the best
+    time of repeat runs."""
+    best = float("inf")
+    outcome = "ok"
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            check()
+        except Exception as e:  # noqa: BLE001 (any error means "rejected")
+            outcome = type(e).__name__
+        best = min(best, time.perf_counter() - start)
+    return outcome, best
+
+
+def compare(cases: Iterator[Case], repeat: int = 3) -> Report:
+    report = Report()
+    for case in cases:
+        legacy, legacy_seconds = run_checker(case.legacy, repeat)
+        pydantic, pydantic_seconds = run_checker(case.pydantic, repeat)
+        report.events += 1
+        cost = report.costs.setdefault(case.name, Cost())
+        cost.events += 1
+        cost.legacy_seconds += legacy_seconds
+        cost.pydantic_seconds += pydantic_seconds
+        if (legacy == "ok") != (pydantic == "ok"):
+            report.disagreements.append(
+                Disagreement(case.source, case.name, legacy, pydantic, repr(case.event))
+            )
+    return report
+
+
+def print_report(report: Report, top: int) -> None:
+    print(f"{report.events} events, {len(report.disagreements)} disagreements")
+    by_kind = Counter((d.name, d.legacy, d.pydantic) for d in report.disagreements)
+    for (name, legacy, pydantic), count in by_kind.most_common(top):
+        print(f"  {count:>5}  {name}: legacy {legacy}, pydantic {pydantic}")
+
+    if report.disagreements:
+        print()
+        print("First disagreements:")
+    for d in report.disagreements[:top]:
+        event = d.event if len(d.event) <= 200 else d.event[:197] + "..."
+        print(f"  {d.source} {d.name}: legacy {d.legacy}, pydantic {d.pydantic}")
+        print(f"    {event}")
+    if len(report.disagreements) > top:
+        print(f"  ... and {len(report.disagreements) - top} more")
+
+    costs = sorted(report.costs.items(), key=lambda item: -item[1].legacy_seconds)
+    width = max(len(name) for name, _ in costs)
+    print()
+    print(
+        f"{'checker'.ljust(width)}  {'events':>6}  {'legacy us':>9}  {'pydantic us':>11}  speedup"
+    )
+    for name, cost in [*costs[:top], ("total", total_cost(report))]:
+        legacy = cost.legacy_seconds / cost.events * 1e6
+        pydantic = cost.pydantic_seconds / cost.events * 1e6
+        print(
+            f"{name.ljust(width)}  {cost.events:>6}  {legacy:>9.1f}  {pydantic:>11.1f}"
+            f"  {legacy / pydantic:>6.1f}x"
+        )
+
+
+def total_cost(report: Report) -> Cost:
+    return Cost(
+        sum(c.events for c in report.costs.values()),
+        sum(c.legacy_seconds for c in report.costs.values()),
+        sum(c.pydantic_seconds for c in report.costs.values()),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=20, help="generated events per model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--invalid", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20, help="rows to show of each table")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    def cases() -> Iterator[Case]:
+        yield from corpus_cases()
+        yield from generated_cases(args.count, args.seed, args.invalid)
+
+    report = compare(cases(), args.repeat)
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+    else:
+        print_report(report, args.top)
+    sys.exit(1 if report.disagreements else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Fuzz the event validators with adversarial (but valid) payloads, and
+report how their cost grows.
+
+    python fuzz_validators.py                           # every model
+    python fuzz_validators.py EventMessage EventSubmessage --examples 500
+    python fuzz_validators.py --max-size 1000000 --memory
+    python fuzz_validators.py --limits                  # with the payload limits on
+
+Needs Hypothesis (pip install hypothesis).
+
+Each example is an event drawn from the model's fields (see strategy())
+with one part blown up: a huge string, a huge list, a deeply nested or
+very wide value in a free-form field like `reactions` or `submessages`
+(`dict[str, object]` and the like).  None of these change any types,
+so validate_event_with_model_type must still accept the event, and do
+so in time (and, with --memory, memory) roughly linear in the size of
+the payload -- or, with --limits, reject it early for going over the
+payload limits (see zerver/lib/event_limits.py), which counts against
+the same budget.
+Hypothesis is told to go after the examples with the
+highest cost per unit of size, and shrinks any that break the budget
+or the validator to a minimal one.
+"""
+
+import argparse
+import copy
+import dataclasses
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass
+from types import NoneType, UnionType
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from hypothesis import HealthCheck, given, seed, settings, target
+from hypothesis import strategies as st
+from pydantic import BaseModel, ValidationError
+
+from generate_events import EVENT_MODELS, field_annotation, is_model
+from zerver.lib.event_limits import PayloadLimitError
+from zerver.lib.event_schema import set_payload_limits, validate_event_with_model_type
+from zerver.lib.event_types import check_url
+
+JSON_LEAVES = st.none() | st.booleans() | st.integers() | st.text(max_size=10)
+JSON_VALUES = st.recursive(
+    JSON_LEAVES,
+    lambda children: (
+        st.lists(children, max_size=3) | st.dictionaries(st.text(max_size=5), children, max_size=3)
+    ),
+    max_leaves=10,
+)
+
+
+def strategy(annotation: Any) -> st.SearchStrategy[Any]:
+    """Values that strict validation against annotation accepts."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        if any(getattr(m, "func", None) is check_url for m in annotation.__metadata__):
+            return st.integers(0, 10**6).map(lambda i: f"https://example.com/{i}")
+        return strategy(args[0])
+    if annotation is object:
+        return JSON_VALUES
+    scalars: dict[Any, st.SearchStrategy[Any]] = {
+        int: st.integers(-(2**63), 2**63 - 1),
+        str: st.text(max_size=20),
+        bool: st.booleans(),
+        float: st.floats(allow_nan=False, allow_infinity=False),
+        NoneType: st.none(),
+    }
+    if annotation in scalars:
+        return scalars[annotation]
+    if origin is Literal:
+        return st.sampled_from(args)
+    if origin in (Union, UnionType):
+        return st.one_of([strategy(arg) for arg in args])
+    if origin is list:
+        return st.lists(strategy(args[0]), max_size=3)
+    if origin is dict:
+        return st.dictionaries(strategy(args[0]), strategy(args[1]), max_size=3)
+    if origin is tuple:
+        return st.tuples(*map(strategy, args))
+    if is_model(annotation):
+        return model_strategy(annotation)
+    if dataclasses.is_dataclass(annotation):
+        return st.builds(
+            annotation,  # type: ignore[arg-type]
+            **{f.name: strategy(f.type) for f in dataclasses.fields(annotation)},
+        )
+    raise ValueError(f"no strategy for {annotation!r}")
+
+
+def model_strategy(model: type[BaseModel]) -> st.SearchStrategy[dict[str, Any]]:
+    required = {}
+    optional = {}
+    for key, field in model.model_fields.items():
+        target = required if field.is_required() else optional
+        target[key] = strategy(field_annotation(model, key))
+    return st.fixed_dictionaries(required, optional=optional)
+
+
+@dataclass
+class Slot:
+    path: tuple[str | int, ...]
+    kind: str
+    item: Any = None  # for huge_list, the item annotation
+
+
+def slots(value: Any, annotation: Any, path: tuple[str | int, ...] = ()) -> Iterator[Slot]:
+    """The places in a valid value where we can blow it up without
+    making it invalid."""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        # Validators (like check_url) may reject huge values.
+        return
+    if annotation is object:
+        yield Slot(path, "deep_nesting")
+    elif annotation is str and type(value) is str:
+        yield Slot(path, "huge_string")
+    elif origin in (Union, UnionType):
+        for arm in args:
+            if arm is not NoneType and (
+                (get_origin(arm) or arm) is type(value) or (is_model(arm) and type(value) is dict)
+            ):
+                yield from slots(value, arm, path)
+                return
+    elif origin is list and type(value) is list:
+        yield Slot(path, "huge_list", args[0])
+        if value:
+            yield from slots(value[0], args[0], (*path, 0))
+    elif origin is dict and type(value) is dict:
+        if args[0] is str and args[1] is object:
+            yield Slot(path, "wide_dict")
+        for key, item in list(value.items())[:1]:
+            yield from slots(item, args[1], (*path, key))
+    elif is_model(annotation) and type(value) is dict:
+        for key in annotation.model_fields:
+            if key in value:
+                yield from slots(value[key], field_annotation(annotation, key), (*path, key))
+
+
+def blow_up(slot: Slot, size: int, item: Any) -> Any:
+    if slot.kind == "huge_string":
+        return "é" * size
+    if slot.kind == "huge_list":
+        return [item] * size
+    if slot.kind == "wide_dict":
+        return {f"key{i}": i for i in range(size)}
+    nested: Any = {}
+    for i in range(size):
+        nested = {"x": nested} if i % 2 else [nested]
+    return nested
+
+
+def replace(event: dict[str, Any], path: tuple[str | int, ...], value: Any) -> dict[str, Any]:
+    event = copy.deepcopy(event)
+    container: Any = event
+    for key in path[:-1]:
+        container = container[key]
+    container[path[-1]] = value
+    return event
+
+
+def payload_size(value: Any) -> int:
+    """Containers count 1, plus 1 per item; strings count their length.
+    (Iterative, since the values can be very deep.)"""
+    size = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        size += 1
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list | tuple):
+            stack.extend(value)
+    return size
+
+
+@dataclass
+class Sample:
+    model: str
+    kind: str
+    path: str
+    size: int
+    seconds: float
+    peak_bytes: int | None
+    rejected: bool = False  # over the payload limits
+
+
+@dataclass
+class Budget:
+    seconds_per_unit: float = 2e-6
+    base_seconds: float = 0.05
+    bytes_per_unit: float = 400.0
+    base_bytes: int = 4 * 1024 * 1024
+
+
+class BudgetExceededError(AssertionError):
+    pass
+
+
+def measure(
+    event: dict[str, Any], model: type[BaseModel], memory: bool
+) -> tuple[float, int | None, bool]:
+    """Validates the event (which must pass, unless it's over the payload
+    limits), returning the time it took, with memory the peak of the
+    memory allocated, and whether it went over the limits."""
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    rejected = False
+    try:
+        validate_event_with_model_type(event, model)
+    except PayloadLimitError:
+        rejected = True
+    except (ValidationError, ValueError) as e:
+        raise AssertionError(f"rejected a valid event: {e}") from e
+    finally:
+        seconds = time.perf_counter() - start
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return seconds, peak, rejected
+
+
+class Fuzzer:
+    def __init__(self, max_size: int = 100_000, memory: bool = False, budget: Budget | None = None):
+        self.max_size = max_size
+        self.memory = memory
+        self.budget = budget or Budget()
+        self.samples: list[Sample] = []
+
+    def check(self, model: type[BaseModel], data: st.DataObject) -> None:
+        event = data.draw(model_strategy(model), label="event")
+        validate_event_with_model_type(event, model)
+        candidates = list(slots(event, model))
+        if not candidates:
+            return
+        slot = data.draw(st.sampled_from(candidates), label="slot")
+        # Log-uniform, so that big sizes come up as often as small ones.
+        bits = data.draw(st.integers(0, self.max_size.bit_length() - 1), label="bits")
+        size = min(
+            self.max_size, data.draw(st.integers(2**bits, 2 ** (bits + 1) - 1), label="size")
+        )
+        item = data.draw(strategy(slot.item), label="item") if slot.kind == "huge_list" else None
+        value = blow_up(slot, size, item)
+        event = replace(event, slot.path, value)
+
+        units = payload_size(event)
+        seconds, peak, rejected = measure(event, model, self.memory)
+        path = "/".join(map(str, slot.path))
+        self.samples.append(Sample(model.__name__, slot.kind, path, units, seconds, peak, rejected))
+        target(seconds / units, label=f"{slot.kind} seconds per unit")
+        if seconds > self.budget.base_seconds + self.budget.seconds_per_unit * units:
+            raise BudgetExceededError(f"{seconds:.3f}s for {units} units")
+        if peak is not None:
+            target(peak / units, label=f"{slot.kind} bytes per unit")
+            if peak > self.budget.base_bytes + self.budget.bytes_per_unit * units:
+                raise BudgetExceededError(f"{peak} bytes for {units} units")
+
+    def run(self, model: type[BaseModel], examples: int, seed_value: int) -> None:
+        @seed(seed_value)
+        @settings(
+            max_examples=examples,
+            deadline=None,
+            database=None,
+            suppress_health_check=list(HealthCheck),
+        )
+        @given(st.data())
+        def fuzz(data: st.DataObject) -> None:
+            self.check(model, data)
+
+        fuzz()
+
+    def scaling(self) -> list[tuple[Sample, float]]:
+        """For each model and kind, the biggest sample, and the marginal
+        cost per unit between the smallest sample and that one; the
+        most expensive first."""
+        by_kind: dict[tuple[str, str], list[Sample]] = {}
+        for sample in self.samples:
+            by_kind.setdefault((sample.model, sample.kind), []).append(sample)
+        rows = []
+        for samples in by_kind.values():
+            smallest = min(samples, key=lambda s: s.size)
+            biggest = max(samples, key=lambda s: s.size)
+            units = biggest.size - smallest.size
+            if units > 0:
+                rows.append((biggest, max(0.0, biggest.seconds - smallest.seconds) / units))
+        return sorted(rows, key=lambda row: -row[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("models", nargs="*", choices=[*EVENT_MODELS], metavar="model")
+    parser.add_argument("--examples", type=int, default=50, help="examples per model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-size", type=int, default=100_000)
+    parser.add_argument("--memory", action="store_true", help="also track peak memory (slower)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--limits", action="store_true", help="turn on the payload limits")
+    args = parser.parse_args()
+
+    if args.limits:
+        set_payload_limits()
+
+    fuzzer = Fuzzer(args.max_size, args.memory)
+    failures = 0
+    for name in args.models or EVENT_MODELS:
+        try:
+            fuzzer.run(EVENT_MODELS[name], args.examples, args.seed)
+        except AssertionError as e:
+            failures += 1
+            print(f"{name}: {e}", file=sys.stderr)
+
+    print(f"{len(fuzzer.samples)} samples, {failures} failing model(s)")
+    print("marginal cost per unit, up to the biggest sample:")
+    for s, cost in fuzzer.scaling()[: args.top]:
+        memory = f"  {s.peak_bytes / s.size:>7.1f} B/unit" if s.peak_bytes is not None else ""
+        rejected = " (over the limits)" if s.rejected else ""
+        print(
+            f"  {cost * 1e9:>8.1f} ns/unit  {s.size:>8} units  {s.seconds * 1e3:>8.2f} ms{memory}"
+            f"  {s.model} {s.kind} at {s.path or '(top)'}{rejected}"
+        )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Generate synthetic events from the models in zerver/lib/event_types.py,
+for benchmarks and load tests that need more (or bigger) events than
+the ~1100 in real_world_checker_calls.txt.
+
+    python generate_events.py > events.jsonl          # 10 of each event
+    python generate_events.py -n 1000 --invalid 0.2 EventMessage EventPresence
+    python generate_events.py --list-size subscribers=50000 EventSubscriptionAdd
+
+Each line is a JSON object like
+
+    {"model": "EventPresence", "valid": true, "mutation": null, "event": {...}}
+
+where invalid events are valid ones with one deliberate mutation (an
+extra key, a missing key or a value of the wrong type for some field),
+described in "mutation".  The output only depends on the arguments
+(including --seed).
+
+JSON has no tuples or dataclasses, so read the events back with
+read_generated(), which restores those from the models.
+"""
+
+import argparse
+import dataclasses
+import json
+import random
+import sys
+from collections.abc import Iterator
+from functools import cache
+from types import NoneType, UnionType
+from typing import IO, Annotated, Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+import zerver.lib.event_types
+from zerver.lib.event_types import check_url
+
+EVENT_MODELS: dict[str, type[BaseModel]] = {
+    name: model
+    for name, model in vars(zerver.lib.event_types).items()
+    if name.startswith("Event")
+    and not name.endswith("Base")
+    and isinstance(model, type)
+    and issubclass(model, BaseModel)
+}
+
+WORDS = ["denmark", "verona", "scotland", "lunch", "design", "backend", "zulip", "topic"]
+
+# Candidates for values of the wrong type; we use the first one that
+# the field rejects.
+WRONG_VALUES: list[Any] = [None, True, 1, 1.5, "x", [], {}, [None], {"x": None}]
+
+
+def is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def field_annotation(model: type[BaseModel], key: str) -> Any:
+    field = model.model_fields[key]
+    if field.metadata:
+        return Annotated[field.annotation, *field.metadata]
+    return field.annotation
+
+
+class EventGenerator:
+    def __init__(
+        self, seed: int = 0, list_sizes: dict[str, int] | None = None, max_list_size: int = 3
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.list_sizes = list_sizes or {}
+        self.max_list_size = max_list_size
+
+    def word(self) -> str:
+        return f"{self.rng.choice(WORDS)} {self.rng.randrange(1000)}"
+
+    def value(self, annotation: Any, key: str | None = None) -> Any:
+        rng = self.rng
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+
+        if origin is Annotated:
+            if any(getattr(m, "func", None) is check_url for m in annotation.__metadata__):
+                return f"https://example.com/{rng.choice(WORDS)}/{rng.randrange(1000)}"
+            return self.value(args[0], key)
+        if annotation is int:
+            return rng.randrange(1, 1_000_000)
+        if annotation is str or annotation is object:
+            return self.word()
+        if annotation is bool:
+            return rng.random() < 0.5
+        if annotation is float:
+            return round(rng.uniform(0, 2e9), 3)
+        if annotation is NoneType:
+            return None
+        if origin is Literal:
+            return rng.choice(args)
+        if origin in (Union, UnionType):
+            options = [arg for arg in args if arg is not NoneType]
+            if len(options) < len(args) and rng.random() < 0.2:
+                return None
+            return self.value(rng.choice(options), key)
+        if origin is list:
+            size = self.list_sizes.get(key or "", rng.randint(0, self.max_list_size))
+            return [self.value(args[0], key) for _ in range(size)]
+        if origin is dict:
+            size = self.list_sizes.get(key or "", rng.randint(0, self.max_list_size))
+            return {self.word(): self.value(args[1]) for _ in range(size)}
+        if origin is tuple:
+            return tuple(self.value(arg) for arg in args)
+        if is_model(annotation):
+            return self.model_value(annotation)
+        if dataclasses.is_dataclass(annotation):
+            return annotation(  # type: ignore[operator]
+                **{f.name: self.value(f.type, f.name) for f in dataclasses.fields(annotation)}
+            )
+        raise ValueError(f"don't know how to generate {annotation!r}")
+
+    def model_value(self, model: type[BaseModel]) -> dict[str, Any]:
+        return {
+            key: self.value(field_annotation(model, key), key)
+            for key, field in model.model_fields.items()
+            if field.is_required() or self.rng.random() < 0.5
+        }
+
+    def event(self, model: type[BaseModel]) -> dict[str, Any]:
+        return self.model_value(model)
+
+    def invalid_event(self, model: type[BaseModel]) -> tuple[dict[str, Any], str]:
+        """A valid event with one mutation that makes it invalid, and a
+        description of the mutation."""
+        event = self.event(model)
+        required = [key for key, field in model.model_fields.items() if field.is_required()]
+        choice = self.rng.randrange(3)
+        if choice == 1 and required:
+            key = self.rng.choice(required)
+            del event[key]
+            return event, f"missing {key}"
+        if choice == 2:
+            key = self.rng.choice(list(model.model_fields))
+            wrong_value = wrong_value_for(model, key)
+            if wrong_value is not None:
+                event[key] = wrong_value[0]
+                return event, f"wrong type for {key}"
+        event["bogus"] = self.word()
+        return event, "extra key bogus"
+
+    def records(
+        self, models: list[type[BaseModel]], count: int, invalid: float = 0.0
+    ) -> Iterator[dict[str, Any]]:
+        for _ in range(count):
+            for model in models:
+                mutation = None
+                if self.rng.random() < invalid:
+                    event, mutation = self.invalid_event(model)
+                else:
+                    event = self.event(model)
+                yield {
+                    "model": model.__name__,
+                    "valid": mutation is None,
+                    "mutation": mutation,
+                    "event": event,
+                }
+
+
+@cache
+def adapter(annotation: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(annotation)
+
+
+@cache
+def wrong_value_for(model: type[BaseModel], key: str) -> tuple[Any] | None:
+    """A value the field rejects, even once it has been through JSON
+    and read_generated() (so [] can't turn into a valid empty tuple)."""
+    annotation = field_annotation(model, key)
+    for value in WRONG_VALUES:
+        try:
+            adapter(annotation).validate_python(revive(annotation, value), strict=True)
+        except ValidationError:
+            return (value,)
+    return None
+
+
+@cache
+def needs_revival(annotation: Any) -> bool:
+    """Whether values of this type can hold tuples or dataclasses."""
+    if get_origin(annotation) is tuple or dataclasses.is_dataclass(annotation):
+        return True
+    if is_model(annotation):
+        return any(needs_revival(field.annotation) for field in annotation.model_fields.values())
+    return any(needs_revival(arg) for arg in get_args(annotation) if arg is not Ellipsis)
+
+
+def revive(annotation: Any, value: Any) -> Any:
+    """Undoes what JSON does to value (tuples become lists and
+    dataclasses dicts), going by the annotation it was generated for."""
+    if not needs_revival(annotation):
+        return value
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return revive(args[0], value)
+    if origin in (Union, UnionType):
+        for option in args:
+            if needs_revival(option):
+                revived = revive(option, value)
+                if revived is not value:
+                    return revived
+        return value
+    if origin is tuple and type(value) is list and len(value) == len(args):
+        return tuple(map(revive, args, value))
+    if origin is list and type(value) is list:
+        return [revive(args[0], item) for item in value]
+    if origin is dict and type(value) is dict:
+        return {key: revive(args[1], item) for key, item in value.items()}
+    if is_model(annotation) and type(value) is dict:
+        fields = annotation.model_fields
+        return {
+            key: revive(field_annotation(annotation, key), item) if key in fields else item
+            for key, item in value.items()
+        }
+    if dataclasses.is_dataclass(annotation) and type(value) is dict:
+        try:
+            return annotation(**value)  # type: ignore[operator]
+        except TypeError:
+            return value
+    return value
+
+
+def encode(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"can't encode {value!r}")
+
+
+def write_jsonl(records: Iterator[dict[str, Any]], file: IO[str]) -> None:
+    for record in records:
+        file.write(json.dumps(record, default=encode))
+        file.write("\n")
+
+
+def read_generated(path: str) -> Iterator[dict[str, Any]]:
+    with open(path) as file:
+        for line in file:
+            record = json.loads(line)
+            record["event"] = revive(EVENT_MODELS[record["model"]], record["event"])
+            yield record
+
+
+def parse_list_size(arg: str) -> tuple[str, int]:
+    key, _, size = arg.partition("=")
+    return key, int(size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("models", nargs="*", choices=[*EVENT_MODELS], metavar="model")
+    parser.add_argument("-n", "--count", type=int, default=10, help="events per model")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--invalid", type=float, default=0.0, help="fraction of invalid events (0 to 1)"
+    )
+    parser.add_argument(
+        "--list-size",
+        type=parse_list_size,
+        action="append",
+        default=[],
+        metavar="KEY=N",
+        help="size of the lists (or dicts) under KEY, like subscribers=50000",
+    )
+    parser.add_argument("--max-list-size", type=int, default=3)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    generator = EventGenerator(args.seed, dict(args.list_size), args.max_list_size)
+    models = [EVENT_MODELS[name] for name in args.models or EVENT_MODELS]
+    records = generator.records(models, args.count, args.invalid)
+    if args.output:
+        with open(args.output, "w") as file:
+            write_jsonl(records, file)
+    else:
+        write_jsonl(records, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""Export the JSON Schema of every event model in zerver/lib/event_types.py
+as one OpenAPI components document, or compare it with one on disk.
+
+    python generate_json_schema.py                     # (re)write event_openapi.json
+    python generate_json_schema.py --stdout
+    python generate_json_schema.py --compare api/zulip.yaml
+
+The document has each Event* model under components/schemas, along with
+the models they use (TopicLink, RealmUser and so on), with references
+of the form "#/components/schemas/TopicLink".
+
+Generating the schemas means importing every model and walking it, so
+we cache each model's schema under a digest of its class's source and
+of the source of everything it refers to in event_types.py (bases,
+nested models, validators), plus the pydantic version.  Re-runs only
+regenerate the models whose digest changed, and don't import
+event_types.py at all if none did.  Changes outside event_types.py
+(like the AnonymousSettingGroupDict dataclass) aren't tracked; use
+--no-cache after those.
+
+--compare diffs our components/schemas with the ones in the given
+OpenAPI file (JSON, or YAML if PyYAML is installed), and exits with
+status 1 if any differ.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterator
+from importlib.metadata import version
+from typing import Any
+
+EVENT_TYPES_PATH = "zerver/lib/event_types.py"
+OUTPUT_PATH = "event_openapi.json"
+CACHE_PATH = ".json_schema_cache.json"
+REF_TEMPLATE = "#/components/schemas/{model}"
+
+
+class SchemaConflictError(Exception):
+    pass
+
+
+def module_definitions(source: str) -> dict[str, ast.stmt]:
+    """The top-level statements of the module, by the names they bind."""
+    definitions: dict[str, ast.stmt] = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef | ast.FunctionDef):
+            definitions[node.name] = node
+        elif isinstance(node, ast.Assign | ast.AnnAssign):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    definitions[target.id] = node
+        elif isinstance(node, ast.Import | ast.ImportFrom):
+            for alias in node.names:
+                definitions[(alias.asname or alias.name).split(".")[0]] = node
+    return definitions
+
+
+def event_model_names(definitions: dict[str, ast.stmt]) -> list[str]:
+    # The same selection as generate_events.EVENT_MODELS, from the source.
+    return [
+        name
+        for name, node in definitions.items()
+        if isinstance(node, ast.ClassDef) and name.startswith("Event") and not name.endswith("Base")
+    ]
+
+
+def model_digests(source: str) -> dict[str, str]:
+    """A digest for each event model that changes whenever the model's
+    schema can (as far as event_types.py goes)."""
+    definitions = module_definitions(source)
+    segments = {
+        name: ast.get_source_segment(source, node) or "" for name, node in definitions.items()
+    }
+    references = {
+        name: {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and n.id in definitions}
+        - {name}
+        for name, node in definitions.items()
+    }
+
+    def closure(name: str) -> list[str]:
+        seen = {name}
+        todo = [name]
+        while todo:
+            for dep in references[todo.pop()]:
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        return sorted(seen)
+
+    pydantic_version = version("pydantic")
+    digests = {}
+    for name in event_model_names(definitions):
+        h = hashlib.sha256(pydantic_version.encode())
+        for dep in closure(name):
+            h.update(f"\0{dep}\0{segments[dep]}".encode())
+        digests[name] = h.hexdigest()
+    return digests
+
+
+def model_schema(name: str) -> dict[str, Any]:
+    import zerver.lib.event_types
+
+    model = getattr(zerver.lib.event_types, name)
+    return model.model_json_schema(ref_template=REF_TEMPLATE)
+
+
+def build_document(schemas: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Puts the models' schemas, and the $defs of the ones they use,
+    side by side under components/schemas."""
+    components: dict[str, Any] = {}
+
+    def add(name: str, schema: dict[str, Any]) -> None:
+        if name in components and components[name] != schema:
+            raise SchemaConflictError(f"two different schemas named {name}")
+        components[name] = schema
+
+    for name, schema in schemas.items():
+        schema = dict(schema)
+        for def_name, def_schema in schema.pop("$defs", {}).items():
+            add(def_name, def_schema)
+        add(name, schema)
+
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Zulip events", "version": "1.0"},
+        "paths": {},
+        "components": {"schemas": dict(sorted(components.items()))},
+    }
+
+
+def load_cache(cache_path: str) -> dict[str, Any]:
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path) as f:
+        return json.load(f)
+
+
+def generate_document(
+    cache_path: str | None = CACHE_PATH, source_path: str = EVENT_TYPES_PATH
+) -> tuple[dict[str, Any], list[str]]:
+    """Returns the document plus the names of the models whose schemas
+    had to be generated because their digest was not in the cache."""
+    with open(source_path) as f:
+        digests = model_digests(f.read())
+    old_cache = load_cache(cache_path) if cache_path else {}
+    cache = {}
+    generated = []
+    for name, digest in digests.items():
+        if digest in old_cache:
+            cache[digest] = old_cache[digest]
+        else:
+            cache[digest] = model_schema(name)
+            generated.append(name)
+
+    # Only the live entries are kept.
+    if cache_path and cache != old_cache:
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+    return build_document({name: cache[digest] for name, digest in digests.items()}), generated
+
+
+def render(document: dict[str, Any]) -> str:
+    return json.dumps(document, indent=2) + "\n"
+
+
+def write_if_changed(path: str, text: str) -> None:
+    old_text = None
+    if os.path.exists(path):
+        with open(path) as f:
+            old_text = f.read()
+    if text != old_text:
+        with open(path, "w") as f:
+            f.write(text)
+
+
+def load_openapi(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        if not path.endswith((".yaml", ".yml")):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError:
+            sys.exit(f"Reading {path} needs PyYAML (or convert it to JSON first).")
+        return yaml.safe_load(f)
+
+
+def diff(ours: Any, theirs: Any, pointer: str = "") -> Iterator[str]:
+    """Describes each place where the two JSON values differ, by JSON
+    pointer."""
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        for key in ours.keys() | theirs.keys():
+            path = f"{pointer}/{str(key).replace('~', '~0').replace('/', '~1')}"
+            if key not in theirs:
+                yield f"{path}: only in ours"
+            elif key not in ours:
+                yield f"{path}: only in theirs"
+            else:
+                yield from diff(ours[key], theirs[key], path)
+    elif isinstance(ours, list) and isinstance(theirs, list) and len(ours) == len(theirs):
+        for i, (a, b) in enumerate(zip(ours, theirs, strict=True)):
+            yield from diff(a, b, f"{pointer}/{i}")
+    elif ours != theirs:
+        yield f"{pointer}: {json.dumps(ours)} != {json.dumps(theirs)}"
+
+
+def compare_schemas(ours: dict[str, Any], theirs: dict[str, Any]) -> list[str]:
+    """The differences between the components/schemas of two OpenAPI
+    documents, sorted."""
+    return sorted(
+        diff(
+            ours.get("components", {}).get("schemas", {}),
+            theirs.get("components", {}).get("schemas", {}),
+            "/components/schemas",
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stdout", action="store_true", help="print instead of writing")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--compare", metavar="OPENAPI_FILE", help="diff against this file")
+    args = parser.parse_args()
+
+    document, generated = generate_document(None if args.no_cache else CACHE_PATH)
+    if args.compare:
+        differences = compare_schemas(document, load_openapi(args.compare))
+        for line in differences:
+            print(line)
+        print(f"{len(differences)} difference(s) from {args.compare}")
+        sys.exit(1 if differences else 0)
+    if args.stdout:
+        print(render(document), end="")
+        return
+
+    write_if_changed(args.output, render(document))
+    schemas = len(document["components"]["schemas"])
+    print(f"{args.output}: {schemas} schemas, regenerated {len(generated)} model(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,65 @@
-import zerver.lib.event_schema_legacy
-from zerver.lib.data_types import DictType, UnionType
+"""Generate zerver/lib/event_types.py from the data_types schemas in
+zerver/lib/event_schema_legacy.py.
 
-print(
-    """
-from typing import Annotated, Literal
+    python generate_pydantic.py            # (re)write event_types.py
+    python generate_pydantic.py --stdout   # just print the module
+
+It also writes zerver/lib/event_compact_types.py, which has a compact
+`__slots__` dataclass for every model, for consumers that hold lots of
+validated events in memory.
+
+The output is already formatted the way `ruff format` would format it,
+so the written file is a deterministic function of the schemas.
+
+Both files are cached under a digest of the descriptors' source: the
+top-level statements of event_schema_legacy.py other than function
+definitions, the functions they use, and the source of data_types.py
+and of this script.  If that digest hasn't changed, a re-run doesn't
+import the descriptors or build the model graph at all.  Otherwise we
+build the whole graph, since class names and shared bases depend on
+every descriptor, but rendered classes are cached by the content hash
+of their specs, so only the models that actually changed re-render.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+import zerver.lib.data_types
+from zerver.lib.data_types import (
+    CodegenContext,
+    DictType,
+    EnumType,
+    Equals,
+    FieldSpec,
+    ListType,
+    ModelSpec,
+    OptionalType,
+    StringDictType,
+    UnionType,
+    literal_repr,
+)
+
+EVENT_TYPES_PATH = "zerver/lib/event_types.py"
+LEGACY_PATH = "zerver/lib/event_schema_legacy.py"
+COMPACT_TYPES_PATH = "zerver/lib/event_compact_types.py"
+CACHE_PATH = ".pydantic_codegen_cache.json"
+LINE_LENGTH = 100
+
+HEADER = """from typing import Annotated, Literal
 
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from pydantic import AfterValidator, BaseModel
+from pydantic import AfterValidator, BaseModel, ConfigDict
 
 from zerver.lib.types import AnonymousSettingGroupDict
 
+
 def check_url(val: str) -> str:
     try:
         URLValidator()(val)
@@ -18,11 +67,85 @@ def check_url(val: str) -> str:
         raise AssertionError(f"{val} is not a URL")
     return val
 
+
 Url = Annotated[str, AfterValidator(check_url)]
 """
-)
 
-module_dict = zerver.lib.event_schema_legacy.__dict__
+
+COMPACT_HEADER = '''"""Compact, `__slots__`-based mirrors of the models in event_types.py.
+
+GENERATED by generate_pydantic.py; do not edit by hand.
+
+These are for holding lots of already-validated events in memory (event
+queues, replay buffers), where pydantic models are comparatively heavy.
+`from_validated_dict` does no validation at all; only call it on dicts
+that passed the corresponding event_schema checker.  Group settings
+(AnonymousSettingGroupDict) are passed through as they appear in the event.
+"""
+
+from __future__ import annotations
+
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Literal
+
+from zerver.lib.types import AnonymousSettingGroupDict
+
+_UNION_KEYS: dict[type, tuple[frozenset[str], frozenset[str]]] = {}
+
+
+def _from_union(d: Any, classes: tuple[type, ...]) -> Any:
+    # The value was already validated against the pydantic union, so we
+    # just need to find the (first) branch whose keys it matches.
+    if type(d) is not dict:
+        return d
+    keys = d.keys()
+    for cls in classes:
+        if cls not in _UNION_KEYS:
+            names = [f.name for f in fields(cls)]
+            required = [f.name for f in fields(cls) if f.default is MISSING]
+            _UNION_KEYS[cls] = (frozenset(required), frozenset(names))
+        required, names = _UNION_KEYS[cls]
+        if required <= keys <= names:
+            return cls.from_validated_dict(d)
+    return d
+'''
+
+
+@dataclass
+class ModelGraph:
+    """The classes of event_types.py, in emission order (every model
+    comes after the models it depends on)."""
+
+    models: dict[str, ModelSpec] = field(default_factory=dict)
+    event_models: list[str] = field(default_factory=list)
+    ctx: CodegenContext = field(default_factory=CodegenContext)
+
+    def all_fields(self, name: str) -> list:
+        # Like pydantic, overridden fields keep their base class position.
+        model = self.models[name]
+        if model.base not in self.models:
+            return list(model.fields)
+        fields = {f.name: f for f in self.all_fields(model.base)}
+        for field_spec in model.fields:
+            fields[field_spec.name] = field_spec
+        return list(fields.values())
+
+    def builds_own_schema(self, name: str) -> bool:
+        # Subclasses of abstract models have to opt back in to building.
+        model = self.models[name]
+        return model.base in self.models and self.models[model.base].abstract
+
+    def model_for(self, data_type) -> str | None:
+        name = self.ctx.name_for(data_type)
+        if name in self.models:
+            return name
+        return None
+
+    def dependencies(self, name: str) -> list[str]:
+        return [dep for dep in self.models[name].dependencies if dep in self.models]
+
+    def dependents(self, name: str) -> list[str]:
+        return [k for k in self.models if name in self.models[k].dependencies]
 
 
 def fix_name(k):
@@ -32,27 +155,526 @@ def fix_name(k):
         k = k.replace("_check_", "")
     if k.endswith("_type"):
         k = k.replace("_type", "")
-    k = k.replace('_', ' ').strip().title().replace(' ', '')
+    k = k.replace("_", " ").strip().title().replace(" ", "")
     return k
 
 
-for k in module_dict:
-    if k == "realm_user_person_types":
-        for flavor, data_type in module_dict[k].items():
-            data_type._name = fix_name("person_" + flavor)
-        continue
-
-    v = module_dict[k]
-    if type(v) is DictType:
-        if not getattr(v, "__is_for_checker", False):
-            v._name = fix_name(k)
-
-for k in sorted(module_dict):
-    if k.endswith("_event") and not k.startswith("check_"):
-        schema = module_dict[k]
-        orig_name = k
-        k = k.strip("_")
-        k = k.replace("_event", "")
-        k = k.replace('_', ' ').strip().title().replace(' ', '')
-        k = "Event" + k
-        schema.print_full_pydantic(name=k)
+def event_model_name(k):
+    k = k.strip("_")
+    k = k.replace("_event", "")
+    k = k.replace("_", " ").strip().title().replace(" ", "")
+    return "Event" + k
+
+
+def build_model_graph(module_dict=None, share_fields: bool = True) -> ModelGraph:
+    if module_dict is None:
+        import zerver.lib.event_schema_legacy
+
+        module_dict = zerver.lib.event_schema_legacy.__dict__
+
+    ctx = CodegenContext()
+
+    for k in module_dict:
+        if k == "realm_user_person_types":
+            for flavor, data_type in module_dict[k].items():
+                ctx.set_name(data_type, fix_name("person_" + flavor))
+            continue
+
+        v = module_dict[k]
+        if type(v) is DictType:
+            if not getattr(v, "__is_for_checker", False):
+                ctx.set_name(v, fix_name(k))
+
+    graph = ModelGraph(ctx=ctx)
+    for k in sorted(module_dict):
+        if k.endswith("_event") and not k.startswith("check_"):
+            name = event_model_name(k)
+            assert name not in ctx.emitted, f"{name} is already taken"
+            ctx.emitted.add(name)
+            module_dict[k].print_full_pydantic(name=name, ctx=ctx)
+            graph.event_models.append(name)
+
+    for model in ctx.models:
+        assert model.name not in graph.models, f"duplicate model {model.name}"
+        graph.models[model.name] = model
+
+    if share_fields:
+        extract_shared_bases(graph)
+    return graph
+
+
+# Models sharing at least this many leading fields get a common base.
+MIN_SHARED_PREFIX = 8
+
+
+def field_key(field_spec) -> tuple[str, str, bool]:
+    return (field_spec.name, field_spec.annotation, field_spec.optional)
+
+
+def literal_values(field_spec) -> list | None:
+    data_type = field_spec.data_type
+    if isinstance(data_type, Equals):
+        return [data_type.expected_value]
+    if isinstance(data_type, EnumType):
+        return sorted(data_type.valid_vals)
+    return None
+
+
+def camel_words(name: str) -> list[str]:
+    return re.findall(r"[A-Z][a-z0-9]*", name)
+
+
+def shared_base_name(names: list[str], taken: set[str]) -> str:
+    words = [camel_words(name) for name in names]
+    prefix = []
+    for group in zip(*words):
+        if len(set(group)) > 1:
+            break
+        prefix.append(group[0])
+    suffix: list[str] = []
+    for group in zip(*(reversed(w[len(prefix) :]) for w in words)):
+        if len(set(group)) > 1:
+            break
+        suffix.insert(0, group[0])
+    base = "".join(prefix + suffix)
+    if base in names or not suffix:
+        base = "".join(prefix)
+    name = base + "Base"
+    i = 2
+    while name in taken:
+        name = f"{base}Base{i}"
+        i += 1
+    return name
+
+
+def model_event_types(graph: ModelGraph) -> dict[str, set[object]]:
+    """The event types (the `type` of the events) each model is used in."""
+    event_types: dict[str, set[object]] = {name: set() for name in graph.models}
+    for name in graph.event_models:
+        type_field = next((f for f in graph.models[name].fields if f.name == "type"), None)
+        values = literal_values(type_field) if type_field is not None else None
+        todo = [name]
+        seen = set(todo)
+        while todo:
+            model = todo.pop()
+            event_types[model] |= set(values or [])
+            for dep in graph.dependencies(model):
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+    return event_types
+
+
+def find_shared_groups(graph: ModelGraph) -> list[tuple[list[str], int]]:
+    """Returns groups of models along with how many leading fields the
+    group can share.
+
+    Models with the same field names that only differ in Literal
+    annotations (typically `op`) share all their fields; other models
+    share a long common prefix of identical fields.  Only models used
+    in just the one event type can be grouped, and only with models of
+    the same type: fields that happen to match across event types
+    don't mean the same thing.
+    """
+    event_types = model_event_types(graph)
+    concrete = [
+        m
+        for m in graph.models.values()
+        if m.alias_of is None and not m.abstract and len(event_types[m.name]) == 1
+    ]
+    groups: list[tuple[list[str], int]] = []
+    grouped: set[str] = set()
+
+    by_shape: dict[tuple, list[ModelSpec]] = {}
+    for model in concrete:
+        shape = tuple(
+            field_key(f) if literal_values(f) is None else (f.name, "Literal", f.optional)
+            for f in model.fields
+        )
+        by_shape.setdefault((*event_types[model.name], shape), []).append(model)
+    for models in by_shape.values():
+        if len(models) < 2:
+            continue
+        same = sum(
+            len({field_key(f) for f in fields}) == 1 for fields in zip(*(m.fields for m in models))
+        )
+        if same >= 2:
+            groups.append(([m.name for m in models], len(models[0].fields)))
+            grouped |= {m.name for m in models}
+
+    for i, model in enumerate(concrete):
+        if model.name in grouped:
+            continue
+        members = [model]
+        prefix = len(model.fields)
+        for other in concrete[i + 1 :]:
+            if other.name in grouped or event_types[other.name] != event_types[model.name]:
+                continue
+            n = 0
+            for a, b in zip(model.fields, other.fields):
+                if field_key(a) != field_key(b):
+                    break
+                n += 1
+            if n >= MIN_SHARED_PREFIX:
+                members.append(other)
+                prefix = min(prefix, n)
+        if len(members) > 1:
+            groups.append(([m.name for m in members], prefix))
+            grouped |= {m.name for m in members}
+    return groups
+
+
+def extract_shared_bases(graph: ModelGraph) -> None:
+    """Pull fields that several models repeat into shared base classes."""
+    for names, prefix in find_shared_groups(graph):
+        members = [graph.models[name] for name in names]
+        shared = all(
+            len({field_key(f) for f in fields}) == 1
+            for fields in zip(*(m.fields[:prefix] for m in members))
+        )
+        whole = next((m for m in members if len(m.fields) == prefix), None)
+        if shared and whole is not None:
+            # One model is exactly the shared prefix, so the others
+            # can simply extend it.
+            base = whole
+        else:
+            base_fields = []
+            for fields in zip(*(m.fields[:prefix] for m in members)):
+                if len({field_key(f) for f in fields}) == 1:
+                    base_fields.append(fields[0])
+                    continue
+                values = []
+                for f in fields:
+                    values += [v for v in literal_values(f) if v not in values]
+                literal = f"Literal[{', '.join(literal_repr(v) for v in values)}]"
+                base_fields.append(FieldSpec(fields[0].name, literal, EnumType(values)))
+            dependencies = []
+            for m in members:
+                for dep in m.dependencies:
+                    if dep not in dependencies and any(dep in f.annotation for f in base_fields):
+                        dependencies.append(dep)
+            base = ModelSpec(
+                shared_base_name(names, set(graph.models)),
+                "BaseModel",
+                base_fields,
+                dependencies,
+                abstract=True,
+            )
+            # Emit the base right before the first of its subclasses.
+            models = {}
+            for name, model in graph.models.items():
+                if name == names[0]:
+                    models[base.name] = base
+                models[name] = model
+            graph.models = models
+
+        for m in members:
+            if m is base:
+                continue
+            own = m.fields[prefix:]
+            overrides = [
+                f for f, b in zip(m.fields[:prefix], base.fields) if field_key(f) != field_key(b)
+            ]
+            m.fields = overrides + own
+            m.base = base.name
+            m.dependencies = [base.name, *m.dependencies]
+
+
+def render_field(field_spec, annotation=None, default=None) -> str:
+    if annotation is None:
+        annotation = field_spec.annotation
+    if default is None:
+        default = " = None" if field_spec.optional else ""
+    line = f"    {field_spec.name}: {annotation}{default}"
+    if len(line) <= LINE_LENGTH or " | " not in annotation:
+        return line
+    # Wrap long unions the same way ruff does.
+    s = f"    {field_spec.name}: (\n"
+    for i, part in enumerate(annotation.split(" | ")):
+        s += f"        {'| ' if i else ''}{part}\n"
+    s += f"    ){default}"
+    return s
+
+
+def render_model(graph: ModelGraph, model: ModelSpec) -> str:
+    if model.alias_of is not None:
+        return f"{model.name} = {model.alias_of}\n"
+    s = f"class {model.name}({model.base}):\n"
+    if model.abstract:
+        s += "    model_config = ConfigDict(defer_build=True)\n"
+    elif graph.builds_own_schema(model.name):
+        s += "    model_config = ConfigDict(defer_build=False)\n"
+    if not model.fields:
+        s += "    pass\n"
+    elif s.count("\n") > 1:
+        s += "\n"
+    for field_spec in model.fields:
+        if field_spec.optional and field_spec is next(f for f in model.fields if f.optional):
+            s += "    # TODO: fix types to avoid optional fields\n"
+        s += render_field(field_spec) + "\n"
+    return s
+
+
+def render_module(graph: ModelGraph, cache: dict[str, str] | None = None) -> tuple[str, list[str]]:
+    """Returns the module source plus the names of the models that had
+    to be rendered because their digest was not in the cache."""
+    if cache is None:
+        cache = {}
+    rendered = []
+    blocks = [HEADER]
+    for model in graph.models.values():
+        key = model_cache_key(graph, model)
+        if key not in cache:
+            cache[key] = render_model(graph, model)
+            rendered.append(model.name)
+        blocks.append(cache[key])
+    return "\n\n".join(blocks), rendered
+
+
+def model_cache_key(graph: ModelGraph, model: ModelSpec) -> str:
+    return model.digest() + ":" + str(graph.builds_own_schema(model.name))
+
+
+def compact_converter(graph: ModelGraph, data_type, expr: str, union_name: str) -> str | None:
+    """Returns an expression turning the validated value `expr` into its
+    compact form, or None if the value can be used as is."""
+    name = graph.model_for(data_type)
+    if name is not None:
+        return f"{name}.from_validated_dict({expr})"
+    if isinstance(data_type, ListType):
+        sub = compact_converter(graph, data_type.sub_type, "x", union_name)
+        return None if sub is None else f"[{sub} for x in {expr}]"
+    if isinstance(data_type, StringDictType):
+        sub = compact_converter(graph, data_type.value_type, "x", union_name)
+        return None if sub is None else f"{{k: {sub} for k, x in {expr}.items()}}"
+    if isinstance(data_type, OptionalType):
+        sub = compact_converter(graph, data_type.sub_type, expr, union_name)
+        return None if sub is None else f"None if {expr} is None else {sub}"
+    if isinstance(data_type, UnionType) and compact_union_branches(graph, data_type):
+        return f"_from_union({expr}, {union_name})"
+    return None
+
+
+def compact_union_branches(graph: ModelGraph, data_type) -> list[str]:
+    if isinstance(data_type, ListType | OptionalType):
+        return compact_union_branches(graph, data_type.sub_type)
+    if isinstance(data_type, StringDictType):
+        return compact_union_branches(graph, data_type.value_type)
+    if isinstance(data_type, UnionType):
+        branches = [graph.model_for(t) for t in data_type.sub_types]
+        return [b for b in branches if b is not None]
+    return []
+
+
+def compact_annotation(annotation: str) -> str:
+    # Url is just a validated str; group settings keep their real type.
+    return re.sub(r"\bUrl\b", "str", annotation)
+
+
+def render_compact_model(graph: ModelGraph, model: ModelSpec) -> str:
+    if model.alias_of is not None:
+        return f"{model.name} = {model.alias_of}\n"
+    # Unlike in event_types.py, every class is flat: slots don't mix
+    # well with overriding fields from a base class.
+    all_fields = graph.all_fields(model.name)
+    s = f"@dataclass(slots=True)\nclass {model.name}:\n"
+    for field_spec in all_fields:
+        default = " = None" if field_spec.optional else ""
+        annotation = compact_annotation(field_spec.annotation)
+        s += render_field(field_spec, annotation, default) + "\n"
+
+    if all_fields:
+        s += "\n"
+    s += "    @classmethod\n"
+    s += f"    def from_validated_dict(cls, d: dict[str, Any]) -> {model.name}:\n"
+
+    # Converted values go through locals, which keeps every line short
+    # enough that the output needs no further formatting.
+    args = []
+    unions = []
+    for field_spec in all_fields:
+        key = field_spec.name
+        union_name = f"_{model.name}_{key}"
+        branches = compact_union_branches(graph, field_spec.data_type)
+        if branches:
+            unions.append((union_name, branches))
+        conv = compact_converter(graph, field_spec.data_type, "v", union_name)
+        if field_spec.optional:
+            if conv is None:
+                args.append(f'd.get("{key}")')
+                continue
+            s += f"        {key} = None\n"
+            s += f'        if (v := d.get("{key}")) is not None:\n'
+            s += f"            {key} = {conv}\n"
+        else:
+            if conv is None:
+                args.append(f'd["{key}"]')
+                continue
+            s += f'        v = d["{key}"]\n'
+            s += f"        {key} = {conv}\n"
+        args.append(key)
+
+    if args:
+        s += "        return cls(\n"
+        for arg in args:
+            s += f"            {arg},\n"
+        s += "        )\n"
+    else:
+        s += "        return cls()\n"
+
+    for union_name, branches in unions:
+        s += f"\n\n{union_name} = (\n"
+        for branch in branches:
+            s += f"    {branch},\n"
+        s += ")\n"
+
+    for line in s.splitlines():
+        assert len(line) <= LINE_LENGTH, line
+    return s
+
+
+def render_compact_module(graph: ModelGraph, cache: dict[str, str] | None = None) -> str:
+    if cache is None:
+        cache = {}
+    blocks = [COMPACT_HEADER]
+    for model in graph.models.values():
+        if model.abstract:
+            continue
+        key = compact_cache_key(graph, model)
+        if key not in cache:
+            cache[key] = render_compact_model(graph, model)
+        blocks.append(cache[key])
+
+    s = "COMPACT_MODELS: dict[str, Any] = {\n"
+    for name in graph.event_models:
+        s += f'    "{name}": {name},\n'
+    s += "}\n"
+    blocks.append(s)
+    return "\n\n".join(blocks)
+
+
+def compact_cache_key(graph: ModelGraph, model: ModelSpec) -> str:
+    # The converters depend on the models the fields refer to (and
+    # subclasses repeat their base's fields), so key on those too.
+    deps = [*graph.dependencies(model.name), model.base]
+    key = "compact:" + model.digest()
+    key += ":" + ",".join(graph.models[dep].digest() for dep in deps if dep in graph.models)
+    return key
+
+
+def write_if_changed(path: str, source: str) -> None:
+    old_source = None
+    if os.path.exists(path):
+        with open(path) as f:
+            old_source = f.read()
+    if source != old_source:
+        with open(path, "w") as f:
+            f.write(source)
+
+
+def descriptor_source(source: str) -> str:
+    """The parts of the legacy module that the descriptors come from:
+    every top-level statement but the function definitions (which are
+    mostly the checkers), plus the functions those statements use."""
+    body = ast.parse(source).body
+    functions = {node.name: node for node in body if isinstance(node, ast.FunctionDef)}
+    used = [node for node in body if not isinstance(node, ast.FunctionDef)]
+    todo = list(used)
+    while todo:
+        for node in ast.walk(todo.pop()):
+            if isinstance(node, ast.Name) and node.id in functions:
+                function = functions.pop(node.id)
+                used.append(function)
+                todo.append(function)
+    used.sort(key=lambda node: node.lineno)
+    return "\n".join(ast.get_source_segment(source, node) or "" for node in used)
+
+
+def generator_digest() -> str:
+    h = hashlib.sha256()
+    for path in [__file__, zerver.lib.data_types.__file__]:
+        with open(path) as f:
+            h.update(f.read().encode())
+    return h.hexdigest()
+
+
+def source_digest(legacy_path: str = LEGACY_PATH) -> str:
+    h = hashlib.sha256(generator_digest().encode())
+    with open(legacy_path) as f:
+        h.update(descriptor_source(f.read()).encode())
+    return h.hexdigest()
+
+
+def load_cache(cache_path: str) -> dict[str, Any]:
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path) as f:
+        cache = json.load(f)
+    # (Caches from before we kept the sources are just dropped.)
+    return cache if "models" in cache else {}
+
+
+def generate(
+    path: str = EVENT_TYPES_PATH,
+    cache_path: str | None = CACHE_PATH,
+    compact_path: str | None = COMPACT_TYPES_PATH,
+    legacy_path: str = LEGACY_PATH,
+) -> list[str] | None:
+    """Write event_types.py (and event_compact_types.py), returning the
+    names of the models that were re-rendered, or None if the
+    descriptors' source hadn't changed, so that we didn't even build
+    the graph.  Files are only touched if their contents change."""
+    old_cache = load_cache(cache_path) if cache_path else {}
+    digest = source_digest(legacy_path)
+    outputs = old_cache.get("outputs", {})
+    if old_cache.get("source") == digest and (compact_path is None or "compact" in outputs):
+        write_if_changed(path, outputs["event_types"])
+        if compact_path:
+            write_if_changed(compact_path, outputs["compact"])
+        return None
+
+    graph = build_model_graph()
+    generator = generator_digest()
+    # Rendered models are only good for the code that rendered them.
+    models = dict(old_cache.get("models", {})) if old_cache.get("generator") == generator else {}
+    source, rendered = render_module(graph, models)
+    write_if_changed(path, source)
+    outputs = {"event_types": source}
+    live = {model_cache_key(graph, model) for model in graph.models.values()}
+
+    if compact_path:
+        outputs["compact"] = render_compact_module(graph, models)
+        write_if_changed(compact_path, outputs["compact"])
+        live |= {compact_cache_key(graph, model) for model in graph.models.values()}
+
+    if cache_path:
+        # Only keep the entries that are still live.
+        models = {k: v for k, v in models.items() if k in live}
+        cache = {"source": digest, "generator": generator, "outputs": outputs, "models": models}
+        if cache != old_cache:
+            with open(cache_path, "w") as f:
+                json.dump(cache, f, indent=1, sort_keys=True)
+    return rendered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stdout", action="store_true", help="print instead of writing")
+    parser.add_argument("--output", default=EVENT_TYPES_PATH)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    if args.stdout:
+        source, _ = render_module(build_model_graph())
+        print(source, end="")
+        return
+
+    rendered = generate(args.output, cache_path=None if args.no_cache else CACHE_PATH)
+    if rendered is None:
+        print(f"{args.output}: descriptors unchanged")
+    else:
+        print(f"{args.output}: re-rendered {len(rendered)} model(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Shrink real_world_checker_calls.txt to one call per distinct shape.
+
+    python minimize_corpus.py                      # just the summary
+    python minimize_corpus.py -o minimal.txt --weighted mix.txt
+    python minimize_corpus.py --by property        # split on event["property"] too
+
+Calls are grouped by checker name and the structural shape of their
+event: the keys of every dict, the types of the values, and list
+lengths bucketed as 0, 1 or many (see shape()).  The checker's other
+arguments (like check_realm_update's property name) count as they are,
+since they pick the checker's branches.  With --by KEY, the values
+under KEY (at any depth) count as they are too.
+
+The minimal corpus keeps the first call of each group, in corpus
+order, as the original line.  The weighted one is the same calls with
+a "weight" key holding the size of their group, so benchmarks can
+replay the production mix without the near-duplicates; both read back
+with checker_corpus.read_calls(), e.g. via CHECKER_CORPUS=minimal.txt.
+"""
+
+import argparse
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from checker_corpus import CONTEXT, CORPUS_PATH
+
+Shape = Any
+
+
+def shape(value: Any, by: frozenset[str] = frozenset()) -> Shape:
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    (str(key), repr(value[key]) if key in by else shape(value[key], by))
+                    for key in value
+                )
+            ),
+        )
+    if isinstance(value, list | tuple):
+        # The distinct shapes of the items, in a stable order.
+        items = sorted({shape(item, by) for item in value}, key=repr)
+        size = "0" if not value else "1" if len(value) == 1 else "many"
+        return (type(value).__name__, size, tuple(items))
+    return type(value).__name__
+
+
+def call_shape(call: dict[str, Any], by: frozenset[str] = frozenset()) -> Shape:
+    [_, event, *args] = call["args"]
+    return (call["name"], shape(event, by), repr(args), repr(sorted(call["kwargs"].items())))
+
+
+@dataclass
+class Group:
+    line: str  # the first call's line in the corpus
+    name: str
+    count: int = 0
+
+
+@dataclass
+class Minimized:
+    calls: int = 0
+    groups: dict[Shape, Group] = field(default_factory=dict)
+
+    def by_checker(self) -> list[tuple[str, int, int]]:
+        """(checker, calls, distinct shapes), biggest first."""
+        calls: Counter[str] = Counter()
+        shapes: Counter[str] = Counter()
+        for group in self.groups.values():
+            calls[group.name] += group.count
+            shapes[group.name] += 1
+        return [(name, count, shapes[name]) for name, count in calls.most_common()]
+
+
+def minimize(lines: Iterable[str], by: frozenset[str] = frozenset()) -> Minimized:
+    result = Minimized()
+    for line in lines:
+        call = eval(line, dict(CONTEXT))
+        key = call_shape(call, by)
+        group = result.groups.setdefault(key, Group(line, call["name"]))
+        group.count += 1
+        result.calls += 1
+    return result
+
+
+def minimal_lines(result: Minimized) -> Iterator[str]:
+    for group in result.groups.values():
+        yield group.line
+
+
+def weighted_lines(result: Minimized) -> Iterator[str]:
+    for group in result.groups.values():
+        # Every line is a dict literal starting with "{'name': ".
+        assert group.line.startswith("{")
+        yield "{'weight': " + str(group.count) + ", " + group.line[1:]
+
+
+def write_lines(path: str, lines: Iterable[str]) -> None:
+    with open(path, "w") as file:
+        file.writelines(line.rstrip("\n") + "\n" for line in lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=CORPUS_PATH)
+    parser.add_argument("-o", "--output", help="where to write the minimal corpus")
+    parser.add_argument("--weighted", help="where to write the weighted corpus")
+    parser.add_argument(
+        "--by", action="append", default=[], metavar="KEY", help="also split on the values of KEY"
+    )
+    parser.add_argument("--top", type=int, default=20, help="checkers to list")
+    args = parser.parse_args()
+
+    with open(args.corpus) as file:
+        result = minimize(file, frozenset(args.by))
+    if args.output:
+        write_lines(args.output, minimal_lines(result))
+    if args.weighted:
+        write_lines(args.weighted, weighted_lines(result))
+
+    print(f"{result.calls} calls, {len(result.groups)} distinct shapes", file=sys.stderr)
+    for name, calls, shapes in result.by_checker()[: args.top]:
+        print(f"  {calls:>5} -> {shapes:>4}  {name}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
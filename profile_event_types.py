@@ -0,0 +1,224 @@
+"""Report how complex (and how expensive) each model in
+zerver/lib/event_types.py is.
+
+    python profile_event_types.py                    # sorted by schema size
+    python profile_event_types.py --sort validate_us --limit 20
+    python profile_event_types.py --no-timing --json
+
+For every model with a validator we report the size of its pydantic core
+schema (in nodes), the number of unions and the widest union, how deeply
+models nest inside it, how many Python-level validators (like
+AfterValidator(check_url)) it runs, and the measured time to build its
+schema and to validate the samples for it that we find in
+real_world_checker_calls.txt.
+"""
+
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+import zerver.lib.event_types
+from checker_corpus import read_events
+
+# Keys of core schema nodes that hold metadata rather than sub-schemas.
+NON_SCHEMA_KEYS = {"metadata", "config", "cls", "ref", "function", "serialization"}
+
+COLUMNS = [
+    "nodes",
+    "unions",
+    "max_fanout",
+    "depth",
+    "py_validators",
+    "build_ms",
+    "validate_us",
+    "samples",
+]
+
+
+@dataclass
+class ModelProfile:
+    model: str
+    nodes: int
+    unions: int
+    max_fanout: int
+    depth: int
+    py_validators: int
+    build_ms: float | None = None
+    validate_us: float | None = None
+    samples: int = 0
+
+
+def get_models() -> dict[str, type[BaseModel]]:
+    models = {}
+    for name, value in vars(zerver.lib.event_types).items():
+        if (
+            isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and value.__module__ == zerver.lib.event_types.__name__
+            and value.__name__ == name
+            # Abstract bases (defer_build=True) never get a validator.
+            and value.__pydantic_complete__
+        ):
+            models[name] = value
+    return models
+
+
+def measure_schema(schema: dict[str, Any]) -> dict[str, int]:
+    stats = {"nodes": 0, "unions": 0, "max_fanout": 0, "depth": 0, "py_validators": 0}
+    definitions: dict[str, Any] = {}
+
+    def walk(node: Any, model_depth: int, seen_refs: frozenset[str]) -> None:
+        if isinstance(node, list):
+            for item in node:
+                walk(item, model_depth, seen_refs)
+            return
+        if not isinstance(node, dict):
+            return
+
+        node_type = node.get("type")
+        if isinstance(node_type, str):
+            stats["nodes"] += 1
+            if node_type == "model":
+                model_depth += 1
+                stats["depth"] = max(stats["depth"], model_depth)
+            elif node_type in ("union", "tagged-union"):
+                choices = node["choices"]
+                stats["unions"] += 1
+                stats["max_fanout"] = max(stats["max_fanout"], len(choices))
+            elif node_type.startswith("function-"):
+                stats["py_validators"] += 1
+            elif node_type == "definitions":
+                for definition in node["definitions"]:
+                    definitions[definition["ref"]] = definition
+                walk(node["schema"], model_depth, seen_refs)
+                return
+            elif node_type == "definition-ref":
+                ref = node["schema_ref"]
+                if ref in definitions and ref not in seen_refs:
+                    walk(definitions[ref], model_depth, seen_refs | {ref})
+                return
+
+        for key, value in node.items():
+            if key not in NON_SCHEMA_KEYS:
+                walk(value, model_depth, seen_refs)
+
+    walk(schema, 0, frozenset())
+    return stats
+
+
+def collect_samples(models: dict[str, type[BaseModel]]) -> dict[str, list[dict[str, Any]]]:
+    """Find corpus data for every model, including nested ones, by
+    validating each event and pairing the resulting instances with the
+    raw dicts they came from."""
+    samples: dict[str, list[dict[str, Any]]] = {name: [] for name in models}
+    event_models = {k: v for k, v in models.items() if k.startswith("Event")}
+
+    def add(instance: Any, raw: Any) -> None:
+        if isinstance(instance, BaseModel):
+            name = type(instance).__name__
+            if name in samples:
+                samples[name].append(raw)
+            for key in type(instance).model_fields:
+                if key in raw:
+                    add(getattr(instance, key), raw[key])
+        elif isinstance(instance, list):
+            for item, raw_item in zip(instance, raw):
+                add(item, raw_item)
+        elif isinstance(instance, dict):
+            for key, item in instance.items():
+                add(item, raw[key])
+
+    for event in read_events():
+        for model in event_models.values():
+            if not set(event) <= set(model.model_fields):
+                continue
+            try:
+                instance = model.model_validate(event, strict=True)
+            except ValidationError:
+                continue
+            add(instance, event)
+    return samples
+
+
+def time_build(model: type[BaseModel], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.model_rebuild(force=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def time_validate(model: type[BaseModel], samples: list[dict[str, Any]], calls: int) -> float:
+    rounds = max(1, calls // len(samples))
+    validate = model.model_validate
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for sample in samples:
+            validate(sample, strict=True)
+    return (time.perf_counter() - start) / (rounds * len(samples)) * 1e6
+
+
+def profile_models(timing: bool = True, repeat: int = 3, calls: int = 2000) -> list[ModelProfile]:
+    models = get_models()
+    samples = collect_samples(models) if timing else {}
+    profiles = []
+    for name, model in models.items():
+        profile = ModelProfile(model=name, **measure_schema(model.__pydantic_core_schema__))
+        if timing:
+            profile.build_ms = time_build(model, repeat)
+            profile.samples = len(samples[name])
+            if samples[name]:
+                profile.validate_us = time_validate(model, samples[name], calls)
+        profiles.append(profile)
+    return profiles
+
+
+def format_table(profiles: list[ModelProfile]) -> str:
+    def cell(value: Any) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value)
+
+    width = max(len(p.model) for p in profiles)
+    lines = ["model".ljust(width) + "".join(c.rjust(14) for c in COLUMNS)]
+    for p in profiles:
+        row = asdict(p)
+        lines.append(p.model.ljust(width) + "".join(cell(row[c]).rjust(14) for c in COLUMNS))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sort", choices=["model", *COLUMNS], default="nodes")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--no-timing", action="store_true", help="only report schema shape")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    profiles = profile_models(timing=not args.no_timing)
+
+    def sort_key(p: ModelProfile) -> Any:
+        value = getattr(p, args.sort)
+        if args.sort == "model":
+            return value
+        # Biggest first, with unmeasured models at the end.
+        return -1 if value is None else value
+
+    profiles.sort(key=sort_key, reverse=args.sort != "model")
+    profiles = profiles[: args.limit]
+
+    if args.json:
+        print(json.dumps([asdict(p) for p in profiles], indent=2))
+    else:
+        print(format_table(profiles))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Report which models, union branches and optional fields a stream of
+events exercises (see zerver/lib/event_coverage.py).
+
+    python shape_coverage.py                          # the corpus
+    python shape_coverage.py --events events.jsonl    # from generate_events.py
+    python shape_coverage.py --json
+
+Corpus calls go through the checkers in zerver/lib/event_schema.py as
+in test_checker.py, so the sub-models they validate separately (like
+the person flavors of realm_user/update) show up as models of their
+own.  Generated events are validated against the model they were
+generated for; the invalid ones are skipped.
+"""
+
+import argparse
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import zerver.lib.event_schema
+from checker_corpus import CORPUS_PATH, read_calls
+from generate_events import EVENT_MODELS, read_generated
+from zerver.lib.event_coverage import ShapeCoverage
+from zerver.lib.event_schema import (
+    disable_shape_coverage,
+    enable_shape_coverage,
+    validate_event_with_model_type,
+)
+
+
+def replay_corpus(path: str) -> None:
+    for call in read_calls(path):
+        checker = getattr(zerver.lib.event_schema, call["name"])
+        checker(*call["args"], **call["kwargs"])
+
+
+def replay_generated(path: str) -> None:
+    for record in read_generated(path):
+        if record["valid"]:
+            validate_event_with_model_type(record["event"], EVENT_MODELS[record["model"]])
+
+
+def collect(corpus: str = CORPUS_PATH, events: str | None = None) -> ShapeCoverage:
+    coverage = enable_shape_coverage()
+    try:
+        if events:
+            replay_generated(events)
+        else:
+            replay_corpus(corpus)
+    finally:
+        disable_shape_coverage()
+    return coverage
+
+
+def report_lines(summary: dict[str, Any]) -> Iterator[str]:
+    for name, model in summary.items():
+        yield f"{name}: {model['events']} events"
+        for key, branches in model["branches"].items():
+            counts = ", ".join(f"{branch} {count}" for branch, count in branches.items())
+            yield f"    {key}: {counts}"
+        seen = {key: count for key, count in model["optional"].items() if count}
+        if seen:
+            counts = ", ".join(f"{key} {count}" for key, count in seen.items())
+            yield f"    optional: {counts}"
+        unseen = [key for key, count in model["optional"].items() if not count]
+        if unseen:
+            yield f"    optional, never present: {', '.join(unseen)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--events", help="JSONL from generate_events.py, instead of the corpus")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    summary = collect(args.corpus, args.events).summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for line in report_lines(summary):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
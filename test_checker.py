@@ -1,3 +1,4 @@
+from checker_corpus import read_calls
 from zerver.lib.event_schema import (
     check_alert_words,
     check_attachment_add,
@@ -72,35 +73,7 @@ from zerver.lib.event_schema import (
     check_user_topic,
 )
 
-from zerver.lib.types import AnonymousSettingGroupDict
 
-
-class VisibilityPolicyType:
-    def __init__(self):
-        self.MUTED = 1
-        self.UNMUTED = 2
-        self.FOLLOWED = 3
-        self.INHERIT = 0
-
-
-VisiblityPolicy = VisibilityPolicyType()
-
-
-class UserTopicType:
-    def __init__(self):
-        self.VisibilityPolicy = VisiblityPolicy
-
-
-UserTopic = UserTopicType()
-
-context = dict(
-    AnonymousSettingGroupDict=AnonymousSettingGroupDict,
-    UserTopic=UserTopic,
-)
-
-with open("real_world_checker_calls.txt", "r") as file:
-    for i, line in enumerate(file):
-        c = eval(line, context)
-        f = globals()[c["name"]]
-        # print(i, c["name"])
-        f(*c["args"], **c["kwargs"])
+for c in read_calls():
+    f = globals()[c["name"]]
+    f(*c["args"], **c["kwargs"])
@@ -0,0 +1,948 @@
+"""Checks that the fast paths in zerver/lib/event_schema.py accept and
+reject exactly what plain model validation does.
+
+    python test_fast_paths.py    (or: python -m pytest test_fast_paths.py)
+
+The events here are corpus events (see checker_corpus.py), blown up
+or broken in the ways that matter for each fast path.
+"""
+
+import copy
+import json
+import os
+import tempfile
+from array import array
+from collections.abc import Callable, Iterator
+from typing import Annotated, Any, get_args
+
+import pytest
+from pydantic import AfterValidator, BaseModel, ValidationError
+from pydantic_core import to_json
+
+import zerver.lib.event_schema
+import zerver.lib.event_types
+from checker_corpus import read_calls, read_events
+from generate_events import EVENT_MODELS, EventGenerator
+from zerver.lib.event_columnar import COLUMNAR_MIN_ROWS, ColumnarValidator
+from zerver.lib.event_fast_check import UnsupportedAnnotationError, compile_fast_check
+from zerver.lib.event_int_lists import check_int_list
+from zerver.lib.event_limits import DEFAULT_PAYLOAD_LIMITS, PayloadLimitError, PayloadLimits
+from zerver.lib.event_policy import PolicyTable, check_shape
+from zerver.lib.event_schema import (
+    RealmEmojiUpdateChecker,
+    _check_muted_topics,
+    _check_subscription_add,
+    _check_user_group_update,
+    _message_fanout,
+    check_delete_message,
+    check_message,
+    check_message_fanout,
+    check_muted_topics,
+    check_presence_batch,
+    check_realm_emoji_update,
+    check_realm_event,
+    check_realm_linkifiers,
+    check_realm_update_dict,
+    check_realm_user_update,
+    check_subscription_add,
+    check_subscription_peer_add,
+    check_typing_start,
+    check_typing_stop,
+    check_update_message,
+    check_user_group_add,
+    check_user_group_update,
+    check_user_topic,
+    check_user_topic_batch,
+    disable_shape_coverage,
+    disable_validation_cache,
+    disable_validation_policy,
+    enable_shape_coverage,
+    enable_validation_cache,
+    enable_validation_policy,
+    event_model_to_json,
+    make_checker,
+    make_id_list_checker,
+    set_payload_limits,
+    single_field_models,
+    validate_event_model,
+    validate_event_with_model_type,
+)
+from zerver.lib.event_streaming import StreamingValidator
+from zerver.lib.event_types import (
+    BotServicesOutgoing,
+    EventCustomProfileFields,
+    EventDefaultStreamGroups,
+    EventDeleteMessage,
+    EventMessage,
+    EventMutedTopics,
+    EventPresence,
+    EventRealmBotAdd,
+    EventRealmLinkifiers,
+    EventRealmPlaygrounds,
+    EventSubscriptionAdd,
+    EventSubscriptionPeerAdd,
+    EventTypingStart,
+    EventTypingStop,
+    EventUpdateMessage,
+    EventUserGroupAdd,
+    EventUserTopic,
+    Presence,
+    UserGroupData,
+)
+
+# Values of the wrong type for (almost) every field we have.
+BAD_VALUES: list[Any] = [True, 1, 1.5, "x", None, [1, "a"], {"a": 1}]
+
+
+def outcome(checker: Callable[[str, dict[str, Any]], None], event: dict[str, Any]) -> str:
+    try:
+        checker("event", event)
+    except ValidationError:
+        return "ValidationError"
+    except ValueError:
+        return "ValueError"
+    return "ok"
+
+
+def assert_same(
+    fast: Callable[[str, dict[str, Any]], None],
+    slow: Callable[[str, dict[str, Any]], None],
+    event: dict[str, Any],
+) -> str:
+    expected = outcome(slow, event)
+    assert outcome(fast, event) == expected, event
+    return expected
+
+
+def find_event(type: str, op: str) -> dict[str, Any]:
+    for event in read_events():
+        if event.get("type") == type and event.get("op") == op and event.get("subscriptions"):
+            return event
+    raise AssertionError(f"no {type}/{op} event in the corpus")
+
+
+def big_subscription_add(n: int = 2 * COLUMNAR_MIN_ROWS) -> dict[str, Any]:
+    event = copy.deepcopy(find_event("subscription", "add"))
+    [row, *_] = event["subscriptions"]
+    event["subscriptions"] = [dict(row, stream_id=i, name=f"stream {i}") for i in range(n)]
+    return event
+
+
+def test_subscription_add_columnar_accepts() -> None:
+    # (Short lists of subscriptions skip the columns, but not the envelopes.)
+    for n in [12, 2 * COLUMNAR_MIN_ROWS]:
+        event = big_subscription_add(n)
+        assert assert_same(check_subscription_add, _check_subscription_add, event) == "ok"
+
+        # Optional fields may be missing from some rows only.
+        for key in list(event["subscriptions"][0]):
+            sparse = copy.deepcopy(event)
+            del sparse["subscriptions"][3][key]
+            assert_same(check_subscription_add, _check_subscription_add, sparse)
+
+
+def test_subscription_add_columnar_rejects() -> None:
+    for n in [12, 2 * COLUMNAR_MIN_ROWS]:
+        event = big_subscription_add(n)
+        for key in event["subscriptions"][0]:
+            for value in BAD_VALUES:
+                broken = copy.deepcopy(event)
+                broken["subscriptions"][7][key] = value
+                assert_same(check_subscription_add, _check_subscription_add, broken)
+
+        for row in [None, [], "x"]:
+            broken = copy.deepcopy(event)
+            broken["subscriptions"][5] = row
+            assert assert_same(check_subscription_add, _check_subscription_add, broken) != "ok"
+
+        broken = copy.deepcopy(event)
+        broken["subscriptions"][9]["bogus"] = 1
+        assert_same(check_subscription_add, _check_subscription_add, broken)
+
+        broken = dict(event, bogus=1)
+        assert assert_same(check_subscription_add, _check_subscription_add, broken) == "ValueError"
+
+        # The error is the model's, not one for a bare column.
+        broken = copy.deepcopy(event)
+        broken["subscriptions"][7]["in_home_view"] = "x"
+        error = validation_error(check_subscription_add, broken)
+        assert error.title == "EventSubscriptionAdd"
+        assert error.errors()[0]["loc"] == ("subscriptions", 7, "in_home_view")
+        assert error.errors() == validation_error(_check_subscription_add, broken).errors()
+
+
+def test_columnar_validators() -> None:
+    rows = [
+        {"base_url": f"https://example.com/{i}", "interface": 1, "token": "t"} for i in range(20)
+    ]
+    validator = ColumnarValidator(BotServicesOutgoing)
+    validator.validate(rows)
+    # base_url has a validator, so it doesn't get a plain str check.
+    assert validator.checks["base_url"] is None
+    for url in ["not a url", "ftp://example.com"]:
+        broken = [*rows[:3], dict(rows[3], base_url=url), *rows[4:]]
+        try:
+            validator.validate(broken)
+        except ValidationError as e:
+            assert e.errors()[0]["loc"] == (3, "base_url")
+        else:
+            raise AssertionError(f"accepted {url}")
+
+
+def validation_error(checker: Callable[[str, dict[str, Any]], None], event: Any) -> ValidationError:
+    try:
+        checker("event", event)
+    except ValidationError as e:
+        return e
+    raise AssertionError("no ValidationError")
+
+
+def raises(f: Callable[..., None], *args: Any, **kwargs: Any) -> bool:
+    try:
+        f(*args, **kwargs)
+    except ValueError:
+        return True
+    return False
+
+
+def test_int_lists() -> None:
+    for ids in [[], [3, 1, 2], array("q", [3, 1, 2]), array("B", [1]), memoryview(b"ab")]:
+        check_int_list(ids)
+    for ids in [[1, True], [1, 2.0], [1, "2"], (1, 2), {1, 2}, array("d", [1.0]), "12", None]:
+        assert raises(check_int_list, ids), ids
+    assert raises(check_int_list, memoryview(bytes(4)).cast("B", (2, 2)))
+
+    for ids in [[1, 2, 3], array("q", [1, 2, 3]), [1]]:
+        check_int_list(ids, unique=True, ordered=True)
+    for ids in [[1, 2, 2], array("i", [5, 5])]:
+        check_int_list(ids, ordered=True)
+        assert raises(check_int_list, ids, unique=True), ids
+    for ids in [[2, 1], array("q", [2, 1])]:
+        check_int_list(ids, unique=True)
+        assert raises(check_int_list, ids, ordered=True), ids
+
+
+def test_id_list_checkers() -> None:
+    peer_add = next(e for e in read_events() if e.get("op") == "peer_add")
+    check_subscription_peer_add("event", peer_add)
+    check_unique = make_id_list_checker(
+        EventSubscriptionPeerAdd, "user_ids", "stream_ids", unique=True
+    )
+    for key in ["user_ids", "stream_ids"]:
+        duplicated = dict(peer_add, **{key: [*peer_add[key], peer_add[key][0]]})
+        check_subscription_peer_add("event", duplicated)
+        assert raises(check_unique, "event", duplicated)
+        check_subscription_peer_add("event", dict(peer_add, **{key: array("q", [1, 2])}))
+        for bad in [[1, "2"], array("d", [1.0]), None]:
+            broken = dict(peer_add, **{key: bad})
+            assert (
+                assert_same(
+                    check_subscription_peer_add, make_checker(EventSubscriptionPeerAdd), broken
+                )
+                == "ValidationError"
+            )
+        missing = {k: v for k, v in peer_add.items() if k != key}
+        assert_same(check_subscription_peer_add, make_checker(EventSubscriptionPeerAdd), missing)
+    assert raises(check_subscription_peer_add, "event", dict(peer_add, extra=1))
+
+    group_add = next(
+        e for e in read_events() if e.get("type") == "user_group" and e.get("op") == "add"
+    )
+    check_user_group_add("event", group_add)
+    for key in ["members", "direct_subgroup_ids"]:
+        group = dict(group_add["group"], **{key: array("q", [7, 7])})
+        check_user_group_add("event", dict(group_add, group=group))
+        group = dict(group_add["group"], **{key: [7, None]})
+        broken = dict(group_add, group=group)
+        assert assert_same(check_user_group_add, make_checker(EventUserGroupAdd), broken) != "ok"
+        group = {k: v for k, v in group_add["group"].items() if k != key}
+        broken = dict(group_add, group=group)
+        assert assert_same(check_user_group_add, make_checker(EventUserGroupAdd), broken) != "ok"
+    assert raises(check_user_group_add, "event", dict(group_add, group=None))
+
+    for n in [3, COLUMNAR_MIN_ROWS]:
+        event = big_subscription_add(n)
+        event["subscriptions"][1]["subscribers"] = array("q", [4, 4])
+        check_subscription_add("event", event)
+
+    # Errors are the model's, with the full path in their loc.
+    def assert_model_error(
+        checker: Callable[[str, dict[str, Any]], None],
+        model: type[BaseModel],
+        event: dict[str, Any],
+        loc: tuple[str | int, ...],
+    ) -> None:
+        error = validation_error(checker, event)
+        assert error.title == model.__name__
+        assert error.errors()[0]["loc"] == loc
+        assert error.errors() == validation_error(make_checker(model), event).errors()
+
+    peer_add_model = EventSubscriptionPeerAdd
+    broken = dict(peer_add, user_ids=[1, "2"])
+    assert_model_error(check_subscription_peer_add, peer_add_model, broken, ("user_ids", 1))
+    broken = dict(peer_add, id="1")
+    assert_model_error(check_subscription_peer_add, peer_add_model, broken, ("id",))
+    group = dict(group_add["group"], members=[7, None])
+    broken = dict(group_add, group=group)
+    assert_model_error(check_user_group_add, EventUserGroupAdd, broken, ("group", "members", 1))
+    for n in [3, COLUMNAR_MIN_ROWS]:
+        event = big_subscription_add(n)
+        event["subscriptions"][1]["subscribers"] = [4, "x"]
+        loc = ("subscriptions", 1, "subscribers", 1)
+        assert_model_error(check_subscription_add, EventSubscriptionAdd, event, loc)
+
+
+def fanout(event: dict[str, Any], n: int = 5) -> list[dict[str, Any]]:
+    # The copies share the message dict, like they do on the server.
+    return [dict(event) for _ in range(n)]
+
+
+def test_message_fanout() -> None:
+    def check_batch(var_name: str, event: dict[str, Any]) -> None:
+        check_message_fanout(var_name, fanout(event))
+
+    def check_each(var_name: str, event: dict[str, Any]) -> None:
+        for message_event in fanout(event):
+            check_message(var_name, message_event)
+
+    messages = [c["args"][1] for c in read_calls() if c["name"] == "check_message"]
+    for event in messages:
+        assert assert_same(check_batch, check_each, event) == "ok"
+        assert _message_fanout.validate(fanout(event)) == 1
+
+    [event, *_] = messages
+    for key in ["type", "flags", "id", "message"]:
+        for value in [*BAD_VALUES, ["read", 1]]:
+            assert_same(check_batch, check_each, dict(event, **{key: value}))
+        missing = dict(event)
+        del missing[key]
+        assert assert_same(check_batch, check_each, missing) != "ok"
+    assert assert_same(check_batch, check_each, dict(event, bogus=1)) == "ValueError"
+
+    # Copies that don't share the message dict each get validated...
+    batch = fanout(event)
+    batch[3] = dict(batch[3], message=dict(event["message"], content=None))
+    assert raises(check_message_fanout, "event", batch)
+    batch[3]["message"]["content"] = "fixed"
+    assert _message_fanout.validate(batch) == 2
+    # ... unless the caller vouches for copies with the same id.
+    assert _message_fanout.validate(batch, by_id="id") == 1
+
+    for item in [None, [], "x", ("message", event["message"])]:
+        batch = fanout(event)
+        batch[2] = item
+        assert raises(check_message_fanout, "event", batch), item
+
+
+def test_validation_cache() -> None:
+    def check_without_cache(var_name: str, event: dict[str, Any]) -> None:
+        disable_validation_cache()
+        try:
+            check_realm_emoji_update(var_name, event)
+        finally:
+            enable_validation_cache()
+
+    calls = list(read_calls())
+    cache = enable_validation_cache()
+    try:
+        for _ in range(2):
+            for call in calls:
+                f = getattr(zerver.lib.event_schema, call["name"])
+                f(*call["args"], **call["kwargs"])
+        assert cache.stats()["hits"] > 0
+
+        event = next(c["args"][1] for c in calls if c["name"] == "check_realm_emoji_update")
+        [(emoji_id, emoji)] = list(event["realm_emoji"].items())[:1]
+        cache.clear()
+        before = cache.stats()
+        check_realm_emoji_update("event", event)
+        after = cache.stats()
+        assert after["misses"] > before["misses"] and after["hits"] == before["hits"]
+        check_realm_emoji_update("event", event)
+        assert cache.stats()["hits"] > after["hits"]
+        assert cache.stats()["misses"] == after["misses"]
+        # The key/id check still runs on cached maps.
+        renamed = dict(event, realm_emoji={"x" + emoji_id: emoji})
+        assert assert_same(check_realm_emoji_update, check_without_cache, renamed) == "ValueError"
+        # Values that compare equal to cached ones must still be rejected.
+        for key, value in [("deactivated", int(emoji["deactivated"])), ("author_id", 1.0)]:
+            broken = dict(event, realm_emoji={emoji_id: dict(emoji, **{key: value})})
+            assert assert_same(check_realm_emoji_update, check_without_cache, broken) != "ok"
+        for key in ["type", "op", "realm_emoji", "id"]:
+            for value in BAD_VALUES:
+                broken = dict(event, **{key: value})
+                assert_same(check_realm_emoji_update, check_without_cache, broken)
+            missing = dict(event)
+            del missing[key]
+            assert assert_same(check_realm_emoji_update, check_without_cache, missing) != "ok"
+
+        cache = enable_validation_cache(max_bytes=1000)
+        for call in calls:
+            f = getattr(zerver.lib.event_schema, call["name"])
+            f(*call["args"], **call["kwargs"])
+        stats = cache.stats()
+        assert stats["evictions"] > 0 and stats["bytes"] <= 1000
+    finally:
+        disable_validation_cache()
+
+
+def test_realm_emoji_update() -> None:
+    event = next(c["args"][1] for c in read_calls() if c["name"] == "check_realm_emoji_update")
+    [emoji, *_] = event["realm_emoji"].values()
+    realm_emoji = {str(i): dict(emoji, id=str(i), name=f"emoji{i}") for i in range(50)}
+
+    check_diff = RealmEmojiUpdateChecker()
+    check_diff("event", dict(event, realm_emoji=realm_emoji))
+    check_diff("event", dict(event, realm_emoji=dict(realm_emoji, new=dict(emoji, id="new"))))
+
+    for broken_map in [
+        dict(realm_emoji, x=dict(emoji, id="y")),
+        {"x" if key == "6" else key: value for key, value in realm_emoji.items()},
+        dict(realm_emoji, **{"3": dict(realm_emoji["3"], author_id=True)}),
+        dict(realm_emoji, **{"3": dict(realm_emoji["3"], deactivated=0)}),
+    ]:
+        broken = dict(event, realm_emoji=broken_map)
+        assert raises(check_realm_emoji_update, "event", broken)
+        assert raises(check_diff, "event", broken)
+
+    # A rejected map doesn't become the baseline for the next diff.
+    check_diff("event", dict(event, realm_emoji=realm_emoji))
+    assert check_diff.previous.keys() == realm_emoji.keys()
+
+
+def test_presence_batch() -> None:
+    def check_batch(var_name: str, events: list[dict[str, Any]]) -> None:
+        check_presence_batch(var_name, events)
+
+    def check_each(var_name: str, events: list[dict[str, Any]]) -> None:
+        for event in events:
+            validate_event_with_model_type(event, EventPresence)
+
+    events = [c["args"][1] for c in read_calls() if c["name"] == "check_presence"]
+    [entry] = events[0]["presence"].values()
+    events.append(dict(events[0], presence={f"client{i}": dict(entry) for i in range(50)}))
+    assert assert_same(check_batch, check_each, events) == "ok"
+    assert assert_same(check_batch, check_each, []) == "ok"
+
+    for key in [*EventPresence.model_fields, "bogus"]:
+        for value in BAD_VALUES:
+            broken = copy.deepcopy(events)
+            broken[3][key] = value
+            assert_same(check_batch, check_each, broken)
+        missing = copy.deepcopy(events)
+        missing[3].pop(key, None)
+        assert_same(check_batch, check_each, missing)
+    for key in [*Presence.model_fields, "bogus"]:
+        for value in BAD_VALUES:
+            broken = copy.deepcopy(events)
+            broken[-1]["presence"]["client7"][key] = value
+            assert_same(check_batch, check_each, broken)
+        missing = copy.deepcopy(events)
+        missing[-1]["presence"]["client7"].pop(key, None)
+        assert_same(check_batch, check_each, missing)
+    for presence in [None, [], {1: entry}, {"website": None}]:
+        broken = copy.deepcopy(events)
+        broken[2]["presence"] = presence
+        assert assert_same(check_batch, check_each, broken) != "ok"
+
+
+class Int(int):
+    pass
+
+
+class Str(str):
+    pass
+
+
+def mutations(event: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """The event with each key (and each key of its dict values) set to
+    wrong, subclassed or missing values, plus an extra key."""
+    yield event
+    yield dict(event, bogus=1)
+    for key, value in event.items():
+        for bad_value in [*BAD_VALUES, Int(1), Str("x"), [], {}]:
+            yield dict(event, **{key: bad_value})
+        missing = dict(event)
+        del missing[key]
+        yield missing
+        if isinstance(value, dict):
+            for nested in mutations(value):
+                yield dict(event, **{key: nested})
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            for nested in mutations(value[0]):
+                yield dict(event, **{key: [nested, *value[1:]]})
+
+
+def test_fast_check_is_sound() -> None:
+    """For every event model the compiler handles, whatever the fast
+    check accepts, validation accepts too."""
+    events = list(read_events())
+    compiled = 0
+    for model in vars(zerver.lib.event_types).values():
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            continue
+        if not model.__name__.startswith("Event") or "type" not in model.model_fields:
+            continue
+        try:
+            is_valid = compile_fast_check(model)
+        except UnsupportedAnnotationError:
+            continue
+        compiled += 1
+        check = make_checker(model)
+        types = get_args(model.model_fields["type"].annotation)
+        for event in events:
+            if event.get("type") not in types:
+                continue
+            for mutated in mutations(event):
+                if is_valid(mutated):
+                    assert outcome(check, mutated) == "ok", (model, mutated)
+    assert compiled > 10
+
+
+def test_typing_fast_lane() -> None:
+    for name, fast, model in [
+        ("check_typing_start", check_typing_start, EventTypingStart),
+        ("check_typing_stop", check_typing_stop, EventTypingStop),
+    ]:
+        is_valid = compile_fast_check(model)
+        events = [c["args"][1] for c in read_calls() if c["name"] == name]
+        assert events
+        for event in events:
+            # The ordinary events all take the fast lane.
+            assert is_valid(event), event
+            for mutated in mutations(event):
+                assert_same(fast, make_checker(model), mutated)
+
+
+def test_muted_topics() -> None:
+    def check_list_rows(var_name: str, event: dict[str, Any]) -> None:
+        check_muted_topics(var_name, event, list_rows=True)
+
+    def check_as_tuples(var_name: str, event: dict[str, Any]) -> None:
+        rows = event.get("muted_topics")
+        if type(rows) is list:
+            event = dict(event, muted_topics=[tuple(r) if type(r) is list else r for r in rows])
+        _check_muted_topics(var_name, event)
+
+    event = next(c["args"][1] for c in read_calls() if c["name"] == "check_muted_topics")
+    [row] = event["muted_topics"]
+    rows = [(row[0], f"topic {i}", row[2] + i) for i in range(50)]
+    events = [event, dict(event, muted_topics=rows), dict(event, muted_topics=[])]
+    for bad_row in [
+        [*row],
+        (*row, 1),
+        row[:2],
+        (row[0], row[1], True),
+        (row[0], Str("x"), 1),
+        (row[0], row[1], 1.0),
+        (None, row[1], 1),
+        {"a": 1, "b": 2, "c": 3},
+        "abc",
+        None,
+    ]:
+        events.append(dict(event, muted_topics=[*rows[:7], bad_row, *rows[7:]]))
+    for event in events:
+        for mutated in mutations(event):
+            assert_same(check_muted_topics, _check_muted_topics, mutated)
+            assert_same(check_list_rows, check_as_tuples, mutated)
+
+    list_rows = dict(event, muted_topics=[[*r] for r in rows])
+    assert raises(check_muted_topics, "event", list_rows)
+    check_muted_topics("event", list_rows, list_rows=True)
+
+
+def test_user_topic_batch() -> None:
+    def check_batch(var_name: str, events: list[dict[str, Any]]) -> None:
+        check_user_topic_batch(var_name, events)
+
+    def check_each(var_name: str, events: list[dict[str, Any]]) -> None:
+        for event in events:
+            check_user_topic(var_name, event)
+
+    events = [c["args"][1] for c in read_calls() if c["name"] == "check_user_topic"]
+    events = [dict(events[i % len(events)], stream_id=i) for i in range(60)]
+    assert assert_same(check_batch, check_each, events) == "ok"
+    assert assert_same(check_batch, check_each, []) == "ok"
+    for mutated in mutations(events[5]):
+        assert_same(check_batch, check_each, [*events[:5], mutated, *events[6:]])
+
+
+def test_streaming_checkers() -> None:
+    for name, model, key in [
+        ("check_custom_profile_fields", EventCustomProfileFields, "fields"),
+        ("check_default_stream_groups", EventDefaultStreamGroups, "default_stream_groups"),
+        ("check_realm_linkifiers", EventRealmLinkifiers, "realm_linkifiers"),
+        ("check_realm_playgrounds", EventRealmPlaygrounds, "realm_playgrounds"),
+    ]:
+        streaming = StreamingValidator(model, key)
+        events = [c["args"][1] for c in read_calls() if c["name"] == name]
+        events = [e for e in events if e[key]]
+        assert events, name
+        for event in events:
+            for mutated in [*mutations(event), dict(event, **{key: [*event[key], None, 1]})]:
+                expected = assert_same(
+                    getattr(zerver.lib.event_schema, name), make_checker(model), mutated
+                )
+                if expected != "ValidationError":
+                    continue
+                # Without fail_fast, we get the very same errors.
+                try:
+                    model.model_validate(mutated, strict=True)
+                except ValidationError as e:
+                    expected_errors = e.errors()
+                try:
+                    streaming.validate(mutated, fail_fast=False)
+                except ValidationError as e:
+                    assert e.errors() == expected_errors
+                    assert e.title == model.__name__
+
+    # Items come out as they are validated, before any later bad item.
+    event = next(c["args"][1] for c in read_calls() if c["name"] == "check_realm_linkifiers")
+    [item, *_] = event["realm_linkifiers"]
+    items = [dict(item, id=i) for i in range(5)]
+    validator = StreamingValidator(EventRealmLinkifiers, "realm_linkifiers")
+    for broken_items, fail_fast, error_locs in [
+        ([*items, None, item], True, [("realm_linkifiers", 5)]),
+        ([None, *items, 1], False, [("realm_linkifiers", 0), ("realm_linkifiers", 6)]),
+    ]:
+        seen: list[Any] = []
+        try:
+            seen.extend(
+                validator.iter_items(
+                    dict(event, realm_linkifiers=broken_items), fail_fast=fail_fast
+                )
+            )
+        except ValidationError as e:
+            assert [error["loc"] for error in e.errors()] == error_locs
+        else:
+            raise AssertionError("no error")
+        assert seen == items
+
+
+def test_user_group_update() -> None:
+    def check_each_field(var_name: str, event: dict[str, Any], field: str) -> None:
+        _check_user_group_update(var_name, event)
+        assert isinstance(event["data"], dict)
+        assert set(event["data"].keys()) == {field}
+
+    def result(f: Callable[..., None], *args: Any) -> str:
+        try:
+            f(*args)
+        except AssertionError:
+            return "AssertionError"
+        except ValidationError as e:
+            return str(e)
+        except ValueError:
+            return "ValueError"
+        return "ok"
+
+    calls = [c for c in read_calls() if c["name"] == "check_user_group_update"]
+    assert calls
+    for call in calls:
+        event, field = call["args"][1:]
+        value = event["data"][field]
+        other = "name" if field != "name" else "description"
+        for data in [
+            {field: value},
+            {field: None},
+            *({field: bad_value} for bad_value in BAD_VALUES),
+            {},
+            {field: value, other: None},
+            {"bogus": 1},
+            None,
+        ]:
+            for mutated in mutations(dict(event, data=data)):
+                expected = result(check_each_field, "event", mutated, field)
+                assert result(check_user_group_update, "event", mutated, field) == expected
+
+
+def test_single_field_models() -> None:
+    def positive(n: int) -> int:
+        assert n > 0
+        return n
+
+    class Data(BaseModel):
+        count: Annotated[int, AfterValidator(positive)] | None = None
+        name: str | None = None
+
+    models = single_field_models(Data)
+    assert {model.__name__ for model in models.values()} == {"Data_count", "Data_name"}
+    models["count"].model_validate({"count": 1}, strict=True)
+    models["count"].model_validate({"count": None}, strict=True)
+    for model, data in [(models["count"], {"count": 0}), (models["name"], {"name": 1})]:
+        assert raises(model.model_validate, data, strict=True)
+        assert raises(Data.model_validate, data, strict=True)
+
+
+def test_absent_vs_null() -> None:
+    checkers = {
+        "check_update_message": (check_update_message, EventUpdateMessage),
+        "check_delete_message": (check_delete_message, EventDeleteMessage),
+    }
+    calls = [c for c in read_calls() if c["name"] in checkers]
+    assert calls
+    for call in calls:
+        checker, model = checkers[call["name"]]
+        [_, event, *args], kwargs = call["args"], call["kwargs"]
+        checker("event", event, *args, **kwargs)
+        for mutated in mutations(event):
+            try:
+                instance = validate_event_model(mutated, model)
+            except (ValidationError, ValueError):
+                continue
+            assert instance.model_fields_set == mutated.keys()
+        # An explicit None for a key the event shouldn't have is as bad
+        # as leaving out a key it should have.
+        for key, field in model.model_fields.items():
+            if field.is_required():
+                continue
+            if key in event:
+                broken = dict(event)
+                del broken[key]
+            else:
+                broken = dict(event, **{key: None})
+            try:
+                checker("event", broken, *args, **kwargs)
+            except AssertionError:
+                continue
+            raise AssertionError(f"{call['name']} accepted {broken}")
+
+    records = EventGenerator(seed=2).records(list(EVENT_MODELS.values()), 5)
+    for record in records:
+        event = record["event"]
+        instance = validate_event_model(event, EVENT_MODELS[record["model"]])
+        assert json.loads(event_model_to_json(instance)) == json.loads(to_json(event))
+
+
+def test_shape_coverage() -> None:
+    def summary(check: Callable[[], None]) -> dict[str, Any]:
+        coverage = enable_shape_coverage()
+        try:
+            check()
+        finally:
+            disable_shape_coverage()
+        return coverage.summary()
+
+    def calls(name: str) -> list[dict[str, Any]]:
+        return [c["args"][1] for c in read_calls() if c["name"] == name]
+
+    # The fast paths record what plain validation would.
+    presence = calls("check_presence")
+    user_topics = calls("check_user_topic")
+    messages = [e for event in calls("check_message") for e in fanout(event)]
+    for fast, model, events in [
+        (lambda: check_presence_batch("events", presence), EventPresence, presence),
+        (lambda: check_user_topic_batch("events", user_topics), EventUserTopic, user_topics),
+        (lambda: check_message_fanout("events", messages), EventMessage, messages),
+        (
+            lambda: [check_muted_topics("event", e) for e in calls("check_muted_topics")],
+            EventMutedTopics,
+            calls("check_muted_topics"),
+        ),
+        (
+            lambda: [check_typing_start("event", e) for e in calls("check_typing_start")],
+            EventTypingStart,
+            calls("check_typing_start"),
+        ),
+        (
+            lambda: check_subscription_add("event", big_subscription_add()),
+            EventSubscriptionAdd,
+            [big_subscription_add()],
+        ),
+        (
+            lambda: [check_realm_linkifiers("event", e) for e in calls("check_realm_linkifiers")],
+            EventRealmLinkifiers,
+            calls("check_realm_linkifiers"),
+        ),
+    ]:
+        plain = summary(
+            lambda model=model, events=events: [
+                validate_event_with_model_type(e, model) for e in events
+            ]
+        )
+        assert summary(fast) == plain
+        assert plain[model.__name__]["events"] == len(events)
+
+    # The one-field stand-ins for UserGroupData record as the real model.
+    group_updates = [c["args"] for c in read_calls() if c["name"] == "check_user_group_update"]
+    data = summary(lambda: [check_user_group_update(*args) for args in group_updates])
+    assert data["EventUserGroupUpdate"]["events"] == len(group_updates)
+    optional = data["UserGroupData"]["optional"]
+    assert len(optional) == len(UserGroupData.model_fields)
+    assert sum(optional.values()) == len(group_updates)
+    for *_, field in group_updates:
+        assert optional[field] >= 1
+
+    realm_update_dicts = calls("check_realm_update_dict")
+    data = summary(lambda: [check_realm_update_dict("event", e) for e in realm_update_dicts])
+    branches = data["EventRealmUpdateDict"]["branches"]["data"]
+    assert sum(branches.values()) == len(realm_update_dicts)
+    assert branches["IconData"] == sum(e["property"] == "icon" for e in realm_update_dicts)
+
+    # Sub-objects that checkers validate again on their own only count once.
+    person_updates = [c["args"] for c in read_calls() if c["name"] == "check_realm_user_update"]
+    data = summary(lambda: [check_realm_user_update(*args) for args in person_updates])
+    branches = data["EventRealmUserUpdate"]["branches"]["person"]
+    people = {name: model["events"] for name, model in data.items() if name in branches}
+    assert sum(branches.values()) == len(person_updates) == sum(people.values())
+
+    update_messages = calls("check_update_message")
+    optional = summary(
+        lambda: [validate_event_model(e, EventUpdateMessage) for e in update_messages]
+    )["EventUpdateMessage"]["optional"]
+    assert optional["stream_id"] == sum("stream_id" in e for e in update_messages)
+
+
+def test_payload_limits() -> None:
+    def over_limits(check: Callable[[], Any]) -> bool:
+        try:
+            check()
+        except PayloadLimitError:
+            return True
+        return False
+
+    limits = PayloadLimits(max_depth=8, max_items=1000, max_string_length=100)
+    set_payload_limits(limits)
+    try:
+        # Real events are nowhere near even these limits.
+        for call in read_calls():
+            checker = getattr(zerver.lib.event_schema, call["name"])
+            checker(*call["args"], **call["kwargs"])
+
+        [event, *_] = [c["args"][1] for c in read_calls() if c["name"] == "check_message"]
+        # The reactions list and its dicts are two levels already.
+        deep: Any = "x"
+        for _ in range(7):
+            deep = [deep]
+        too_deep: Any = {"emoji": deep}
+        for reactions, bad in [
+            ([{"emoji": "x" * 100}], [{"emoji": "x" * 101}]),
+            ([{"x" * 100: 1}], [{"x" * 101: 1}]),
+            ([{}] * 1000, [{}] * 1001),
+            ([{"emoji": list(range(998))}], [{"emoji": list(range(999))}]),
+            ([{"emoji": deep[0]}], [too_deep]),
+        ]:
+            ok = dict(event, message=dict(event["message"], reactions=reactions))
+            check_message("event", ok)
+            over = dict(event, message=dict(event["message"], reactions=bad))
+            assert over_limits(lambda over=over: check_message("event", over))
+            assert over_limits(lambda over=over: check_message_fanout("events", fanout(over)))
+
+        # Items count across all of an event's free-form values.
+        split = dict(
+            event, message=dict(event["message"], reactions=[{}] * 600, submessages=[{}] * 600)
+        )
+        assert over_limits(lambda: validate_event_with_model_type(split, EventMessage))
+
+        bot_add = next(
+            e for e in read_events() if e.get("type") == "realm_bot" and e.get("op") == "add"
+        )
+        services = [
+            {"base_url": "https://example.com", "interface": 1, "token": "t"},
+            {"service_name": "giphy", "config_data": {"key": "x" * 100}},
+        ]
+        bot_add = dict(bot_add, bot=dict(bot_add["bot"], services=services))
+        validate_event_with_model_type(bot_add, EventRealmBotAdd)
+        services[1]["config_data"] = {"key": "x" * 101}
+        assert over_limits(lambda: validate_event_with_model_type(bot_add, EventRealmBotAdd))
+
+        # Wrong types are left for validation to report.
+        broken = dict(event, message=dict(event["message"], reactions=12))
+        assert outcome(check_message, broken) == "ValidationError"
+    finally:
+        set_payload_limits(None)
+
+    # The limits are off by default.
+    huge = dict(event, message=dict(event["message"], reactions=[{}] * 200_000))
+    check_message("event", huge)
+    set_payload_limits()
+    try:
+        assert zerver.lib.event_schema.payload_limits == DEFAULT_PAYLOAD_LIMITS
+        assert over_limits(lambda: check_message("event", huge))
+    finally:
+        set_payload_limits(None)
+
+
+def test_validation_policy() -> None:
+    config = {
+        "sample_rate": 0.5,
+        "event_types": {"heartbeat": "off"},
+        "realms": {
+            "2": {"default": "sampled", "event_types": {"presence": "shape_only"}},
+            "3": {"default": "off", "sample_rate": 0.1, "event_types": {"message": "sampled"}},
+        },
+    }
+    table = PolicyTable(config)
+    assert table.lookup(1, "message").mode == "full"
+    assert table.lookup(1, "heartbeat").mode == "off"
+    assert table.lookup(2, "message").mode == "sampled"
+    assert table.lookup(2, "presence").mode == "shape_only"
+    assert table.lookup(2, "heartbeat").mode == "off"
+    assert table.lookup(3, "message").sample_rate == 0.1
+    assert table.lookup(3, "heartbeat").sample_rate == 0.1
+    assert table.lookup(3, "typing").mode == "off"
+    for bad in [
+        [],
+        {"default": "most"},
+        {"sample_rate": 2},
+        {"sample_rate": "0.5"},
+        {"event_types": ["message"]},
+        {"realms": {"zulip": {}}},
+        {"realms": {"2": {"realms": {}}}},
+        {"realms": {"2": {"event_types": {"message": None}}}},
+    ]:
+        assert raises(PolicyTable, bad), bad
+
+    # Shape-only checks accept every corpus event, and catch wrong keys.
+    for event in read_events():
+        check_shape(event)
+    [event, *_] = [c["args"][1] for c in read_calls() if c["name"] == "check_message"]
+    check_shape(dict(event, message=None))
+    missing = dict(event)
+    del missing["flags"]
+    for bad in [dict(event, bogus=1), missing, dict(event, type="bogus"), [event]]:
+        assert raises(check_shape, bad), bad
+
+    def run(table: PolicyTable, realm_id: int, event: dict[str, Any]) -> list[str]:
+        checked = []
+        table.check(realm_id, lambda var_name, event: checked.append(var_name), "event", event)
+        return checked
+
+    samples = iter([0.4, 0.6])
+    table = PolicyTable(config, sample=lambda: next(samples))
+    assert run(table, 1, event) == ["event"]
+    assert run(table, 2, event) == ["event"]  # sampled...
+    assert run(table, 2, event) == []  # ... or not
+    assert run(table, 1, {"type": "heartbeat"}) == []
+    presence = dict(event, type="presence")
+    assert raises(table.check, 2, check_message, "event", presence)
+
+    # The file gets reloaded when it changes, unless the new config is bad.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "policy.json")
+        with open(path, "w") as f:
+            json.dump({"realms": {"2": {"default": "off"}}}, f)
+        policy = enable_validation_policy(path, check_interval=0)
+        try:
+            broken = dict(event, bogus=1)
+            check_realm_event(2, check_message, "event", broken)
+            assert raises(check_realm_event, 1, check_message, "event", broken)
+
+            for config, mode in [({"default": "off"}, "off"), ({"default": "most"}, "off")]:
+                with open(path, "w") as f:
+                    json.dump(config, f)
+                assert policy.current().lookup(1, "message").mode == mode
+            check_realm_event(1, check_message, "event", broken)
+        finally:
+            disable_validation_policy()
+    assert raises(check_realm_event, 2, check_message, "event", broken)
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            try:
+                f()
+            except pytest.skip.Exception as e:
+                print(f"{name}: skipped ({e.msg})")
+    print("ok")
@@ -0,0 +1,80 @@
+"""Checks that fuzz_validators.py draws valid events for every model,
+blows them up without making them invalid, and catches validation
+that goes over its budget.
+
+    python test_fuzz_validators.py    (or: python -m pytest test_fuzz_validators.py)
+
+Skipped if Hypothesis isn't installed.
+"""
+
+import pytest
+
+
+def test_strategies() -> None:
+    pytest.importorskip("hypothesis")
+    from hypothesis import given, settings
+    from hypothesis import strategies as st
+
+    from fuzz_validators import blow_up, model_strategy, payload_size, replace, slots
+    from generate_events import EVENT_MODELS
+    from zerver.lib.event_schema import validate_event_with_model_type
+
+    for model in EVENT_MODELS.values():
+
+        @settings(max_examples=5, deadline=None, database=None, derandomize=True)
+        @given(st.data())
+        def check(data: st.DataObject) -> None:
+            event = data.draw(model_strategy(model))  # noqa: B023
+            validate_event_with_model_type(event, model)  # noqa: B023
+            for slot in slots(event, model):  # noqa: B023
+                blown_up = replace(event, slot.path, blow_up(slot, 1000, None))
+                if slot.kind != "huge_list":  # (which needs an item)
+                    validate_event_with_model_type(blown_up, model)  # noqa: B023
+                    assert payload_size(blown_up) > payload_size(event)
+
+        check()
+
+
+def test_fuzzer() -> None:
+    pytest.importorskip("hypothesis")
+    from fuzz_validators import Budget, BudgetExceededError, Fuzzer
+    from generate_events import EVENT_MODELS
+    from zerver.lib.event_schema import set_payload_limits
+
+    # The default budget is tight enough that a busy machine can go
+    # over it; these runs aren't about timing.
+    generous = Budget(seconds_per_unit=1e-3, base_seconds=10)
+
+    fuzzer = Fuzzer(max_size=1000, budget=generous)
+    fuzzer.run(EVENT_MODELS["EventMessage"], examples=20, seed_value=0)
+    assert len(fuzzer.samples) == 20
+    assert fuzzer.scaling()
+
+    # With payload limits on, deep nesting goes over them, which is fine
+    # (and fast).
+    set_payload_limits()
+    try:
+        fuzzer = Fuzzer(max_size=10_000, budget=generous)
+        fuzzer.run(EVENT_MODELS["EventMessage"], examples=100, seed_value=0)
+    finally:
+        set_payload_limits(None)
+    assert any(sample.rejected for sample in fuzzer.samples)
+
+    # No validation is this fast.
+    fuzzer = Fuzzer(max_size=1000, budget=Budget(seconds_per_unit=0, base_seconds=0))
+    try:
+        fuzzer.run(EVENT_MODELS["EventMessage"], examples=5, seed_value=0)
+    except BudgetExceededError:
+        pass
+    else:
+        raise AssertionError("no BudgetExceededError")
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            try:
+                f()
+            except pytest.skip.Exception as e:
+                print(f"{name}: skipped ({e.msg})")
+    print("ok")
@@ -0,0 +1,75 @@
+"""Checks that generate_events.py produces what it says it does: valid
+events that validate, invalid ones that don't, the same ones for the
+same seed, all of it surviving the trip through JSONL.
+
+    python test_generate_events.py    (or: python -m pytest test_generate_events.py)
+"""
+
+import io
+import os
+import tempfile
+from typing import Any
+
+from pydantic import ValidationError
+
+from compare_checkers import compare, corpus_cases, generated_cases
+from generate_events import EVENT_MODELS, EventGenerator, read_generated, write_jsonl
+from zerver.lib.event_schema import validate_event_with_model_type
+
+
+def generated(**kwargs: Any) -> list[dict[str, Any]]:
+    count = kwargs.pop("count", 20)
+    invalid = kwargs.pop("invalid", 0.3)
+    records = EventGenerator(**kwargs).records(list(EVENT_MODELS.values()), count, invalid)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.jsonl")
+        with open(path, "w") as file:
+            write_jsonl(records, file)
+        return list(read_generated(path))
+
+
+def test_events_validate_as_labelled() -> None:
+    records = generated(seed=3)
+    assert {r["model"] for r in records} == EVENT_MODELS.keys()
+    assert any(r["valid"] for r in records) and not all(r["valid"] for r in records)
+    for record in records:
+        try:
+            validate_event_with_model_type(record["event"], EVENT_MODELS[record["model"]])
+            valid = True
+        except (ValidationError, ValueError):
+            valid = False
+        assert valid == record["valid"], record
+
+
+def test_seeds() -> None:
+    def output(seed: int) -> str:
+        file = io.StringIO()
+        models = list(EVENT_MODELS.values())
+        write_jsonl(EventGenerator(seed).records(models, 3, invalid=0.5), file)
+        return file.getvalue()
+
+    assert output(1) == output(1)
+    assert output(1) != output(2)
+
+
+def test_list_sizes() -> None:
+    generator = EventGenerator(list_sizes={"subscriptions": 2, "subscribers": 5000})
+    event = generator.event(EVENT_MODELS["EventSubscriptionAdd"])
+    assert [len(sub["subscribers"]) for sub in event["subscriptions"]] == [5000, 5000]
+
+
+def test_compare_checkers() -> None:
+    # The legacy and pydantic checkers agree on the whole corpus.
+    report = compare(corpus_cases(), repeat=1)
+    assert report.events > 1000 and report.disagreements == []
+
+    report = compare(generated_cases(2, seed=0, invalid=0.5), repeat=1)
+    assert report.events > 100
+    assert set(report.costs) <= EVENT_MODELS.keys()
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            f()
+    print("ok")
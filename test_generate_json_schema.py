@@ -0,0 +1,74 @@
+"""Checks that generate_json_schema.py exports every event model, only
+regenerates the ones whose source changed, and that its comparator
+finds the differences it should.
+
+    python test_generate_json_schema.py    (or: python -m pytest test_generate_json_schema.py)
+"""
+
+import json
+import os
+import tempfile
+
+from generate_events import EVENT_MODELS
+from generate_json_schema import EVENT_TYPES_PATH, compare_schemas, generate_document
+
+
+def test_document() -> None:
+    document, generated = generate_document(cache_path=None)
+    schemas = document["components"]["schemas"]
+    assert set(generated) == EVENT_MODELS.keys()
+    assert EVENT_MODELS.keys() < schemas.keys()
+    assert "TopicLink" in schemas
+    assert schemas["EventUpdateMessage"]["properties"]["topic_links"]["anyOf"][0] == {
+        "items": {"$ref": "#/components/schemas/TopicLink"},
+        "type": "array",
+    }
+    assert "$defs" not in str(schemas)
+    assert compare_schemas(document, document) == []
+
+
+def test_incremental() -> None:
+    with open(EVENT_TYPES_PATH) as f:
+        source = f.read()
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "cache.json")
+        source_path = os.path.join(directory, "event_types.py")
+        with open(source_path, "w") as f:
+            f.write(source)
+        document, generated = generate_document(cache_path, source_path)
+        assert len(generated) == len(EVENT_MODELS)
+        assert generate_document(cache_path, source_path) == (document, [])
+
+        # Changing TopicLink invalidates exactly the models that use it.
+        with open(source_path, "w") as f:
+            f.write(
+                source.replace("class TopicLink(BaseModel):", "class TopicLink(BaseModel):\n    ")
+            )
+        _, generated = generate_document(cache_path, source_path)
+        assert generated == [
+            name
+            for name, model in EVENT_MODELS.items()
+            if "TopicLink" in json.dumps(model.model_json_schema())
+        ]
+        assert "EventUpdateMessage" in generated
+
+
+def test_compare_schemas() -> None:
+    ours, _ = generate_document(cache_path=None)
+    theirs, _ = generate_document(cache_path=None)
+    schemas = theirs["components"]["schemas"]
+    del schemas["EventHeartbeat"]
+    schemas["TopicLink"]["required"] = ["text"]
+    schemas["EventRestart"]["properties"]["bogus"] = {"type": "string"}
+    assert compare_schemas(ours, theirs) == [
+        "/components/schemas/EventHeartbeat: only in ours",
+        "/components/schemas/EventRestart/properties/bogus: only in theirs",
+        '/components/schemas/TopicLink/required: ["text", "url"] != ["text"]',
+    ]
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            f()
+    print("ok")
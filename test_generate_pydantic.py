@@ -0,0 +1,230 @@
+"""Checks that generate_pydantic.py reproduces event_types.py exactly,
+that re-runs only redo the work for what changed, and how it names
+the classes.
+
+    python test_generate_pydantic.py    (or: python -m pytest test_generate_pydantic.py)
+"""
+
+import os
+import tempfile
+from dataclasses import fields, is_dataclass
+from typing import get_type_hints
+
+from pydantic import ValidationError
+
+import generate_pydantic
+import zerver.lib.event_schema_legacy
+from checker_corpus import read_events
+from generate_events import EVENT_MODELS
+from generate_pydantic import (
+    COMPACT_TYPES_PATH,
+    EVENT_TYPES_PATH,
+    LEGACY_PATH,
+    build_model_graph,
+    find_shared_groups,
+    generate,
+    model_event_types,
+    render_compact_module,
+    render_module,
+)
+from zerver.lib.data_types import DictType, Equals
+from zerver.lib.event_compact_types import COMPACT_MODELS
+from zerver.lib.event_schema import PERSON_TYPES
+
+
+def test_deterministic() -> None:
+    source, rendered = render_module(build_model_graph())
+    assert render_module(build_model_graph()) == (source, rendered)
+    with open(EVENT_TYPES_PATH) as f:
+        assert f.read() == source
+    with open(COMPACT_TYPES_PATH) as f:
+        assert f.read() == render_compact_module(build_model_graph())
+
+
+def test_only_changed_models_render() -> None:
+    cache: dict[str, str] = {}
+    graph = build_model_graph()
+    _, rendered = render_module(graph, cache)
+    assert rendered == list(graph.models)
+    assert render_module(build_model_graph(), cache)[1] == []
+
+    module_dict = dict(zerver.lib.event_schema_legacy.__dict__)
+    module_dict["heartbeat_event"] = DictType(
+        required_keys=[("type", Equals("heartbeat"))], optional_keys=[("interval", int)]
+    )
+    assert render_module(build_model_graph(module_dict), cache)[1] == ["EventHeartbeat"]
+
+
+def test_unchanged_source_skips_the_graph() -> None:
+    with open(LEGACY_PATH) as f:
+        legacy_source = f.read()
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "cache.json")
+        path = os.path.join(directory, "event_types.py")
+        compact_path = os.path.join(directory, "event_compact_types.py")
+        legacy_path = os.path.join(directory, "event_schema_legacy.py")
+        with open(legacy_path, "w") as f:
+            f.write(legacy_source)
+
+        def run() -> list[str] | None:
+            return generate(path, cache_path, compact_path, legacy_path)
+
+        assert run()
+        with open(path) as f:
+            source = f.read()
+        os.remove(path)
+
+        def fail(*args: object) -> None:
+            raise AssertionError("built the graph")
+
+        build = generate_pydantic.build_model_graph
+        generate_pydantic.build_model_graph = fail  # type: ignore[assignment]
+        try:
+            assert run() is None
+            with open(path) as f:
+                assert f.read() == source
+
+            # Checkers aren't descriptors...
+            with open(legacy_path, "a") as f:
+                f.write("\n\ndef check_nothing(var_name: str, event: object) -> None:\n    pass\n")
+            assert run() is None
+
+            # ... but anything at the top level might be.
+            with open(legacy_path, "a") as f:
+                f.write("\nnothing_event = None\n")
+            try:
+                run()
+            except AssertionError:
+                pass
+            else:
+                raise AssertionError("skipped a changed descriptor")
+        finally:
+            generate_pydantic.build_model_graph = build
+        # (Nothing changed in what the descriptors are, so nothing re-renders.)
+        assert run() == []
+
+        # A change to the generator itself re-renders everything.
+        digest = generate_pydantic.generator_digest
+        generate_pydantic.generator_digest = lambda: "changed"
+        try:
+            assert run() == list(build_model_graph().models)
+        finally:
+            generate_pydantic.generator_digest = digest
+
+
+def test_name_registry() -> None:
+    removed = DictType(required_keys=[("user_id", int), ("full_name", str)])
+    renamed = DictType(required_keys=[("user_id", int), ("full_name", str)])
+    clash = DictType(required_keys=[("user_id", int)])
+    module_dict = {
+        "removed_user": removed,
+        "removed_user_": clash,  # also RemovedUser
+        "renamed_user": renamed,
+        "a_event": DictType(
+            required_keys=[
+                ("type", Equals("a")),
+                ("removed", removed),
+                ("renamed", renamed),
+                ("clash", clash),
+                ("x", DictType(required_keys=[("id", int)])),
+            ]
+        ),
+        "b_event": DictType(
+            required_keys=[("type", Equals("b")), ("x", DictType(required_keys=[("id", int)]))]
+        ),
+    }
+    graph = build_model_graph(module_dict, share_fields=False)
+    fields = {
+        name: {f.name: f.annotation for f in model.fields} for name, model in graph.models.items()
+    }
+    # Identical structures with different names stay different classes...
+    assert fields["EventA"]["removed"] == "RemovedUser"
+    assert fields["EventA"]["renamed"] == "RenamedUser"
+    assert graph.models["RenamedUser"].alias_of is None
+    # ... a different structure asking for a taken name gets a suffix...
+    assert fields["EventA"]["clash"] == "RemovedUser2"
+    assert fields["RemovedUser2"] == {"user_id": "int"}
+    # ... and anonymous identical structures share a class.
+    assert fields["EventA"]["x"] == fields["EventB"]["x"] == "XFieldForEventA"
+
+    # Every person flavor keeps its own name.
+    graph = build_model_graph()
+    person = next(f for f in graph.models["EventRealmUserUpdate"].fields if f.name == "person")
+    for model in PERSON_TYPES.values():
+        assert graph.models[model.__name__].alias_of is None
+        assert model.__name__ in person.annotation
+
+
+def test_shared_groups() -> None:
+    def event(type: str, op: str) -> DictType:
+        return DictType(
+            required_keys=[("type", Equals(type)), ("op", Equals(op)), ("user_id", int)]
+        )
+
+    module_dict = {
+        "a_add_event": event("a", "add"),
+        "a_remove_event": event("a", "remove"),
+        "b_add_event": event("b", "add"),
+    }
+    graph = build_model_graph(module_dict, share_fields=False)
+    assert find_shared_groups(graph) == [(["EventAAdd", "EventARemove"], 3)]
+    graph = build_model_graph(module_dict)
+    assert graph.models["EventAAdd"].base == graph.models["EventARemove"].base == "EventABase"
+    assert graph.models["EventBAdd"].base == "BaseModel"
+
+    # In the real schemas, too, no group spans event types.
+    graph = build_model_graph(share_fields=False)
+    event_types = model_event_types(graph)
+    assert event_types["SingleSubscription"] == {"subscription"}
+    for names, _ in find_shared_groups(graph):
+        assert len({frozenset(event_types[name]) for name in names}) == 1, names
+    graph = build_model_graph()
+    for model in graph.models.values():
+        if model.abstract:
+            type_field = next((f for f in model.fields if f.name == "type"), None)
+            assert type_field is None or "," not in type_field.annotation, model.name
+
+
+def plain(value: object) -> object:
+    """value with dataclasses turned into dicts, and None values
+    (including missing optional fields) dropped."""
+    if is_dataclass(value) and not isinstance(value, type):
+        value = {f.name: getattr(value, f.name) for f in fields(value)}
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list | tuple):
+        return type(value)(map(plain, value))
+    return value
+
+
+def test_compact_round_trip() -> None:
+    assert COMPACT_MODELS.keys() == EVENT_MODELS.keys()
+    group_settings = 0
+    for name, model in EVENT_MODELS.items():
+        hints = get_type_hints(COMPACT_MODELS[name])
+        for key, field in model.model_fields.items():
+            if "AnonymousSettingGroupDict" in str(field.annotation):
+                assert "AnonymousSettingGroupDict" in str(hints[key]), (name, key)
+                group_settings += 1
+    assert group_settings
+
+    accepted = 0
+    for event in read_events():
+        for name, model in EVENT_MODELS.items():
+            try:
+                model.model_validate(event, strict=True)
+            except ValidationError:
+                continue
+            if not event.keys() <= model.model_fields.keys():
+                continue
+            compact = COMPACT_MODELS[name].from_validated_dict(event)
+            assert plain(compact) == plain(event), name
+            accepted += 1
+    assert accepted >= len(list(read_events()))
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            f()
+    print("ok")
@@ -0,0 +1,61 @@
+"""Checks that minimize_corpus.py keeps one call of every shape in the
+corpus, and that the weighted corpus adds up to the whole corpus.
+
+    python test_minimize_corpus.py    (or: python -m pytest test_minimize_corpus.py)
+"""
+
+import os
+import tempfile
+from collections import Counter
+
+from checker_corpus import read_calls, read_weighted_calls
+from minimize_corpus import call_shape, minimal_lines, minimize, shape, weighted_lines, write_lines
+
+
+def test_shape() -> None:
+    assert shape({"a": 1, "b": [1, 2]}) == shape({"b": [3, 4, 5], "a": 2})
+    assert shape({"a": 1}) != shape({"a": "1"})
+    assert shape({"a": []}) != shape({"a": [1]}) != shape({"a": [1, 2]})
+    assert shape({"a": [1, "x"]}) == shape({"a": ["y", 2, 3]})
+    assert shape({"op": "add"}) == shape({"op": "remove"})
+    assert shape({"op": "add"}, frozenset({"op"})) != shape({"op": "remove"}, frozenset({"op"}))
+
+
+# Not CORPUS_PATH: CHECKER_CORPUS may point at an already minimized corpus.
+REAL_WORLD_CORPUS = "real_world_checker_calls.txt"
+
+
+def test_minimize() -> None:
+    with open(REAL_WORLD_CORPUS) as file:
+        result = minimize(file)
+    calls = list(read_calls(REAL_WORLD_CORPUS))
+    assert result.calls == len(calls)
+    assert len(result.groups) < len(calls) / 2
+
+    with tempfile.TemporaryDirectory() as directory:
+        minimal_path = os.path.join(directory, "minimal.txt")
+        weighted_path = os.path.join(directory, "weighted.txt")
+        write_lines(minimal_path, minimal_lines(result))
+        write_lines(weighted_path, weighted_lines(result))
+        minimal = list(read_calls(minimal_path))
+        weighted = list(read_calls(weighted_path))
+        replayed = list(read_weighted_calls(weighted_path))
+
+    # Every shape is covered, by the first call that has it.
+    assert {call_shape(call) for call in minimal} == {call_shape(call) for call in calls}
+    first_calls = {}
+    for call in calls:
+        first_calls.setdefault(call_shape(call), call)
+    assert minimal == list(first_calls.values())
+
+    assert sum(call.pop("weight") for call in weighted) == len(calls)
+    assert weighted == minimal
+    # Replaying the weighted corpus gives the same mix of shapes as the whole one.
+    assert Counter(map(call_shape, replayed)) == Counter(map(call_shape, calls))
+
+
+if __name__ == "__main__":
+    for name, f in list(globals().items()):
+        if name.startswith("test_") and callable(f):
+            f()
+    print("ok")
@@ -14,22 +14,148 @@ from contextlib import suppress
 from dataclasses import dataclass
 from typing import Any
 
+import dataclasses
+import hashlib
+import json
 import random
 
-"""
-TODO: reincorporate
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-"""
 
-PERSISTED_NAMES = set("AnonymousSettingGroupDict")
 
-def get_flat_name(data_type):
-    if hasattr(data_type, "_name"):
-        if data_type._name not in PERSISTED_NAMES:
-            data_type.print_full_pydantic(name=data_type._name)
-            PERSISTED_NAMES.add(data_type._name)
-        return data_type._name
+def literal_repr(val: Any) -> str:
+    # Match the double-quote style of our formatted code.
+    if isinstance(val, str):
+        return json.dumps(val)
+    return repr(val)
+
+
+# Names of types that the generated code imports rather than defines.
+PERSISTED_NAMES = {"AnonymousSettingGroupDict"}
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    annotation: str
+    data_type: Any
+    optional: bool = False
+
+
+@dataclass
+class ModelSpec:
+    """One class that the pydantic codegen emits.  If `alias_of` is
+    set, the model is just another name for an identical class.
+    Abstract models only exist to share fields between their subclasses,
+    and never get a validator of their own."""
+
+    name: str
+    base: str
+    fields: list[FieldSpec]
+    dependencies: list[str]
+    alias_of: str | None = None
+    abstract: bool = False
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        h.update(f"{self.name}({self.base})={self.alias_of}:{self.abstract}\n".encode())
+        for field in self.fields:
+            h.update(f"{field.name}:{field.annotation}:{field.optional}\n".encode())
+        return h.hexdigest()
+
+
+class CodegenContext:
+    """State for one run of the pydantic codegen, including the registry
+    of class names.
+
+    Requested names are keyed by descriptor identity, so that generating
+    code never mutates the (shared) descriptor objects, and a fresh
+    context gives a fresh run.  Each named descriptor is resolved to an
+    emitted class exactly once, by the hash of its structure: identical
+    sub-schemas with generated names share one class, and distinct
+    schemas that ask for the same name get a numeric suffix instead of
+    silently sharing a class.  Explicitly named descriptors only share
+    a class with ones of the same name: identical structures can still
+    mean different things (like the full_name flavor of a person update
+    and the user of realm_user/remove).
+    """
+
+    def __init__(self) -> None:
+        self.names: dict[int, str] = {}
+        self.resolved: dict[int, str] = {}
+        # (structure, explicit name or None) -> class name
+        self.by_structure: dict[tuple[str, str | None], str] = {}
+        self.emitted: set[str] = set(PERSISTED_NAMES)
+        self.models: list[ModelSpec] = []
+        # id -> (descriptor, digest); holding the descriptor keeps the id valid.
+        self._structures: dict[int, tuple[Any, str]] = {}
+
+    def set_name(self, data_type: Any, name: str) -> None:
+        self.names[id(data_type)] = name
+
+    def name_for(self, data_type: Any) -> str | None:
+        if id(data_type) in self.resolved:
+            return self.resolved[id(data_type)]
+        if id(data_type) in self.names:
+            return self.names[id(data_type)]
+        return getattr(data_type, "_name", None)
+
+    def structure(self, data_type: Any) -> str:
+        if id(data_type) not in self._structures:
+            digest = hashlib.sha256(repr(structure_key(data_type, self)).encode()).hexdigest()
+            self._structures[id(data_type)] = (data_type, digest)
+        return self._structures[id(data_type)][1]
+
+    def resolve(self, data_type: Any, name: str, *, explicit: bool) -> str:
+        if id(data_type) in self.resolved:
+            return self.resolved[id(data_type)]
+
+        if name in PERSISTED_NAMES:
+            self.resolved[id(data_type)] = name
+            return name
+
+        structure = self.structure(data_type)
+        canonical = self.by_structure.get((structure, name if explicit else None))
+        if canonical is not None:
+            self.resolved[id(data_type)] = canonical
+            return canonical
+
+        unique_name = name
+        suffix = 2
+        while unique_name in self.emitted:
+            unique_name = f"{name}{suffix}"
+            suffix += 1
+        self.emitted.add(unique_name)
+        self.by_structure.setdefault((structure, name if explicit else None), unique_name)
+        self.resolved[id(data_type)] = unique_name
+        data_type.print_full_pydantic(name=unique_name, ctx=self)
+        return unique_name
+
+
+def structure_key(data_type, ctx) -> Any:
+    if isinstance(data_type, type):
+        return data_type.__name__
+    if isinstance(data_type, DictType):
+        return (
+            "dict",
+            tuple((k, ctx.structure(t)) for k, t in data_type.required_keys),
+            tuple((k, ctx.structure(t)) for k, t in data_type.optional_keys),
+        )
+    if isinstance(data_type, ListType | OptionalType):
+        return (type(data_type).__name__, ctx.structure(data_type.sub_type))
+    if isinstance(data_type, StringDictType):
+        return ("StringDictType", ctx.structure(data_type.value_type))
+    if isinstance(data_type, TupleType | UnionType):
+        return (type(data_type).__name__, tuple(ctx.structure(t) for t in data_type.sub_types))
+    return (type(data_type).__name__, data_type.flat_name(ctx))
+
+
+def get_flat_name(data_type, ctx, default_name=None):
+    name = ctx.name_for(data_type)
+    if name is not None:
+        return ctx.resolve(data_type, name, explicit=True)
+    if default_name is not None:
+        return ctx.resolve(data_type, default_name, explicit=False)
     if data_type is dict:
         return "dict[str, object]"
     if data_type is int:
@@ -38,7 +164,20 @@ def get_flat_name(data_type):
         return "str"
     if data_type is bool:
         return "bool"
-    return data_type.flat_name()
+    return data_type.flat_name(ctx)
+
+
+def get_model_dependencies(data_type, ctx) -> list[str]:
+    name = ctx.name_for(data_type)
+    if name is not None:
+        return [name]
+    if isinstance(data_type, ListType | OptionalType):
+        return get_model_dependencies(data_type.sub_type, ctx)
+    if isinstance(data_type, StringDictType):
+        return get_model_dependencies(data_type.value_type, ctx)
+    if isinstance(data_type, TupleType | UnionType):
+        return [n for t in data_type.sub_types for n in get_model_dependencies(t, ctx)]
+    return []
 
 
 @dataclass
@@ -69,49 +208,73 @@ class DictType:
             if key == "unmuted_stream_msg":
                 self._name = "MessageDetails"
 
-    def flat_name(self):
+    def check_data(self, var_name: str, val: dict[str, Any]) -> None:
+        if (
+            getattr(self, "_name", None) == "AnonymousSettingGroupDict"
+            and dataclasses.is_dataclass(val)
+            and not isinstance(val, type)
+        ):
+            # Events carry the AnonymousSettingGroupDict dataclass that
+            # the codegen maps this type to.
+            val = dataclasses.asdict(val)
+
+        if not isinstance(val, dict):
+            raise AssertionError(f"{var_name} is not a dict")
+
+        for k in val:
+            if not isinstance(k, str):
+                raise AssertionError(f"{var_name} has a non-string key")
+
+        for k, data_type in self.required_keys:
+            if k not in val:
+                raise AssertionError(f"{k} key is missing from {var_name}")
+            vname = f"{var_name}['{k}']"
+            check_data(data_type, vname, val[k])
+
+        for k, data_type in self.optional_keys:
+            if k in val:
+                vname = f"{var_name}['{k}']"
+                check_data(data_type, vname, val[k])
+
+        rkeys = {tup[0] for tup in self.required_keys}
+        okeys = {tup[0] for tup in self.optional_keys}
+        keys = rkeys | okeys
+        for k in val:
+            if k not in keys:
+                raise AssertionError(f"Unknown key {k} in {var_name}")
+
+    def flat_name(self, ctx):
         return "Any"
 
-    def print_full_pydantic(self, *, name):
-        if name == "AnonymousSettingGroupDict":
-            return
-
+    def print_full_pydantic(self, *, name, ctx):
         # Get all subtpes written first as a side effect.
         for key, data_type in self.required_keys:
-            get_flat_name(data_type)
+            get_flat_name(data_type, ctx)
 
         for key, data_type in self.optional_keys:
-            get_flat_name(data_type)
+            get_flat_name(data_type, ctx)
 
-        if self.optional_keys:
-            superclass = name + "Core"
-        else:
-            superclass = name
+        fields = []
+        for key, data_type in self.required_keys:
+            default_name = None
+            if type(data_type) is DictType:
+                default_name = key.title() + "FieldFor" + name
+            flat_name = get_flat_name(data_type, ctx, default_name)
+            fields.append(FieldSpec(key, flat_name, data_type))
 
-        s = f"class {superclass}(BaseModel):\n"
+        for key, data_type in self.optional_keys:
+            flat_name = get_flat_name(data_type, ctx)
+            if "| None" not in flat_name:
+                flat_name += " | None"
+            fields.append(FieldSpec(key, flat_name, data_type, optional=True))
 
-        if not self.required_keys:
-            s += "    pass \n"
+        dependencies = []
+        for key, data_type in [*self.required_keys, *self.optional_keys]:
+            for dep in get_model_dependencies(data_type, ctx):
+                if dep not in dependencies:
+                    dependencies.append(dep)
 
-        for key, data_type in self.required_keys:
-            if type(data_type) is DictType and not hasattr(data_type, "_name"):
-                k = key.title() + "FieldFor" + name
-                data_type._name = k
-            s += f"    {key}: {get_flat_name(data_type)}\n"
-        s += "\n\n"
-
-        print(s)
-
-        if self.optional_keys:
-            s = f"\nclass {name}({superclass}):\n"
-            s += "\n    # TODO: fix types to avoid optional fields\n"
-            for key, data_type in self.optional_keys:
-                flat_name = get_flat_name(data_type)
-                if "| None" not in flat_name:
-                    flat_name += " | None"
-                s += f"    {key}: {flat_name} = None\n"
-            s += "\n\n"
-            print(s)
+        ctx.models.append(ModelSpec(name, "BaseModel", fields, dependencies))
 
 
 @dataclass
@@ -120,8 +283,12 @@ class EnumType:
 
     valid_vals: Sequence[Any]
 
-    def flat_name(self):
-        return f"Literal{sorted(self.valid_vals)}"
+    def check_data(self, var_name: str, val: dict[str, Any]) -> None:
+        if val not in self.valid_vals:
+            raise AssertionError(f"{var_name} is not in {self.valid_vals}")
+
+    def flat_name(self, ctx):
+        return f"Literal[{", ".join(literal_repr(v) for v in sorted(self.valid_vals))}]"
 
 
 class Equals:
@@ -134,15 +301,24 @@ class Equals:
         if self.expected_value is None:
             self.equalsNone = True
 
-    def flat_name(self):
-        return f"Literal[{self.expected_value!r}]"
+    def check_data(self, var_name: str, val: Any) -> None:
+        if val != self.expected_value:
+            raise AssertionError(f"{var_name} should be equal to {self.expected_value}")
+
+    def flat_name(self, ctx):
+        return f"Literal[{literal_repr(self.expected_value)}]"
 
 
 class NumberType:
     """A Union[float, int]; needed to align with the `number` type in
     OpenAPI, because isinstance(4, float) == False"""
 
-    def flat_name(self):
+    def check_data(self, var_name: str, val: Any | None) -> None:
+        if isinstance(val, int | float):
+            return
+        raise AssertionError(f"{var_name} is not a number")
+
+    def flat_name(self, ctx):
         return "float | int"
 
 class ListType:
@@ -152,8 +328,16 @@ class ListType:
         self.sub_type = sub_type
         self.length = length
 
-    def flat_name(self):
-        return f"list[{get_flat_name(self.sub_type)}]"
+    def check_data(self, var_name: str, val: list[Any]) -> None:
+        if not isinstance(val, list):
+            raise AssertionError(f"{var_name} is not a list")
+
+        for i, sub_val in enumerate(val):
+            vname = f"{var_name}[{i}]"
+            check_data(self.sub_type, vname, sub_val)
+
+    def flat_name(self, ctx):
+        return f"list[{get_flat_name(self.sub_type, ctx)}]"
 
 
 @dataclass
@@ -162,16 +346,30 @@ class StringDictType:
 
     value_type: Any
 
-    def flat_name(self):
-        return f"dict[str, {get_flat_name(self.value_type)}]"
+    def check_data(self, var_name: str, val: dict[Any, Any]) -> None:
+        if not isinstance(val, dict):
+            raise AssertionError(f"{var_name} is not a dictionary")
+
+        for key, value in val.items():
+            if not isinstance(key, str):
+                raise AssertionError(f"{var_name} has a non-string key")
+            check_data(self.value_type, f"{var_name}[{key}]", value)
+
+    def flat_name(self, ctx):
+        return f"dict[str, {get_flat_name(self.value_type, ctx)}]"
 
 
 @dataclass
 class OptionalType:
     sub_type: Any
 
-    def flat_name(self):
-        return f"{get_flat_name(self.sub_type)} | None"
+    def check_data(self, var_name: str, val: Any | None) -> None:
+        if val is None:
+            return
+        check_data(self.sub_type, var_name, val)
+
+    def flat_name(self, ctx):
+        return f"{get_flat_name(self.sub_type, ctx)} | None"
 
 
 @dataclass
@@ -181,20 +379,46 @@ class TupleType:
 
     sub_types: Sequence[Any]
 
-    def flat_name(self):
-        sub_names = [get_flat_name(t) for t in self.sub_types]
+    def check_data(self, var_name: str, val: Any) -> None:
+        if not isinstance(val, list | tuple):
+            raise AssertionError(f"{var_name} is not a tuple")
+        desired_len = len(self.sub_types)
+        if desired_len != len(val):
+            raise AssertionError(f"{var_name} should have {desired_len} items")
+        for i, sub_type in enumerate(self.sub_types):
+            vname = f"{var_name}[{i}]"
+            check_data(sub_type, vname, val[i])
+
+    def flat_name(self, ctx):
+        sub_names = [get_flat_name(t, ctx) for t in self.sub_types]
         return f"tuple[{", ".join(sub_names)}]"
 
 @dataclass
 class UnionType:
     sub_types: Sequence[Any]
 
-    def flat_name(self):
-        sub_names = [get_flat_name(t) for t in self.sub_types]
-        return f"{"| ".join(sub_names)}"
+    def check_data(self, var_name: str, val: Any) -> None:
+        for sub_type in self.sub_types:
+            try:
+                check_data(sub_type, var_name, val)
+            except AssertionError:
+                pass
+            else:
+                return
+        raise AssertionError(f"{var_name} does not pass the union type check")
+
+    def flat_name(self, ctx):
+        sub_names = [get_flat_name(t, ctx) for t in self.sub_types]
+        return f"{" | ".join(sub_names)}"
 
 class UrlType:
-    def flat_name(self):
+    def check_data(self, var_name: str, val: Any) -> None:
+        try:
+            URLValidator()(val)
+        except ValidationError:  # nocoverage
+            raise AssertionError(f"{var_name} is not a URL")
+
+    def flat_name(self, ctx):
         return "Url"
 
 def event_dict_type(
@@ -0,0 +1,210 @@
+# A bounded LRU cache of validated sub-objects, for the nested objects
+# that recur across events: realm_emoji/update resends the whole emoji
+# map on every change, stream and group definitions get sent over and
+# over, and so on.
+#
+# For each event model, the fields holding models (directly, or as
+# list/dict items) are validated piece by piece through the cache,
+# and the rest of the event through an envelope model without them.
+# Any failure reruns the full model, so errors are the usual ones.
+#
+# Fingerprints are marshal.dumps() bytes.  marshal is implemented in
+# C and, unlike repr() or JSON, is exact about types (True vs 1, 1 vs
+# 1.0, lists vs tuples) and refuses subclasses and arbitrary objects,
+# which we then just validate without caching.  So a cache hit means
+# the value is equal, type for type, to one that pydantic accepted.
+import marshal
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import FieldInfo
+
+from zerver.lib.event_fanout import envelope_model
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+CacheKey = tuple[object, bytes]
+
+# Version 2 doesn't track shared references, which makes it noticeably
+# faster for our small dicts.
+MARSHAL_VERSION = 2
+
+
+@dataclass
+class CachedField:
+    key: str
+    kind: str  # "model", "list" or "dict"
+    item_model: type[BaseModel]
+    nullable: bool
+    required: bool
+
+
+@dataclass
+class ModelPlan:
+    envelope: type[BaseModel]
+    fields: list[CachedField]
+
+
+def fingerprint(value: object) -> bytes | None:
+    """Type-exact bytes for value, or None if marshal can't handle it."""
+    try:
+        return marshal.dumps(value, MARSHAL_VERSION)
+    except ValueError:
+        return None
+
+
+def is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def get_cached_field(key: str, field: FieldInfo) -> CachedField | None:
+    if field.metadata:
+        # Validators etc. need the whole field.
+        return None
+    annotation = field.annotation
+    nullable = False
+    if get_origin(annotation) in (Union, UnionType):
+        options = [option for option in get_args(annotation) if option is not NoneType]
+        if len(options) != 1:
+            return None
+        [annotation] = options
+        nullable = True
+
+    args = get_args(annotation)
+    if is_model(annotation):
+        kind, item_model = "model", annotation
+    elif get_origin(annotation) is list and is_model(args[0]):
+        kind, item_model = "list", args[0]
+    elif get_origin(annotation) is dict and args[0] is str and is_model(args[1]):
+        kind, item_model = "dict", args[1]
+    else:
+        return None
+    return CachedField(key, kind, item_model, nullable, field.is_required())
+
+
+class ValidationCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[CacheKey, int] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self.plans: dict[type[BaseModel], ModelPlan | None] = {}
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "uncacheable": self.uncacheable,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.size,
+        }
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def get_plan(self, model: type[BaseModel]) -> ModelPlan | None:
+        if model not in self.plans:
+            fields = [
+                cached_field
+                for key, field in model.model_fields.items()
+                if (cached_field := get_cached_field(key, field)) is not None
+            ]
+            self.plans[model] = (
+                ModelPlan(envelope_model(model, {f.key for f in fields}), fields)
+                if fields
+                else None
+            )
+        return self.plans[model]
+
+    def _lookup(self, scope: object, value: object) -> tuple[bool, CacheKey | None]:
+        """Returns whether value is in the cache, and its key (None for
+        values we can't fingerprint)."""
+        value_fingerprint = fingerprint(value)
+        if value_fingerprint is None:
+            self.uncacheable += 1
+            return False, None
+        key = (scope, value_fingerprint)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, key
+        self.misses += 1
+        return False, key
+
+    def _add(self, key: CacheKey | None) -> None:
+        if key is None:
+            return
+        # An estimate: the fingerprint plus the bytes object around it.
+        self.entries[key] = size = sys.getsizeof(key[1])
+        self.size += size
+        while self.size > self.max_bytes:
+            _, evicted_size = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def _validate_item(self, model: type[BaseModel], item: Any) -> bool:
+        hit, key = self._lookup(model, item)
+        if not hit:
+            try:
+                model.model_validate(item, strict=True)
+            except ValidationError:
+                return False
+            self._add(key)
+        return True
+
+    def _validate_field(self, field: CachedField, value: Any) -> bool:
+        if field.kind == "model":
+            return self._validate_item(field.item_model, value)
+
+        # An unchanged list/dict is a single lookup; otherwise we only
+        # validate the items we haven't seen.
+        hit, key = self._lookup((field.kind, field.item_model), value)
+        if hit:
+            return True
+        items: Iterable[Any]
+        if field.kind == "list":
+            if type(value) is not list:
+                return False
+            items = value
+        else:
+            if type(value) is not dict or not set(map(type, value)) <= {str}:
+                return False
+            items = value.values()
+        if not all(self._validate_item(field.item_model, item) for item in items):
+            return False
+        self._add(key)
+        return True
+
+    def validate_event(self, event: dict[str, Any], model: type[BaseModel]) -> None:
+        plan = self.get_plan(model)
+        if plan is None or not self._validate_parts(plan, event):
+            model.model_validate(event, strict=True)
+
+    def _validate_parts(self, plan: ModelPlan, event: dict[str, Any]) -> bool:
+        try:
+            plan.envelope.model_validate(event, strict=True)
+        except ValidationError:
+            return False
+        for field in plan.fields:
+            if field.key not in event:
+                if field.required:
+                    return False
+                continue
+            value = event[field.key]
+            if value is None and field.nullable:
+                continue
+            if not self._validate_field(field, value):
+                return False
+        return True
@@ -0,0 +1,165 @@
+# Columnar validation for events that carry long lists of flat
+# objects, like the `subscriptions` of a subscription/add event for a
+# new user in a big realm.
+#
+# Instead of validating (and instantiating) one pydantic model per
+# row, we transpose the rows into columns and check each column in a
+# single pass.  The cheap checks only ever *accept* values that strict
+# pydantic validation would accept too (exact int/bool/str/None types,
+# literal values, lists of those).  Any column that fails them is
+# handed to pydantic itself, and if pydantic rejects it too, we
+# validate the rows as a list of models, so the error on failure is
+# the model's (with the row and field in its loc).  Fields with
+# validators (like Url) never get a cheap check.
+#
+# NumPy doesn't help here: strict validation is about Python types (an
+# int column must not contain bools or floats), which NumPy coerces
+# away, while `set(map(type, column))` already runs at C speed.
+from collections.abc import Callable, Sequence
+from itertools import chain, repeat
+from operator import itemgetter
+from types import NoneType, UnionType
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# Stands in for optional keys a row doesn't have.
+MISSING = object()
+
+ColumnCheck = Callable[[Sequence[Any]], bool]
+
+# Below this many rows, plain model validation is just as fast.
+COLUMNAR_MIN_ROWS = 16
+
+
+def _check_types(allowed: frozenset[type]) -> ColumnCheck:
+    def check(column: Sequence[Any]) -> bool:
+        return set(map(type, column)) <= allowed
+
+    return check
+
+
+def _check_literal(values: tuple[Any, ...], nullable: bool) -> ColumnCheck:
+    allowed = {(type(v), v) for v in values}
+    if nullable:
+        allowed.add((NoneType, None))
+
+    def check(column: Sequence[Any]) -> bool:
+        try:
+            return set(zip(map(type, column), column)) <= allowed
+        except TypeError:  # unhashable values
+            return False
+
+    return check
+
+
+def _check_lists(item_type: type, nullable: bool) -> ColumnCheck:
+    outer = frozenset({list, NoneType} if nullable else {list})
+
+    def check(column: Sequence[Any]) -> bool:
+        if not set(map(type, column)) <= outer:
+            return False
+        items = chain.from_iterable(v for v in column if v is not None)
+        return set(map(type, items)) <= {item_type}
+
+    return check
+
+
+SCALAR_TYPES = {int: int, bool: bool, str: str, float: float}
+
+
+def make_column_check(annotation: Any) -> ColumnCheck | None:
+    """Returns a fast check for the simple annotations that make up most
+    of our flat models, or None if the column needs full validation."""
+    nullable = False
+    options = [annotation]
+    if get_origin(annotation) in (Union, UnionType):
+        options = list(get_args(annotation))
+    if NoneType in options:
+        nullable = True
+        options.remove(NoneType)
+
+    if len(options) == 1:
+        [option] = options
+        if get_origin(option) is Literal:
+            return _check_literal(get_args(option), nullable)
+        if get_origin(option) is list and get_args(option)[0] in SCALAR_TYPES:
+            return _check_lists(get_args(option)[0], nullable)
+
+    # For unions like `int | AnonymousSettingGroupDict`, the column
+    # usually only has ints; anything else goes to pydantic.
+    allowed = {SCALAR_TYPES[option] for option in options if option in SCALAR_TYPES}
+    if not allowed:
+        return None
+    if nullable:
+        allowed.add(NoneType)
+    return _check_types(frozenset(allowed))
+
+
+class ColumnarValidator:
+    """Validates a list of dicts against a (flat) pydantic model, one
+    column at a time, without building any model instances."""
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.model = model
+        fields = model.model_fields
+        self.required = [key for key, field in fields.items() if field.is_required()]
+        self.optional = [key for key, field in fields.items() if not field.is_required()]
+        self.checks = {
+            key: None if field.metadata else make_column_check(field.annotation)
+            for key, field in fields.items()
+        }
+        self.rows: TypeAdapter[Any] = TypeAdapter(list[model])  # type: ignore[valid-type]
+        self._adapters: dict[str, TypeAdapter[Any]] = {}
+
+    def _column_is_valid(self, key: str, column: Sequence[Any]) -> bool:
+        check = self.checks[key]
+        if check is not None and check(column):
+            return True
+        if key not in self._adapters:
+            # The FieldInfo carries the field's validators, if any.
+            field = self.model.model_fields[key]
+            annotated = Annotated[field.annotation, field]  # type: ignore[name-defined]
+            self._adapters[key] = TypeAdapter(list[annotated])  # type: ignore[valid-type]
+        try:
+            self._adapters[key].validate_python(list(column), strict=True)
+        except ValidationError:
+            return False
+        return True
+
+    def _columns(self, rows: list[Any]) -> list[tuple[str, Sequence[Any]]] | None:
+        """Transposes rows into columns, or returns None for rows that
+        aren't plain dicts with all the required keys."""
+        if not rows:
+            return [(key, ()) for key in self.checks]
+        if not set(map(type, rows)) <= {dict}:
+            return None
+        try:
+            if len(self.required) == 1:
+                required = [tuple(map(itemgetter(*self.required), rows))]
+            elif self.required:
+                required = list(zip(*map(itemgetter(*self.required), rows), strict=True))
+            else:
+                required = []
+        except KeyError:
+            return None
+        columns: list[tuple[str, Sequence[Any]]] = list(zip(self.required, required, strict=True))
+
+        for key in self.optional:
+            column = list(map(dict.get, rows, repeat(key), repeat(MISSING)))
+            if MISSING in column:
+                column = [value for value in column if value is not MISSING]
+            columns.append((key, column))
+        return columns
+
+    def validate(self, rows: list[Any]) -> None:
+        columns = self._columns(rows)
+        if columns is not None and all(
+            self._column_is_valid(key, column) for key, column in columns
+        ):
+            return
+
+        # Bad values and odd rows (missing keys, model instances, ...)
+        # are rare, so let pydantic sort them out and produce the usual
+        # errors.
+        self.rows.validate_python(rows, strict=True)
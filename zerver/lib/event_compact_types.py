@@ -0,0 +1,2752 @@
+"""Compact, `__slots__`-based mirrors of the models in event_types.py.
+
+GENERATED by generate_pydantic.py; do not edit by hand.
+
+These are for holding lots of already-validated events in memory (event
+queues, replay buffers), where pydantic models are comparatively heavy.
+`from_validated_dict` does no validation at all; only call it on dicts
+that passed the corresponding event_schema checker.  Group settings
+(AnonymousSettingGroupDict) are passed through as they appear in the event.
+"""
+
+from __future__ import annotations
+
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Literal
+
+from zerver.lib.types import AnonymousSettingGroupDict
+
+_UNION_KEYS: dict[type, tuple[frozenset[str], frozenset[str]]] = {}
+
+
+def _from_union(d: Any, classes: tuple[type, ...]) -> Any:
+    # The value was already validated against the pydantic union, so we
+    # just need to find the (first) branch whose keys it matches.
+    if type(d) is not dict:
+        return d
+    keys = d.keys()
+    for cls in classes:
+        if cls not in _UNION_KEYS:
+            names = [f.name for f in fields(cls)]
+            required = [f.name for f in fields(cls) if f.default is MISSING]
+            _UNION_KEYS[cls] = (frozenset(required), frozenset(names))
+        required, names = _UNION_KEYS[cls]
+        if required <= keys <= names:
+            return cls.from_validated_dict(d)
+    return d
+
+
+@dataclass(slots=True)
+class EventAlertWords:
+    type: Literal["alert_words"]
+    alert_words: list[str]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventAlertWords:
+        return cls(
+            d["type"],
+            d["alert_words"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class AttachmentMessage:
+    id: int
+    date_sent: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AttachmentMessage:
+        return cls(
+            d["id"],
+            d["date_sent"],
+        )
+
+
+@dataclass(slots=True)
+class Attachment:
+    id: int
+    name: str
+    size: int
+    path_id: str
+    create_time: int
+    messages: list[AttachmentMessage]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> Attachment:
+        v = d["messages"]
+        messages = [AttachmentMessage.from_validated_dict(x) for x in v]
+        return cls(
+            d["id"],
+            d["name"],
+            d["size"],
+            d["path_id"],
+            d["create_time"],
+            messages,
+        )
+
+
+@dataclass(slots=True)
+class EventAttachmentAdd:
+    type: Literal["attachment"]
+    op: Literal["add"]
+    attachment: Attachment
+    upload_space_used: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventAttachmentAdd:
+        v = d["attachment"]
+        attachment = Attachment.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            attachment,
+            d["upload_space_used"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class AttachmentFieldForEventAttachmentRemove:
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AttachmentFieldForEventAttachmentRemove:
+        return cls(
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventAttachmentRemove:
+    type: Literal["attachment"]
+    op: Literal["remove"]
+    attachment: AttachmentFieldForEventAttachmentRemove
+    upload_space_used: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventAttachmentRemove:
+        v = d["attachment"]
+        attachment = AttachmentFieldForEventAttachmentRemove.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            attachment,
+            d["upload_space_used"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventAttachmentUpdate:
+    type: Literal["attachment"]
+    op: Literal["update"]
+    attachment: Attachment
+    upload_space_used: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventAttachmentUpdate:
+        v = d["attachment"]
+        attachment = Attachment.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            attachment,
+            d["upload_space_used"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class DetailedCustomProfile:
+    id: int
+    type: int
+    name: str
+    hint: str
+    field_data: str
+    order: int
+    required: bool
+    editable_by_user: bool
+    display_in_profile_summary: bool | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> DetailedCustomProfile:
+        return cls(
+            d["id"],
+            d["type"],
+            d["name"],
+            d["hint"],
+            d["field_data"],
+            d["order"],
+            d["required"],
+            d["editable_by_user"],
+            d.get("display_in_profile_summary"),
+        )
+
+
+@dataclass(slots=True)
+class EventCustomProfileFields:
+    type: Literal["custom_profile_fields"]
+    fields: list[DetailedCustomProfile]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventCustomProfileFields:
+        v = d["fields"]
+        fields = [DetailedCustomProfile.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            fields,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class StreamGroup:
+    name: str
+    id: int
+    description: str
+    streams: list[int]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> StreamGroup:
+        return cls(
+            d["name"],
+            d["id"],
+            d["description"],
+            d["streams"],
+        )
+
+
+@dataclass(slots=True)
+class EventDefaultStreamGroups:
+    type: Literal["default_stream_groups"]
+    default_stream_groups: list[StreamGroup]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDefaultStreamGroups:
+        v = d["default_stream_groups"]
+        default_stream_groups = [StreamGroup.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            default_stream_groups,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventDefaultStreams:
+    type: Literal["default_streams"]
+    default_streams: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDefaultStreams:
+        return cls(
+            d["type"],
+            d["default_streams"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventDeleteMessage:
+    type: Literal["delete_message"]
+    message_type: Literal["private", "stream"]
+    id: int
+    message_id: int | None = None
+    message_ids: list[int] | None = None
+    stream_id: int | None = None
+    topic: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDeleteMessage:
+        return cls(
+            d["type"],
+            d["message_type"],
+            d["id"],
+            d.get("message_id"),
+            d.get("message_ids"),
+            d.get("stream_id"),
+            d.get("topic"),
+        )
+
+
+@dataclass(slots=True)
+class TopicLink:
+    text: str
+    url: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> TopicLink:
+        return cls(
+            d["text"],
+            d["url"],
+        )
+
+
+@dataclass(slots=True)
+class DirectMessageDisplayRecipient:
+    id: int
+    is_mirror_dummy: bool
+    email: str
+    full_name: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> DirectMessageDisplayRecipient:
+        return cls(
+            d["id"],
+            d["is_mirror_dummy"],
+            d["email"],
+            d["full_name"],
+        )
+
+
+@dataclass(slots=True)
+class MessageFieldForEventDirectMessage:
+    avatar_url: str | None
+    client: str
+    content: str
+    content_type: Literal["text/html"]
+    id: int
+    is_me_message: bool
+    reactions: list[dict[str, object]]
+    recipient_id: int
+    sender_realm_str: str
+    sender_email: str
+    sender_full_name: str
+    sender_id: int
+    subject: str
+    topic_links: list[TopicLink]
+    submessages: list[dict[str, object]]
+    timestamp: int
+    type: str
+    display_recipient: list[DirectMessageDisplayRecipient]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> MessageFieldForEventDirectMessage:
+        v = d["topic_links"]
+        topic_links = [TopicLink.from_validated_dict(x) for x in v]
+        v = d["display_recipient"]
+        display_recipient = [DirectMessageDisplayRecipient.from_validated_dict(x) for x in v]
+        return cls(
+            d["avatar_url"],
+            d["client"],
+            d["content"],
+            d["content_type"],
+            d["id"],
+            d["is_me_message"],
+            d["reactions"],
+            d["recipient_id"],
+            d["sender_realm_str"],
+            d["sender_email"],
+            d["sender_full_name"],
+            d["sender_id"],
+            d["subject"],
+            topic_links,
+            d["submessages"],
+            d["timestamp"],
+            d["type"],
+            display_recipient,
+        )
+
+
+@dataclass(slots=True)
+class EventDirectMessage:
+    type: Literal["message"]
+    flags: list[str]
+    message: MessageFieldForEventDirectMessage
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDirectMessage:
+        v = d["message"]
+        message = MessageFieldForEventDirectMessage.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["flags"],
+            message,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class DraftFields:
+    id: int
+    type: Literal["", "private", "stream"]
+    to: list[int]
+    topic: str
+    content: str
+    timestamp: int | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> DraftFields:
+        return cls(
+            d["id"],
+            d["type"],
+            d["to"],
+            d["topic"],
+            d["content"],
+            d.get("timestamp"),
+        )
+
+
+@dataclass(slots=True)
+class EventDraftsAdd:
+    type: Literal["drafts"]
+    op: Literal["add"]
+    drafts: list[DraftFields]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDraftsAdd:
+        v = d["drafts"]
+        drafts = [DraftFields.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            drafts,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventDraftsRemove:
+    type: Literal["drafts"]
+    op: Literal["remove"]
+    draft_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDraftsRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["draft_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventDraftsUpdate:
+    type: Literal["drafts"]
+    op: Literal["update"]
+    draft: DraftFields
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventDraftsUpdate:
+        v = d["draft"]
+        draft = DraftFields.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            draft,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventHasZoomToken:
+    type: Literal["has_zoom_token"]
+    value: bool
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventHasZoomToken:
+        return cls(
+            d["type"],
+            d["value"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventHeartbeat:
+    type: Literal["heartbeat"]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventHeartbeat:
+        return cls(
+            d["type"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventInvitesChanged:
+    type: Literal["invites_changed"]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventInvitesChanged:
+        return cls(
+            d["type"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class MessageFieldForEventMessage:
+    avatar_url: str | None
+    client: str
+    content: str
+    content_type: Literal["text/html"]
+    id: int
+    is_me_message: bool
+    reactions: list[dict[str, object]]
+    recipient_id: int
+    sender_realm_str: str
+    sender_email: str
+    sender_full_name: str
+    sender_id: int
+    subject: str
+    topic_links: list[TopicLink]
+    submessages: list[dict[str, object]]
+    timestamp: int
+    type: str
+    display_recipient: str
+    stream_id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> MessageFieldForEventMessage:
+        v = d["topic_links"]
+        topic_links = [TopicLink.from_validated_dict(x) for x in v]
+        return cls(
+            d["avatar_url"],
+            d["client"],
+            d["content"],
+            d["content_type"],
+            d["id"],
+            d["is_me_message"],
+            d["reactions"],
+            d["recipient_id"],
+            d["sender_realm_str"],
+            d["sender_email"],
+            d["sender_full_name"],
+            d["sender_id"],
+            d["subject"],
+            topic_links,
+            d["submessages"],
+            d["timestamp"],
+            d["type"],
+            d["display_recipient"],
+            d["stream_id"],
+        )
+
+
+@dataclass(slots=True)
+class EventMessage:
+    type: Literal["message"]
+    flags: list[str]
+    message: MessageFieldForEventMessage
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventMessage:
+        v = d["message"]
+        message = MessageFieldForEventMessage.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["flags"],
+            message,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventMutedTopics:
+    type: Literal["muted_topics"]
+    muted_topics: list[tuple[str, str, int]]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventMutedTopics:
+        return cls(
+            d["type"],
+            d["muted_topics"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class MutedUser:
+    id: int
+    timestamp: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> MutedUser:
+        return cls(
+            d["id"],
+            d["timestamp"],
+        )
+
+
+@dataclass(slots=True)
+class EventMutedUsers:
+    type: Literal["muted_users"]
+    muted_users: list[MutedUser]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventMutedUsers:
+        v = d["muted_users"]
+        muted_users = [MutedUser.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            muted_users,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class OnboardingSteps:
+    type: str
+    name: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> OnboardingSteps:
+        return cls(
+            d["type"],
+            d["name"],
+        )
+
+
+@dataclass(slots=True)
+class EventOnboardingSteps:
+    type: Literal["onboarding_steps"]
+    onboarding_steps: list[OnboardingSteps]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventOnboardingSteps:
+        v = d["onboarding_steps"]
+        onboarding_steps = [OnboardingSteps.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            onboarding_steps,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class Presence:
+    status: Literal["active", "idle"]
+    timestamp: int
+    client: str
+    pushable: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> Presence:
+        return cls(
+            d["status"],
+            d["timestamp"],
+            d["client"],
+            d["pushable"],
+        )
+
+
+@dataclass(slots=True)
+class EventPresence:
+    type: Literal["presence"]
+    user_id: int
+    server_timestamp: float | int
+    presence: dict[str, Presence]
+    id: int
+    email: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventPresence:
+        v = d["presence"]
+        presence = {k: Presence.from_validated_dict(x) for k, x in v.items()}
+        return cls(
+            d["type"],
+            d["user_id"],
+            d["server_timestamp"],
+            presence,
+            d["id"],
+            d.get("email"),
+        )
+
+
+@dataclass(slots=True)
+class EventReactionAdd:
+    type: Literal["reaction"]
+    op: Literal["add"]
+    message_id: int
+    emoji_name: str
+    emoji_code: str
+    reaction_type: Literal["realm_emoji", "unicode_emoji", "zulip_extra_emoji"]
+    user_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventReactionAdd:
+        return cls(
+            d["type"],
+            d["op"],
+            d["message_id"],
+            d["emoji_name"],
+            d["emoji_code"],
+            d["reaction_type"],
+            d["user_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventReactionRemove:
+    type: Literal["reaction"]
+    op: Literal["remove"]
+    message_id: int
+    emoji_name: str
+    emoji_code: str
+    reaction_type: Literal["realm_emoji", "unicode_emoji", "zulip_extra_emoji"]
+    user_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventReactionRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["message_id"],
+            d["emoji_name"],
+            d["emoji_code"],
+            d["reaction_type"],
+            d["user_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class BotServicesOutgoing:
+    base_url: str
+    interface: int
+    token: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> BotServicesOutgoing:
+        return cls(
+            d["base_url"],
+            d["interface"],
+            d["token"],
+        )
+
+
+@dataclass(slots=True)
+class BotServicesEmbedded:
+    service_name: str
+    config_data: dict[str, str]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> BotServicesEmbedded:
+        return cls(
+            d["service_name"],
+            d["config_data"],
+        )
+
+
+@dataclass(slots=True)
+class Bot:
+    user_id: int
+    api_key: str
+    avatar_url: str
+    bot_type: int
+    default_all_public_streams: bool
+    default_events_register_stream: str | None
+    default_sending_stream: str | None
+    email: str
+    full_name: str
+    is_active: bool
+    owner_id: int
+    services: list[BotServicesOutgoing | BotServicesEmbedded]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> Bot:
+        v = d["services"]
+        services = [_from_union(x, _Bot_services) for x in v]
+        return cls(
+            d["user_id"],
+            d["api_key"],
+            d["avatar_url"],
+            d["bot_type"],
+            d["default_all_public_streams"],
+            d["default_events_register_stream"],
+            d["default_sending_stream"],
+            d["email"],
+            d["full_name"],
+            d["is_active"],
+            d["owner_id"],
+            services,
+        )
+
+
+_Bot_services = (
+    BotServicesOutgoing,
+    BotServicesEmbedded,
+)
+
+
+@dataclass(slots=True)
+class EventRealmBotAdd:
+    type: Literal["realm_bot"]
+    op: Literal["add"]
+    bot: Bot
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmBotAdd:
+        v = d["bot"]
+        bot = Bot.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            bot,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class BotTypeForDelete:
+    user_id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> BotTypeForDelete:
+        return cls(
+            d["user_id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmBotDelete:
+    type: Literal["realm_bot"]
+    op: Literal["delete"]
+    bot: BotTypeForDelete
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmBotDelete:
+        v = d["bot"]
+        bot = BotTypeForDelete.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            bot,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class BotTypeForUpdate:
+    user_id: int
+    api_key: str | None = None
+    avatar_url: str | None = None
+    default_all_public_streams: bool | None = None
+    default_events_register_stream: str | None = None
+    default_sending_stream: str | None = None
+    full_name: str | None = None
+    is_active: bool | None = None
+    owner_id: int | None = None
+    services: list[BotServicesOutgoing | BotServicesEmbedded] | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> BotTypeForUpdate:
+        services = None
+        if (v := d.get("services")) is not None:
+            services = [_from_union(x, _BotTypeForUpdate_services) for x in v]
+        return cls(
+            d["user_id"],
+            d.get("api_key"),
+            d.get("avatar_url"),
+            d.get("default_all_public_streams"),
+            d.get("default_events_register_stream"),
+            d.get("default_sending_stream"),
+            d.get("full_name"),
+            d.get("is_active"),
+            d.get("owner_id"),
+            services,
+        )
+
+
+_BotTypeForUpdate_services = (
+    BotServicesOutgoing,
+    BotServicesEmbedded,
+)
+
+
+@dataclass(slots=True)
+class EventRealmBotUpdate:
+    type: Literal["realm_bot"]
+    op: Literal["update"]
+    bot: BotTypeForUpdate
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmBotUpdate:
+        v = d["bot"]
+        bot = BotTypeForUpdate.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            bot,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmDeactivated:
+    type: Literal["realm"]
+    op: Literal["deactivated"]
+    realm_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmDeactivated:
+        return cls(
+            d["type"],
+            d["op"],
+            d["realm_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RealmDomain:
+    domain: str
+    allow_subdomains: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RealmDomain:
+        return cls(
+            d["domain"],
+            d["allow_subdomains"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmDomainsAdd:
+    type: Literal["realm_domains"]
+    op: Literal["add"]
+    realm_domain: RealmDomain
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmDomainsAdd:
+        v = d["realm_domain"]
+        realm_domain = RealmDomain.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            realm_domain,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmDomainsChange:
+    type: Literal["realm_domains"]
+    op: Literal["change"]
+    realm_domain: RealmDomain
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmDomainsChange:
+        v = d["realm_domain"]
+        realm_domain = RealmDomain.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            realm_domain,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmDomainsRemove:
+    type: Literal["realm_domains"]
+    op: Literal["remove"]
+    domain: str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmDomainsRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["domain"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RealmEmoji:
+    id: str
+    name: str
+    source_url: str
+    deactivated: bool
+    author_id: int
+    still_url: str | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RealmEmoji:
+        return cls(
+            d["id"],
+            d["name"],
+            d["source_url"],
+            d["deactivated"],
+            d["author_id"],
+            d["still_url"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmEmojiUpdate:
+    type: Literal["realm_emoji"]
+    op: Literal["update"]
+    realm_emoji: dict[str, RealmEmoji]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmEmojiUpdate:
+        v = d["realm_emoji"]
+        realm_emoji = {k: RealmEmoji.from_validated_dict(x) for k, x in v.items()}
+        return cls(
+            d["type"],
+            d["op"],
+            realm_emoji,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmExportConsent:
+    type: Literal["realm_export_consent"]
+    user_id: int
+    consented: bool
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmExportConsent:
+        return cls(
+            d["type"],
+            d["user_id"],
+            d["consented"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class Export:
+    id: int
+    export_time: float | int
+    acting_user_id: int
+    export_url: str | None
+    deleted_timestamp: float | int | None
+    failed_timestamp: float | int | None
+    pending: bool
+    export_type: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> Export:
+        return cls(
+            d["id"],
+            d["export_time"],
+            d["acting_user_id"],
+            d["export_url"],
+            d["deleted_timestamp"],
+            d["failed_timestamp"],
+            d["pending"],
+            d["export_type"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmExport:
+    type: Literal["realm_export"]
+    exports: list[Export]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmExport:
+        v = d["exports"]
+        exports = [Export.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            exports,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RealmLinkifier:
+    pattern: str
+    url_template: str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RealmLinkifier:
+        return cls(
+            d["pattern"],
+            d["url_template"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmLinkifiers:
+    type: Literal["realm_linkifiers"]
+    realm_linkifiers: list[RealmLinkifier]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmLinkifiers:
+        v = d["realm_linkifiers"]
+        realm_linkifiers = [RealmLinkifier.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            realm_linkifiers,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RealmPlayground:
+    id: int
+    name: str
+    pygments_language: str
+    url_template: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RealmPlayground:
+        return cls(
+            d["id"],
+            d["name"],
+            d["pygments_language"],
+            d["url_template"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmPlaygrounds:
+    type: Literal["realm_playgrounds"]
+    realm_playgrounds: list[RealmPlayground]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmPlaygrounds:
+        v = d["realm_playgrounds"]
+        realm_playgrounds = [RealmPlayground.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            realm_playgrounds,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class AllowMessageEditingData:
+    allow_message_editing: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AllowMessageEditingData:
+        return cls(
+            d["allow_message_editing"],
+        )
+
+
+@dataclass(slots=True)
+class AuthenticationMethodDict:
+    enabled: bool
+    available: bool
+    unavailable_reason: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AuthenticationMethodDict:
+        return cls(
+            d["enabled"],
+            d["available"],
+            d.get("unavailable_reason"),
+        )
+
+
+@dataclass(slots=True)
+class AuthenticationDict:
+    Google: AuthenticationMethodDict
+    Dev: AuthenticationMethodDict
+    LDAP: AuthenticationMethodDict
+    GitHub: AuthenticationMethodDict
+    Email: AuthenticationMethodDict
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AuthenticationDict:
+        v = d["Google"]
+        Google = AuthenticationMethodDict.from_validated_dict(v)
+        v = d["Dev"]
+        Dev = AuthenticationMethodDict.from_validated_dict(v)
+        v = d["LDAP"]
+        LDAP = AuthenticationMethodDict.from_validated_dict(v)
+        v = d["GitHub"]
+        GitHub = AuthenticationMethodDict.from_validated_dict(v)
+        v = d["Email"]
+        Email = AuthenticationMethodDict.from_validated_dict(v)
+        return cls(
+            Google,
+            Dev,
+            LDAP,
+            GitHub,
+            Email,
+        )
+
+
+@dataclass(slots=True)
+class AuthenticationData:
+    authentication_methods: AuthenticationDict
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> AuthenticationData:
+        v = d["authentication_methods"]
+        authentication_methods = AuthenticationDict.from_validated_dict(v)
+        return cls(
+            authentication_methods,
+        )
+
+
+@dataclass(slots=True)
+class IconData:
+    icon_url: str
+    icon_source: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> IconData:
+        return cls(
+            d["icon_url"],
+            d["icon_source"],
+        )
+
+
+@dataclass(slots=True)
+class LogoData:
+    logo_url: str
+    logo_source: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> LogoData:
+        return cls(
+            d["logo_url"],
+            d["logo_source"],
+        )
+
+
+@dataclass(slots=True)
+class MessageContentEditLimitSecondsData:
+    message_content_edit_limit_seconds: int | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> MessageContentEditLimitSecondsData:
+        return cls(
+            d["message_content_edit_limit_seconds"],
+        )
+
+
+@dataclass(slots=True)
+class NightLogoData:
+    night_logo_url: str
+    night_logo_source: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> NightLogoData:
+        return cls(
+            d["night_logo_url"],
+            d["night_logo_source"],
+        )
+
+
+@dataclass(slots=True)
+class GroupSettingUpdateData:
+    create_multiuse_invite_group: int | AnonymousSettingGroupDict | None = None
+    can_access_all_users_group: int | AnonymousSettingGroupDict | None = None
+    can_add_custom_emoji_group: int | AnonymousSettingGroupDict | None = None
+    can_create_groups: int | AnonymousSettingGroupDict | None = None
+    can_create_public_channel_group: int | AnonymousSettingGroupDict | None = None
+    can_create_private_channel_group: int | AnonymousSettingGroupDict | None = None
+    can_create_web_public_channel_group: int | AnonymousSettingGroupDict | None = None
+    can_delete_any_message_group: int | AnonymousSettingGroupDict | None = None
+    can_delete_own_message_group: int | AnonymousSettingGroupDict | None = None
+    can_invite_users_group: int | AnonymousSettingGroupDict | None = None
+    can_manage_all_groups: int | AnonymousSettingGroupDict | None = None
+    can_move_messages_between_channels_group: int | AnonymousSettingGroupDict | None = None
+    can_move_messages_between_topics_group: int | AnonymousSettingGroupDict | None = None
+    direct_message_initiator_group: int | AnonymousSettingGroupDict | None = None
+    direct_message_permission_group: int | AnonymousSettingGroupDict | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> GroupSettingUpdateData:
+        return cls(
+            d.get("create_multiuse_invite_group"),
+            d.get("can_access_all_users_group"),
+            d.get("can_add_custom_emoji_group"),
+            d.get("can_create_groups"),
+            d.get("can_create_public_channel_group"),
+            d.get("can_create_private_channel_group"),
+            d.get("can_create_web_public_channel_group"),
+            d.get("can_delete_any_message_group"),
+            d.get("can_delete_own_message_group"),
+            d.get("can_invite_users_group"),
+            d.get("can_manage_all_groups"),
+            d.get("can_move_messages_between_channels_group"),
+            d.get("can_move_messages_between_topics_group"),
+            d.get("direct_message_initiator_group"),
+            d.get("direct_message_permission_group"),
+        )
+
+
+@dataclass(slots=True)
+class PlanTypeData:
+    plan_type: int
+    upload_quota_mib: int | None
+    max_file_upload_size_mib: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PlanTypeData:
+        return cls(
+            d["plan_type"],
+            d["upload_quota_mib"],
+            d["max_file_upload_size_mib"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmUpdateDict:
+    type: Literal["realm"]
+    op: Literal["update_dict"]
+    property: Literal["default", "icon", "logo", "night_logo"]
+    data: (
+        AllowMessageEditingData
+        | AuthenticationData
+        | IconData
+        | LogoData
+        | MessageContentEditLimitSecondsData
+        | NightLogoData
+        | GroupSettingUpdateData
+        | PlanTypeData
+    )
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUpdateDict:
+        v = d["data"]
+        data = _from_union(v, _EventRealmUpdateDict_data)
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            data,
+            d["id"],
+        )
+
+
+_EventRealmUpdateDict_data = (
+    AllowMessageEditingData,
+    AuthenticationData,
+    IconData,
+    LogoData,
+    MessageContentEditLimitSecondsData,
+    NightLogoData,
+    GroupSettingUpdateData,
+    PlanTypeData,
+)
+
+
+@dataclass(slots=True)
+class EventRealmUpdate:
+    type: Literal["realm"]
+    op: Literal["update"]
+    property: str
+    value: bool | int | str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUpdate:
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            d["value"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RealmUser:
+    user_id: int
+    email: str
+    avatar_url: str | None
+    avatar_version: int
+    full_name: str
+    is_admin: bool
+    is_billing_admin: bool
+    is_owner: bool
+    is_bot: bool
+    is_guest: bool
+    role: Literal[100, 200, 300, 400, 600]
+    is_active: bool
+    profile_data: dict[str, dict[str, object]]
+    timezone: str
+    date_joined: str
+    delivery_email: str | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RealmUser:
+        return cls(
+            d["user_id"],
+            d["email"],
+            d["avatar_url"],
+            d["avatar_version"],
+            d["full_name"],
+            d["is_admin"],
+            d["is_billing_admin"],
+            d["is_owner"],
+            d["is_bot"],
+            d["is_guest"],
+            d["role"],
+            d["is_active"],
+            d["profile_data"],
+            d["timezone"],
+            d["date_joined"],
+            d["delivery_email"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmUserAdd:
+    type: Literal["realm_user"]
+    op: Literal["add"]
+    person: RealmUser
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUserAdd:
+        v = d["person"]
+        person = RealmUser.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            person,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RemovedUser:
+    user_id: int
+    full_name: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RemovedUser:
+        return cls(
+            d["user_id"],
+            d["full_name"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmUserRemove:
+    type: Literal["realm_user"]
+    op: Literal["remove"]
+    person: RemovedUser
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUserRemove:
+        v = d["person"]
+        person = RemovedUser.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            person,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmUserSettingsDefaultsUpdate:
+    type: Literal["realm_user_settings_defaults"]
+    op: Literal["update"]
+    property: str
+    value: bool | int | str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUserSettingsDefaultsUpdate:
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            d["value"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class PersonAvatarFields:
+    user_id: int
+    avatar_source: str
+    avatar_url: str | None
+    avatar_url_medium: str | None
+    avatar_version: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonAvatarFields:
+        return cls(
+            d["user_id"],
+            d["avatar_source"],
+            d["avatar_url"],
+            d["avatar_url_medium"],
+            d["avatar_version"],
+        )
+
+
+@dataclass(slots=True)
+class PersonBotOwnerId:
+    user_id: int
+    bot_owner_id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonBotOwnerId:
+        return cls(
+            d["user_id"],
+            d["bot_owner_id"],
+        )
+
+
+@dataclass(slots=True)
+class CustomProfileField:
+    id: int
+    value: str | None
+    rendered_value: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> CustomProfileField:
+        return cls(
+            d["id"],
+            d["value"],
+            d.get("rendered_value"),
+        )
+
+
+@dataclass(slots=True)
+class PersonCustomProfileField:
+    user_id: int
+    custom_profile_field: CustomProfileField
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonCustomProfileField:
+        v = d["custom_profile_field"]
+        custom_profile_field = CustomProfileField.from_validated_dict(v)
+        return cls(
+            d["user_id"],
+            custom_profile_field,
+        )
+
+
+@dataclass(slots=True)
+class PersonDeliveryEmail:
+    user_id: int
+    delivery_email: str | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonDeliveryEmail:
+        return cls(
+            d["user_id"],
+            d["delivery_email"],
+        )
+
+
+@dataclass(slots=True)
+class PersonEmail:
+    user_id: int
+    new_email: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonEmail:
+        return cls(
+            d["user_id"],
+            d["new_email"],
+        )
+
+
+@dataclass(slots=True)
+class PersonFullName:
+    user_id: int
+    full_name: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonFullName:
+        return cls(
+            d["user_id"],
+            d["full_name"],
+        )
+
+
+@dataclass(slots=True)
+class PersonIsBillingAdmin:
+    user_id: int
+    is_billing_admin: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonIsBillingAdmin:
+        return cls(
+            d["user_id"],
+            d["is_billing_admin"],
+        )
+
+
+@dataclass(slots=True)
+class PersonRole:
+    user_id: int
+    role: Literal[100, 200, 300, 400, 600]
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonRole:
+        return cls(
+            d["user_id"],
+            d["role"],
+        )
+
+
+@dataclass(slots=True)
+class PersonTimezone:
+    user_id: int
+    email: str
+    timezone: str
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonTimezone:
+        return cls(
+            d["user_id"],
+            d["email"],
+            d["timezone"],
+        )
+
+
+@dataclass(slots=True)
+class PersonIsActive:
+    user_id: int
+    is_active: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> PersonIsActive:
+        return cls(
+            d["user_id"],
+            d["is_active"],
+        )
+
+
+@dataclass(slots=True)
+class EventRealmUserUpdate:
+    type: Literal["realm_user"]
+    op: Literal["update"]
+    person: (
+        PersonAvatarFields
+        | PersonBotOwnerId
+        | PersonCustomProfileField
+        | PersonDeliveryEmail
+        | PersonEmail
+        | PersonFullName
+        | PersonIsBillingAdmin
+        | PersonRole
+        | PersonTimezone
+        | PersonIsActive
+    )
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRealmUserUpdate:
+        v = d["person"]
+        person = _from_union(v, _EventRealmUserUpdate_person)
+        return cls(
+            d["type"],
+            d["op"],
+            person,
+            d["id"],
+        )
+
+
+_EventRealmUserUpdate_person = (
+    PersonAvatarFields,
+    PersonBotOwnerId,
+    PersonCustomProfileField,
+    PersonDeliveryEmail,
+    PersonEmail,
+    PersonFullName,
+    PersonIsBillingAdmin,
+    PersonRole,
+    PersonTimezone,
+    PersonIsActive,
+)
+
+
+@dataclass(slots=True)
+class EventRestart:
+    type: Literal["restart"]
+    zulip_version: str
+    zulip_merge_base: str
+    zulip_feature_level: int
+    server_generation: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventRestart:
+        return cls(
+            d["type"],
+            d["zulip_version"],
+            d["zulip_merge_base"],
+            d["zulip_feature_level"],
+            d["server_generation"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class SavedSnippetFields:
+    id: int
+    title: str
+    content: str
+    date_created: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> SavedSnippetFields:
+        return cls(
+            d["id"],
+            d["title"],
+            d["content"],
+            d["date_created"],
+        )
+
+
+@dataclass(slots=True)
+class EventSavedSnippetAdd:
+    type: Literal["saved_snippets"]
+    op: Literal["add"]
+    saved_snippet: SavedSnippetFields
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSavedSnippetAdd:
+        v = d["saved_snippet"]
+        saved_snippet = SavedSnippetFields.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            saved_snippet,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventSavedSnippetRemove:
+    type: Literal["saved_snippets"]
+    op: Literal["remove"]
+    saved_snippet_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSavedSnippetRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["saved_snippet_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class ScheduledMessageFields:
+    scheduled_message_id: int
+    type: Literal["private", "stream"]
+    to: list[int] | int
+    content: str
+    rendered_content: str
+    scheduled_delivery_timestamp: int
+    failed: bool
+    topic: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> ScheduledMessageFields:
+        return cls(
+            d["scheduled_message_id"],
+            d["type"],
+            d["to"],
+            d["content"],
+            d["rendered_content"],
+            d["scheduled_delivery_timestamp"],
+            d["failed"],
+            d.get("topic"),
+        )
+
+
+@dataclass(slots=True)
+class EventScheduledMessagesAdd:
+    type: Literal["scheduled_messages"]
+    op: Literal["add"]
+    scheduled_messages: list[ScheduledMessageFields]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventScheduledMessagesAdd:
+        v = d["scheduled_messages"]
+        scheduled_messages = [ScheduledMessageFields.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            scheduled_messages,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventScheduledMessagesRemove:
+    type: Literal["scheduled_messages"]
+    op: Literal["remove"]
+    scheduled_message_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventScheduledMessagesRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["scheduled_message_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventScheduledMessagesUpdate:
+    type: Literal["scheduled_messages"]
+    op: Literal["update"]
+    scheduled_message: ScheduledMessageFields
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventScheduledMessagesUpdate:
+        v = d["scheduled_message"]
+        scheduled_message = ScheduledMessageFields.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            scheduled_message,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class BasicStreamFields:
+    is_archived: bool
+    can_administer_channel_group: int | AnonymousSettingGroupDict
+    can_remove_subscribers_group: int | AnonymousSettingGroupDict
+    creator_id: int | None
+    date_created: int
+    description: str
+    first_message_id: int | None
+    is_recently_active: bool
+    history_public_to_subscribers: bool
+    invite_only: bool
+    is_announcement_only: bool
+    is_web_public: bool
+    message_retention_days: int | None
+    name: str
+    rendered_description: str
+    stream_id: int
+    stream_post_policy: int
+    stream_weekly_traffic: int | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> BasicStreamFields:
+        return cls(
+            d["is_archived"],
+            d["can_administer_channel_group"],
+            d["can_remove_subscribers_group"],
+            d["creator_id"],
+            d["date_created"],
+            d["description"],
+            d["first_message_id"],
+            d["is_recently_active"],
+            d["history_public_to_subscribers"],
+            d["invite_only"],
+            d["is_announcement_only"],
+            d["is_web_public"],
+            d["message_retention_days"],
+            d["name"],
+            d["rendered_description"],
+            d["stream_id"],
+            d["stream_post_policy"],
+            d["stream_weekly_traffic"],
+        )
+
+
+@dataclass(slots=True)
+class EventStreamCreate:
+    type: Literal["stream"]
+    op: Literal["create"]
+    streams: list[BasicStreamFields]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventStreamCreate:
+        v = d["streams"]
+        streams = [BasicStreamFields.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            streams,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventStreamDelete:
+    type: Literal["stream"]
+    op: Literal["delete"]
+    streams: list[BasicStreamFields]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventStreamDelete:
+        v = d["streams"]
+        streams = [BasicStreamFields.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            streams,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventStreamUpdate:
+    type: Literal["stream"]
+    op: Literal["update"]
+    property: str
+    value: bool | int | str | AnonymousSettingGroupDict | Literal[None]
+    name: str
+    stream_id: int
+    id: int
+    rendered_description: str | None = None
+    history_public_to_subscribers: bool | None = None
+    is_web_public: bool | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventStreamUpdate:
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            d["value"],
+            d["name"],
+            d["stream_id"],
+            d["id"],
+            d.get("rendered_description"),
+            d.get("history_public_to_subscribers"),
+            d.get("is_web_public"),
+        )
+
+
+@dataclass(slots=True)
+class EventSubmessage:
+    type: Literal["submessage"]
+    message_id: int
+    submessage_id: int
+    sender_id: int
+    msg_type: str
+    content: str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubmessage:
+        return cls(
+            d["type"],
+            d["message_id"],
+            d["submessage_id"],
+            d["sender_id"],
+            d["msg_type"],
+            d["content"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class SingleSubscription:
+    is_archived: bool
+    can_administer_channel_group: int | AnonymousSettingGroupDict
+    can_remove_subscribers_group: int | AnonymousSettingGroupDict
+    creator_id: int | None
+    date_created: int
+    description: str
+    first_message_id: int | None
+    is_recently_active: bool
+    history_public_to_subscribers: bool
+    invite_only: bool
+    is_announcement_only: bool
+    is_web_public: bool
+    message_retention_days: int | None
+    name: str
+    rendered_description: str
+    stream_id: int
+    stream_post_policy: int
+    stream_weekly_traffic: int | None
+    audible_notifications: bool | None
+    color: str
+    desktop_notifications: bool | None
+    email_notifications: bool | None
+    in_home_view: bool
+    is_muted: bool
+    pin_to_top: bool
+    push_notifications: bool | None
+    subscribers: list[int]
+    wildcard_mentions_notify: bool | None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> SingleSubscription:
+        return cls(
+            d["is_archived"],
+            d["can_administer_channel_group"],
+            d["can_remove_subscribers_group"],
+            d["creator_id"],
+            d["date_created"],
+            d["description"],
+            d["first_message_id"],
+            d["is_recently_active"],
+            d["history_public_to_subscribers"],
+            d["invite_only"],
+            d["is_announcement_only"],
+            d["is_web_public"],
+            d["message_retention_days"],
+            d["name"],
+            d["rendered_description"],
+            d["stream_id"],
+            d["stream_post_policy"],
+            d["stream_weekly_traffic"],
+            d["audible_notifications"],
+            d["color"],
+            d["desktop_notifications"],
+            d["email_notifications"],
+            d["in_home_view"],
+            d["is_muted"],
+            d["pin_to_top"],
+            d["push_notifications"],
+            d["subscribers"],
+            d["wildcard_mentions_notify"],
+        )
+
+
+@dataclass(slots=True)
+class EventSubscriptionAdd:
+    type: Literal["subscription"]
+    op: Literal["add"]
+    subscriptions: list[SingleSubscription]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubscriptionAdd:
+        v = d["subscriptions"]
+        subscriptions = [SingleSubscription.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            subscriptions,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventSubscriptionPeerAdd:
+    type: Literal["subscription"]
+    op: Literal["peer_add"]
+    user_ids: list[int]
+    stream_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubscriptionPeerAdd:
+        return cls(
+            d["type"],
+            d["op"],
+            d["user_ids"],
+            d["stream_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventSubscriptionPeerRemove:
+    type: Literal["subscription"]
+    op: Literal["peer_remove"]
+    user_ids: list[int]
+    stream_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubscriptionPeerRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["user_ids"],
+            d["stream_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class RemoveSub:
+    name: str
+    stream_id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> RemoveSub:
+        return cls(
+            d["name"],
+            d["stream_id"],
+        )
+
+
+@dataclass(slots=True)
+class EventSubscriptionRemove:
+    type: Literal["subscription"]
+    op: Literal["remove"]
+    subscriptions: list[RemoveSub]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubscriptionRemove:
+        v = d["subscriptions"]
+        subscriptions = [RemoveSub.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            subscriptions,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventSubscriptionUpdate:
+    type: Literal["subscription"]
+    op: Literal["update"]
+    property: str
+    stream_id: int
+    value: bool | int | str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventSubscriptionUpdate:
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            d["stream_id"],
+            d["value"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class TypingPerson:
+    email: str
+    user_id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> TypingPerson:
+        return cls(
+            d["email"],
+            d["user_id"],
+        )
+
+
+@dataclass(slots=True)
+class EventTypingStart:
+    type: Literal["typing"]
+    op: Literal["start"]
+    message_type: Literal["direct", "stream"]
+    sender: TypingPerson
+    id: int
+    recipients: list[TypingPerson] | None = None
+    stream_id: int | None = None
+    topic: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventTypingStart:
+        v = d["sender"]
+        sender = TypingPerson.from_validated_dict(v)
+        recipients = None
+        if (v := d.get("recipients")) is not None:
+            recipients = [TypingPerson.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            d["message_type"],
+            sender,
+            d["id"],
+            recipients,
+            d.get("stream_id"),
+            d.get("topic"),
+        )
+
+
+@dataclass(slots=True)
+class EventTypingStop:
+    type: Literal["typing"]
+    op: Literal["stop"]
+    message_type: Literal["direct", "stream"]
+    sender: TypingPerson
+    id: int
+    recipients: list[TypingPerson] | None = None
+    stream_id: int | None = None
+    topic: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventTypingStop:
+        v = d["sender"]
+        sender = TypingPerson.from_validated_dict(v)
+        recipients = None
+        if (v := d.get("recipients")) is not None:
+            recipients = [TypingPerson.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["op"],
+            d["message_type"],
+            sender,
+            d["id"],
+            recipients,
+            d.get("stream_id"),
+            d.get("topic"),
+        )
+
+
+@dataclass(slots=True)
+class EventUpdateDisplaySettings:
+    type: Literal["update_display_settings"]
+    setting_name: str
+    setting: bool | int | str
+    user: str
+    id: int
+    language_name: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUpdateDisplaySettings:
+        return cls(
+            d["type"],
+            d["setting_name"],
+            d["setting"],
+            d["user"],
+            d["id"],
+            d.get("language_name"),
+        )
+
+
+@dataclass(slots=True)
+class EventUpdateGlobalNotifications:
+    type: Literal["update_global_notifications"]
+    notification_name: str
+    setting: bool | int | str
+    user: str
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUpdateGlobalNotifications:
+        return cls(
+            d["type"],
+            d["notification_name"],
+            d["setting"],
+            d["user"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUpdateMessage:
+    type: Literal["update_message"]
+    user_id: int | None
+    edit_timestamp: int
+    message_id: int
+    flags: list[str]
+    message_ids: list[int]
+    rendering_only: bool
+    id: int
+    stream_id: int | None = None
+    stream_name: str | None = None
+    is_me_message: bool | None = None
+    orig_content: str | None = None
+    orig_rendered_content: str | None = None
+    content: str | None = None
+    rendered_content: str | None = None
+    topic_links: list[TopicLink] | None = None
+    subject: str | None = None
+    new_stream_id: int | None = None
+    propagate_mode: Literal["change_all", "change_later", "change_one"] | None = None
+    orig_subject: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUpdateMessage:
+        topic_links = None
+        if (v := d.get("topic_links")) is not None:
+            topic_links = [TopicLink.from_validated_dict(x) for x in v]
+        return cls(
+            d["type"],
+            d["user_id"],
+            d["edit_timestamp"],
+            d["message_id"],
+            d["flags"],
+            d["message_ids"],
+            d["rendering_only"],
+            d["id"],
+            d.get("stream_id"),
+            d.get("stream_name"),
+            d.get("is_me_message"),
+            d.get("orig_content"),
+            d.get("orig_rendered_content"),
+            d.get("content"),
+            d.get("rendered_content"),
+            topic_links,
+            d.get("subject"),
+            d.get("new_stream_id"),
+            d.get("propagate_mode"),
+            d.get("orig_subject"),
+        )
+
+
+@dataclass(slots=True)
+class EventUpdateMessageFlagsAdd:
+    type: Literal["update_message_flags"]
+    op: Literal["add"]
+    operation: Literal["add"]
+    flag: str
+    messages: list[int]
+    all: bool
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUpdateMessageFlagsAdd:
+        return cls(
+            d["type"],
+            d["op"],
+            d["operation"],
+            d["flag"],
+            d["messages"],
+            d["all"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class MessageDetails:
+    type: Literal["private", "stream"]
+    mentioned: bool | None = None
+    user_ids: list[int] | None = None
+    stream_id: int | None = None
+    topic: str | None = None
+    unmuted_stream_msg: bool | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> MessageDetails:
+        return cls(
+            d["type"],
+            d.get("mentioned"),
+            d.get("user_ids"),
+            d.get("stream_id"),
+            d.get("topic"),
+            d.get("unmuted_stream_msg"),
+        )
+
+
+@dataclass(slots=True)
+class EventUpdateMessageFlagsRemove:
+    type: Literal["update_message_flags"]
+    op: Literal["remove"]
+    operation: Literal["remove"]
+    flag: str
+    messages: list[int]
+    all: bool
+    id: int
+    message_details: dict[str, MessageDetails] | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUpdateMessageFlagsRemove:
+        message_details = None
+        if (v := d.get("message_details")) is not None:
+            message_details = {k: MessageDetails.from_validated_dict(x) for k, x in v.items()}
+        return cls(
+            d["type"],
+            d["op"],
+            d["operation"],
+            d["flag"],
+            d["messages"],
+            d["all"],
+            d["id"],
+            message_details,
+        )
+
+
+@dataclass(slots=True)
+class Group:
+    id: int
+    name: str
+    creator_id: int | None
+    date_created: int | None
+    members: list[int]
+    direct_subgroup_ids: list[int]
+    description: str
+    is_system_group: bool
+    can_add_members_group: int | AnonymousSettingGroupDict
+    can_join_group: int | AnonymousSettingGroupDict
+    can_leave_group: int | AnonymousSettingGroupDict
+    can_manage_group: int | AnonymousSettingGroupDict
+    can_mention_group: int | AnonymousSettingGroupDict
+    can_remove_members_group: int | AnonymousSettingGroupDict
+    deactivated: bool
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> Group:
+        return cls(
+            d["id"],
+            d["name"],
+            d["creator_id"],
+            d["date_created"],
+            d["members"],
+            d["direct_subgroup_ids"],
+            d["description"],
+            d["is_system_group"],
+            d["can_add_members_group"],
+            d["can_join_group"],
+            d["can_leave_group"],
+            d["can_manage_group"],
+            d["can_mention_group"],
+            d["can_remove_members_group"],
+            d["deactivated"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupAdd:
+    type: Literal["user_group"]
+    op: Literal["add"]
+    group: Group
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupAdd:
+        v = d["group"]
+        group = Group.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            group,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupAddMembers:
+    type: Literal["user_group"]
+    op: Literal["add_members"]
+    group_id: int
+    user_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupAddMembers:
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            d["user_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupAddSubgroups:
+    type: Literal["user_group"]
+    op: Literal["add_subgroups"]
+    group_id: int
+    direct_subgroup_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupAddSubgroups:
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            d["direct_subgroup_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupRemove:
+    type: Literal["user_group"]
+    op: Literal["remove"]
+    group_id: int
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupRemove:
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupRemoveMembers:
+    type: Literal["user_group"]
+    op: Literal["remove_members"]
+    group_id: int
+    user_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupRemoveMembers:
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            d["user_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupRemoveSubgroups:
+    type: Literal["user_group"]
+    op: Literal["remove_subgroups"]
+    group_id: int
+    direct_subgroup_ids: list[int]
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupRemoveSubgroups:
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            d["direct_subgroup_ids"],
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class UserGroupData:
+    name: str | None = None
+    description: str | None = None
+    can_add_members_group: int | AnonymousSettingGroupDict | None = None
+    can_join_group: int | AnonymousSettingGroupDict | None = None
+    can_leave_group: int | AnonymousSettingGroupDict | None = None
+    can_manage_group: int | AnonymousSettingGroupDict | None = None
+    can_mention_group: int | AnonymousSettingGroupDict | None = None
+    can_remove_members_group: int | AnonymousSettingGroupDict | None = None
+    deactivated: bool | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> UserGroupData:
+        return cls(
+            d.get("name"),
+            d.get("description"),
+            d.get("can_add_members_group"),
+            d.get("can_join_group"),
+            d.get("can_leave_group"),
+            d.get("can_manage_group"),
+            d.get("can_mention_group"),
+            d.get("can_remove_members_group"),
+            d.get("deactivated"),
+        )
+
+
+@dataclass(slots=True)
+class EventUserGroupUpdate:
+    type: Literal["user_group"]
+    op: Literal["update"]
+    group_id: int
+    data: UserGroupData
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserGroupUpdate:
+        v = d["data"]
+        data = UserGroupData.from_validated_dict(v)
+        return cls(
+            d["type"],
+            d["op"],
+            d["group_id"],
+            data,
+            d["id"],
+        )
+
+
+@dataclass(slots=True)
+class EventUserSettingsUpdate:
+    type: Literal["user_settings"]
+    op: Literal["update"]
+    property: str
+    value: bool | int | str
+    id: int
+    language_name: str | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserSettingsUpdate:
+        return cls(
+            d["type"],
+            d["op"],
+            d["property"],
+            d["value"],
+            d["id"],
+            d.get("language_name"),
+        )
+
+
+@dataclass(slots=True)
+class EventUserStatus:
+    type: Literal["user_status"]
+    user_id: int
+    id: int
+    away: bool | None = None
+    status_text: str | None = None
+    emoji_name: str | None = None
+    emoji_code: str | None = None
+    reaction_type: Literal["realm_emoji", "unicode_emoji", "zulip_extra_emoji"] | None = None
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserStatus:
+        return cls(
+            d["type"],
+            d["user_id"],
+            d["id"],
+            d.get("away"),
+            d.get("status_text"),
+            d.get("emoji_name"),
+            d.get("emoji_code"),
+            d.get("reaction_type"),
+        )
+
+
+@dataclass(slots=True)
+class EventUserTopic:
+    id: int
+    type: Literal["user_topic"]
+    stream_id: int
+    topic_name: str
+    last_updated: int
+    visibility_policy: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventUserTopic:
+        return cls(
+            d["id"],
+            d["type"],
+            d["stream_id"],
+            d["topic_name"],
+            d["last_updated"],
+            d["visibility_policy"],
+        )
+
+
+@dataclass(slots=True)
+class EventWebReloadClient:
+    type: Literal["web_reload_client"]
+    immediate: bool
+    id: int
+
+    @classmethod
+    def from_validated_dict(cls, d: dict[str, Any]) -> EventWebReloadClient:
+        return cls(
+            d["type"],
+            d["immediate"],
+            d["id"],
+        )
+
+
+COMPACT_MODELS: dict[str, Any] = {
+    "EventAlertWords": EventAlertWords,
+    "EventAttachmentAdd": EventAttachmentAdd,
+    "EventAttachmentRemove": EventAttachmentRemove,
+    "EventAttachmentUpdate": EventAttachmentUpdate,
+    "EventCustomProfileFields": EventCustomProfileFields,
+    "EventDefaultStreamGroups": EventDefaultStreamGroups,
+    "EventDefaultStreams": EventDefaultStreams,
+    "EventDeleteMessage": EventDeleteMessage,
+    "EventDirectMessage": EventDirectMessage,
+    "EventDraftsAdd": EventDraftsAdd,
+    "EventDraftsRemove": EventDraftsRemove,
+    "EventDraftsUpdate": EventDraftsUpdate,
+    "EventHasZoomToken": EventHasZoomToken,
+    "EventHeartbeat": EventHeartbeat,
+    "EventInvitesChanged": EventInvitesChanged,
+    "EventMessage": EventMessage,
+    "EventMutedTopics": EventMutedTopics,
+    "EventMutedUsers": EventMutedUsers,
+    "EventOnboardingSteps": EventOnboardingSteps,
+    "EventPresence": EventPresence,
+    "EventReactionAdd": EventReactionAdd,
+    "EventReactionRemove": EventReactionRemove,
+    "EventRealmBotAdd": EventRealmBotAdd,
+    "EventRealmBotDelete": EventRealmBotDelete,
+    "EventRealmBotUpdate": EventRealmBotUpdate,
+    "EventRealmDeactivated": EventRealmDeactivated,
+    "EventRealmDomainsAdd": EventRealmDomainsAdd,
+    "EventRealmDomainsChange": EventRealmDomainsChange,
+    "EventRealmDomainsRemove": EventRealmDomainsRemove,
+    "EventRealmEmojiUpdate": EventRealmEmojiUpdate,
+    "EventRealmExportConsent": EventRealmExportConsent,
+    "EventRealmExport": EventRealmExport,
+    "EventRealmLinkifiers": EventRealmLinkifiers,
+    "EventRealmPlaygrounds": EventRealmPlaygrounds,
+    "EventRealmUpdateDict": EventRealmUpdateDict,
+    "EventRealmUpdate": EventRealmUpdate,
+    "EventRealmUserAdd": EventRealmUserAdd,
+    "EventRealmUserRemove": EventRealmUserRemove,
+    "EventRealmUserSettingsDefaultsUpdate": EventRealmUserSettingsDefaultsUpdate,
+    "EventRealmUserUpdate": EventRealmUserUpdate,
+    "EventRestart": EventRestart,
+    "EventSavedSnippetAdd": EventSavedSnippetAdd,
+    "EventSavedSnippetRemove": EventSavedSnippetRemove,
+    "EventScheduledMessagesAdd": EventScheduledMessagesAdd,
+    "EventScheduledMessagesRemove": EventScheduledMessagesRemove,
+    "EventScheduledMessagesUpdate": EventScheduledMessagesUpdate,
+    "EventStreamCreate": EventStreamCreate,
+    "EventStreamDelete": EventStreamDelete,
+    "EventStreamUpdate": EventStreamUpdate,
+    "EventSubmessage": EventSubmessage,
+    "EventSubscriptionAdd": EventSubscriptionAdd,
+    "EventSubscriptionPeerAdd": EventSubscriptionPeerAdd,
+    "EventSubscriptionPeerRemove": EventSubscriptionPeerRemove,
+    "EventSubscriptionRemove": EventSubscriptionRemove,
+    "EventSubscriptionUpdate": EventSubscriptionUpdate,
+    "EventTypingStart": EventTypingStart,
+    "EventTypingStop": EventTypingStop,
+    "EventUpdateDisplaySettings": EventUpdateDisplaySettings,
+    "EventUpdateGlobalNotifications": EventUpdateGlobalNotifications,
+    "EventUpdateMessage": EventUpdateMessage,
+    "EventUpdateMessageFlagsAdd": EventUpdateMessageFlagsAdd,
+    "EventUpdateMessageFlagsRemove": EventUpdateMessageFlagsRemove,
+    "EventUserGroupAdd": EventUserGroupAdd,
+    "EventUserGroupAddMembers": EventUserGroupAddMembers,
+    "EventUserGroupAddSubgroups": EventUserGroupAddSubgroups,
+    "EventUserGroupRemove": EventUserGroupRemove,
+    "EventUserGroupRemoveMembers": EventUserGroupRemoveMembers,
+    "EventUserGroupRemoveSubgroups": EventUserGroupRemoveSubgroups,
+    "EventUserGroupUpdate": EventUserGroupUpdate,
+    "EventUserSettingsUpdate": EventUserSettingsUpdate,
+    "EventUserStatus": EventUserStatus,
+    "EventUserTopic": EventUserTopic,
+    "EventWebReloadClient": EventWebReloadClient,
+}
@@ -0,0 +1,138 @@
+# Records which shapes of events actually go through validation: how
+# many events of each model, which branch of each union they take
+# (like which of EventRealmUpdateDict's data models, or which person
+# flavor of realm_user/update), and how often each optional field is
+# present.  That tells us which fast paths are worth specializing.
+#
+# Recording walks each accepted event against its model's annotations
+# in Python, and works out union branches by validating the value
+# against each arm, so it's for sampling traffic (or replaying a
+# corpus), not for leaving on.  To pick the branch pydantic's "smart"
+# unions would pick, we prefer the arm whose model gets the most
+# fields set, and the first one on ties.
+from collections import Counter
+from dataclasses import dataclass, field
+from types import NoneType, UnionType
+from typing import Annotated, Any, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+def annotation_name(annotation: Any) -> str:
+    if isinstance(annotation, type):
+        return annotation.__name__
+    return str(annotation).replace("typing.", "")
+
+
+@dataclass
+class ModelCoverage:
+    events: int = 0
+    # Optional field -> how many of the events had it.
+    optional: Counter[str] = field(default_factory=Counter)
+    # Field -> union branch -> how many values took it.  Only unions
+    # with more than one arm besides None count.
+    branches: dict[str, Counter[str]] = field(default_factory=dict)
+
+
+class ShapeCoverage:
+    def __init__(self) -> None:
+        self.models: dict[str, ModelCoverage] = {}
+        # Keyed by id(), since not all annotations are hashable.
+        self.adapters: dict[int, tuple[Any, TypeAdapter[Any]]] = {}
+        self.last_event: dict[str, Any] = {}
+
+    def adapter(self, annotation: Any) -> TypeAdapter[Any]:
+        if id(annotation) not in self.adapters:
+            self.adapters[id(annotation)] = (annotation, TypeAdapter(annotation))
+        return self.adapters[id(annotation)][1]
+
+    def model_coverage(self, model: type[BaseModel]) -> ModelCoverage:
+        coverage = self.models.get(model.__name__)
+        if coverage is None:
+            coverage = self.models[model.__name__] = ModelCoverage()
+            for key, model_field in model.model_fields.items():
+                if not model_field.is_required():
+                    coverage.optional[key] = 0
+        return coverage
+
+    def record(self, event: Any, model: type[BaseModel]) -> None:
+        """Records an event that validated against model.
+
+        Checkers that then validate a part of the event on its own
+        (like the person flavors in check_realm_user_update) would
+        count that part twice, so we skip the values of the last
+        event we recorded."""
+        if type(event) is not dict or any(event is value for value in self.last_event.values()):
+            return
+        self.last_event = event
+        self.record_model(event, model)
+
+    def record_model(self, event: Any, model: type[BaseModel]) -> None:
+        if type(event) is not dict:
+            return
+        coverage = self.model_coverage(model)
+        coverage.events += 1
+        for key, model_field in model.model_fields.items():
+            if key not in event:
+                continue
+            if key in coverage.optional:
+                coverage.optional[key] += 1
+            self.walk(event[key], model_field.annotation, coverage, key)
+
+    def walk(self, value: Any, annotation: Any, coverage: ModelCoverage, key: str) -> None:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        if origin is Annotated:
+            self.walk(value, args[0], coverage, key)
+        elif origin in (Union, UnionType):
+            arms = [arm for arm in args if arm is not NoneType]
+            if value is None or len(arms) == 1:
+                if value is not None:
+                    self.walk(value, arms[0], coverage, key)
+                return
+            branches = coverage.branches.get(key)
+            if branches is None:
+                branches = coverage.branches[key] = Counter(
+                    {annotation_name(arm): 0 for arm in arms}
+                )
+            arm = self.branch(value, arms)
+            if arm is not None:
+                branches[annotation_name(arm)] += 1
+                self.walk(value, arm, coverage, key)
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            self.record_model(value, annotation)
+        elif origin is list and type(value) is list:
+            for item in value:
+                self.walk(item, args[0], coverage, key)
+        elif origin is dict and type(value) is dict:
+            for item in value.values():
+                self.walk(item, args[1], coverage, key)
+        elif origin is tuple and type(value) is tuple and Ellipsis not in args:
+            for item, item_annotation in zip(value, args, strict=False):
+                self.walk(item, item_annotation, coverage, key)
+
+    def branch(self, value: Any, arms: list[Any]) -> Any:
+        best = None
+        best_fields = -1
+        for arm in arms:
+            try:
+                validated = self.adapter(arm).validate_python(value, strict=True)
+            except ValidationError:
+                continue
+            fields = len(validated.model_fields_set) if isinstance(validated, BaseModel) else 0
+            if fields > best_fields:
+                best, best_fields = arm, fields
+        return best
+
+    def summary(self) -> dict[str, Any]:
+        """A JSON-friendly summary, busiest models first."""
+        return {
+            name: {
+                "events": coverage.events,
+                "optional": dict(coverage.optional.most_common()),
+                "branches": {
+                    key: dict(branches.most_common()) for key, branches in coverage.branches.items()
+                },
+            }
+            for name, coverage in sorted(self.models.items(), key=lambda item: -item[1].events)
+        }
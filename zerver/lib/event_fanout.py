@@ -0,0 +1,79 @@
+# Validation for the copies of an event that the server queues when it
+# fans one event out to many recipients.
+#
+# When a message goes to N users, the queue holds N message events
+# that differ only in `flags`, usually all pointing at the same
+# `message` dict.  FanoutValidator checks such a batch by validating
+# the shared sub-object once per distinct object, and then just the
+# small per-recipient envelopes (everything but the shared key), which
+# we check column by column for the whole batch.
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from zerver.lib.event_columnar import ColumnarValidator
+
+
+def envelope_model(model: type[BaseModel], excluded: set[str]) -> type[BaseModel]:
+    """A copy of model without the excluded fields.  Models ignore
+    unknown keys, so it can be run on whole events; callers have to
+    check for extra keys themselves."""
+    return create_model(  # type: ignore[call-overload,no-any-return]
+        f"{model.__name__}Envelope",
+        **{
+            key: (field.annotation, field)
+            for key, field in model.model_fields.items()
+            if key not in excluded
+        },
+    )
+
+
+class FanoutValidator:
+    def __init__(self, model: type[BaseModel], shared_key: str) -> None:
+        self.model = model
+        self.shared_key = shared_key
+        self.allowed_fields = frozenset(model.model_fields)
+        self.shared = TypeAdapter(model.model_fields[shared_key].annotation)
+        self.envelopes = ColumnarValidator(envelope_model(model, {shared_key}))
+
+    def validate(self, events: list[dict[str, Any]], *, by_id: str | None = None) -> int:
+        """Validates every event in the batch like validate_event_with_model_type
+        would, and returns how many times the shared object was validated.
+
+        By default, copies only share a validation if they share the very
+        same object.  Passing by_id="id" also skips objects whose `id`
+        matches one validated earlier in the batch, which is only right if
+        the caller knows that copies with the same id are equal.
+        """
+        shared_key = self.shared_key
+        validated_objects: dict[int, object] = {}
+        validated_ids: set[int] = set()
+
+        for event in events:
+            if type(event) is not dict:
+                raise ValueError(f"Event is not a dict: {type(event).__name__}")
+            if not event.keys() <= self.allowed_fields:
+                raise ValueError(f"Extra fields not allowed: {set(event) - self.allowed_fields}")
+        self.envelopes.validate(events)
+
+        for event in events:
+            if shared_key not in event:
+                # Let the full model produce the usual "missing" error.
+                self.model.model_validate(event, strict=True)
+
+            shared = event[shared_key]
+            if id(shared) in validated_objects:
+                continue
+            if by_id is not None and isinstance(shared, dict):
+                shared_id = shared.get(by_id)
+                if type(shared_id) is int and shared_id in validated_ids:
+                    continue
+
+            self.shared.validate_python(shared, strict=True)
+            # Holding on to the object keeps its id() from being reused
+            # during the batch.
+            validated_objects[id(shared)] = shared
+            if by_id is not None and isinstance(shared, dict) and type(shared.get(by_id)) is int:
+                validated_ids.add(shared[by_id])
+
+        return len(validated_objects)
@@ -0,0 +1,215 @@
+# Compiles a pydantic event model into a plain Python predicate, for
+# the high-volume events where the overhead of a full pydantic
+# validation (building model instances and all) dominates.
+#
+# The predicate is deliberately one-sided: it returns True only for
+# events that strict validation would accept (exact builtin types,
+# literal values, required keys present, no extra keys at the top),
+# and False for everything else, including plenty of valid but unusual
+# events like ones using int subclasses.  Callers then run the normal
+# checker, so the outcome (and any error) is always the model's.
+#
+# We generate source code rather than composing closures, since a
+# single flat function with inlined `type(x) is int` checks is several
+# times faster than calling a closure per field.
+from collections.abc import Callable
+from types import NoneType, UnionType
+from typing import Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+FastCheck = Callable[[Any], bool]
+
+# For float fields, strict validation accepts ints too (but not bools).
+SCALAR_CHECKS = {
+    int: "type({x}) is int",
+    str: "type({x}) is str",
+    bool: "type({x}) is bool",
+    float: "type({x}) in FLOAT_TYPES",
+    NoneType: "{x} is None",
+}
+SCALAR_NAMES = {"int", "str", "bool", "float"}
+
+
+class UnsupportedAnnotationError(Exception):
+    pass
+
+
+def is_nullable(annotation: Any) -> bool:
+    if annotation is NoneType:
+        return True
+    return get_origin(annotation) in (Union, UnionType) and NoneType in get_args(annotation)
+
+
+class FastCheckCompiler:
+    def __init__(self) -> None:
+        self.functions: dict[type[BaseModel], str] = {}
+        self.sources: list[str] = []
+        self.namespace: dict[str, Any] = {"FLOAT_TYPES": (float, int)}
+        self.variables = 0
+        self.inlining: set[type[BaseModel]] = set()
+
+    def constant(self, value: object) -> str:
+        if isinstance(value, type) and value.__name__ in SCALAR_NAMES:
+            return value.__name__
+        name = f"C{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def variable(self) -> str:
+        self.variables += 1
+        # The trailing _ keeps x1_ from being a prefix of x12_ (see bind).
+        return f"x{self.variables}_"
+
+    def expression(self, annotation: Any, x: str) -> str:
+        """A check of the value in the variable x, in which the first
+        mention of x is always evaluated first (see bind)."""
+        if annotation in SCALAR_CHECKS:
+            return SCALAR_CHECKS[annotation].format(x=x)
+
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        if origin in (Union, UnionType):
+            return "(" + " or ".join(self.expression(arg, x) for arg in args) + ")"
+        if origin is Literal:
+            by_type: dict[type, set[object]] = {}
+            for value in args:
+                by_type.setdefault(type(value), set()).add(value)
+            checks = []
+            for t, values in by_type.items():
+                if len(values) == 1 and t in (str, int, bool):
+                    [value] = values
+                    checks.append(f"type({x}) is {self.constant(t)} and {x} == {value!r}")
+                else:
+                    checks.append(
+                        f"type({x}) is {self.constant(t)} and {x} in {self.constant(frozenset(values))}"
+                    )
+            return "(" + " or ".join(f"({check})" for check in checks) + ")"
+        if origin is list and len(args) == 1:
+            if isinstance(args[0], type) and issubclass(args[0], BaseModel):
+                # map() is much faster than a generator expression.
+                item_check = self.model_function(args[0])
+            else:
+                item = self.variable()
+                item_check = f"lambda {item}: {self.expression(args[0], item)}"
+            return f"(type({x}) is list and all(map({item_check}, {x})))"
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            # Inlined, since calls are what's expensive here.
+            if annotation in self.inlining:
+                raise UnsupportedAnnotationError(f"{annotation.__name__} is recursive")
+            self.inlining.add(annotation)
+            checks = self.model_checks(annotation, x)
+            self.inlining.remove(annotation)
+            return "(" + " and ".join(checks) + ")"
+        raise UnsupportedAnnotationError(repr(annotation))
+
+    def bind(self, check: str, x: str, value: str) -> str:
+        if check.count(x) == 1:
+            return check.replace(x, value)
+        # Assign x where the check first reads it.
+        return check.replace(x, f"({x} := {value})", 1)
+
+    def field_check(self, key: str, field: FieldInfo, v: str) -> str:
+        if field.metadata:
+            raise UnsupportedAnnotationError(f"{key} has validators")
+        if not field.is_required() and field.default is not None:
+            raise UnsupportedAnnotationError(f"{key} has a default")
+        x = self.variable()
+        check = self.expression(field.annotation, x)
+        if field.is_required() and not is_nullable(field.annotation):
+            # A missing key raises KeyError, which the function turns
+            # into False (see add_function); v[key] is quite a bit
+            # faster than v.get(key).
+            return self.bind(check, x, f"{v}[{key!r}]")
+        if not field.is_required() and is_nullable(field.annotation):
+            # A missing key is fine (its default is None), and v.get()'s
+            # None passes.
+            return self.bind(check, x, f"{v}.get({key!r})")
+        if field.is_required():
+            return f"{key!r} in {v} and {self.bind(check, x, f'{v}[{key!r}]')}"
+        return f"({key!r} not in {v} or {self.bind(check, x, f'{v}[{key!r}]')})"
+
+    def model_checks(self, model: type[BaseModel], v: str) -> list[str]:
+        return [
+            f"type({v}) is dict",
+            *(self.field_check(key, field, v) for key, field in model.model_fields.items()),
+        ]
+
+    def model_function(self, model: type[BaseModel]) -> str:
+        if model not in self.functions:
+            self.functions[model] = name = f"check_{model.__name__}"
+            self.add_function(name, self.model_checks(model, "v"))
+        return self.functions[model]
+
+    def add_function(self, name: str, checks: list[str]) -> None:
+        body = "\n            and ".join(checks)
+        self.sources.append(
+            f"def {name}(v):\n"
+            f"    try:\n"
+            f"        return (\n            {body}\n        )\n"
+            f"    except KeyError:  # a missing required key\n"
+            f"        return False\n"
+        )
+
+    def compile(self, model: type[BaseModel]) -> FastCheck:
+        [type_check, *field_checks] = self.model_checks(model, "v")
+        # Nested models ignore unknown keys; events must not have any.
+        # (A bound issuperset is quite a bit faster than v.keys() <= ...)
+        keys_check = f"{self.constant(frozenset(model.model_fields).issuperset)}(v)"
+        name = f"check_{model.__name__}_event"
+        self.add_function(name, [type_check, keys_check, *field_checks])
+        return self.build(name, model.__name__)
+
+    def compile_tuple_rows(self, annotation: Any, row_types: frozenset[type]) -> FastCheck:
+        args = get_args(annotation)
+        if get_origin(annotation) is not list or get_origin(args[0]) is not tuple:
+            raise UnsupportedAnnotationError(repr(annotation))
+        item_annotations = get_args(args[0])
+        if not item_annotations or Ellipsis in item_annotations:
+            raise UnsupportedAnnotationError(repr(annotation))
+        items = [self.variable() for _ in item_annotations]
+        targets = ", ".join(items) + ("," if len(items) == 1 else "")
+        checks = " and ".join(
+            self.expression(item_annotation, x)
+            for item_annotation, x in zip(item_annotations, items, strict=True)
+        )
+        # A loop that unpacks each row is faster than anything we can
+        # do with map() here, and only allocates the iterator.
+        self.sources.append(
+            f"def check_rows(rows):\n"
+            f"    if type(rows) is not list or not set(map(type, rows)) <= {self.constant(row_types)}:\n"
+            f"        return False\n"
+            f"    try:\n"
+            f"        for {targets} in rows:\n"
+            f"            if not ({checks}):\n"
+            f"                return False\n"
+            f"    except ValueError:  # a row of the wrong length\n"
+            f"        return False\n"
+            f"    return True\n"
+        )
+        return self.build("check_rows", repr(annotation))
+
+    def build(self, name: str, label: str) -> FastCheck:
+        source = "\n".join(self.sources)
+        code = compile(source, f"<fast check for {label}>", "exec")
+        exec(code, self.namespace)  # noqa: S102 (our own generated code)
+        check: FastCheck = self.namespace[name]
+        check.source = source  # type: ignore[attr-defined]
+        return check
+
+
+def compile_fast_check(model: type[BaseModel]) -> FastCheck:
+    """Returns a predicate that is only True for events that strict
+    validation against model would accept; see the comment above."""
+    return FastCheckCompiler().compile(model)
+
+
+def compile_tuple_rows_check(
+    annotation: Any, row_types: frozenset[type] = frozenset({tuple})
+) -> FastCheck:
+    """For `list[tuple[...]]` fields like muted_topics: a predicate that
+    checks the rows as they are, where pydantic would build a new tuple
+    for each row.  With row_types={tuple, list}, it also accepts rows
+    that have been through JSON."""
+    return FastCheckCompiler().compile_tuple_rows(annotation, row_types)
@@ -0,0 +1,148 @@
+# Validation for the big lists of ids in our events (`user_ids` of
+# subscription/peer_add, `members` of a user group, ...), which can
+# hold tens of thousands of ints in big realms.
+#
+# For a plain list, pydantic-core's strict `list[int]` check is the
+# fastest type check we have: any pure-Python pass over the list
+# (`set(map(type, ids))` and friends) costs as much as pydantic's
+# check-and-copy.  So lists go through pydantic, and we only add the
+# uniqueness/order checks on top.
+#
+# Callers that hold ids in an `array("q")`, a NumPy array or any other
+# 1-D buffer of C integers can pass it directly: the buffer's format
+# already proves that every item is an int, so the type check is O(1)
+# and nothing gets copied.
+#
+# Checkers run the rest of the event through an envelope model without
+# the id lists (see IdListValidator), so that each list is only walked
+# once, by check_int_list.
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from zerver.lib.event_fanout import envelope_model
+
+# struct format characters for C integer types, see
+# https://docs.python.org/3/library/struct.html#format-characters
+INT_BUFFER_FORMATS = frozenset("bBhHiIlLqQnN")
+
+_int_list = TypeAdapter(list[int])
+
+Path = tuple[str, ...]
+
+
+def int_buffer(value: Any) -> memoryview:
+    """value as a 1-D buffer of C ints; anything else gets pydantic's
+    usual error for a list[int]."""
+    try:
+        ids = memoryview(value)
+    except TypeError:
+        ids = None
+    if ids is None or ids.ndim != 1 or ids.format.lstrip("@=<>!") not in INT_BUFFER_FORMATS:
+        _int_list.validate_python(value, strict=True)
+        raise ValueError(f"Expected a list of ints, not {type(value).__name__}")
+    return ids
+
+
+def check_ids(ids: list[int] | memoryview, *, unique: bool, ordered: bool) -> None:
+    if unique and len(set(ids)) != len(ids):
+        raise ValueError("Duplicate ids")
+    if ordered:
+        # sorted() is linear on already sorted input, and much faster than
+        # comparing neighbours in Python.
+        items = ids if isinstance(ids, list) else ids.tolist()
+        if sorted(items) != items:
+            raise ValueError("Ids are not in ascending order")
+
+
+def check_int_list(value: Any, *, unique: bool = False, ordered: bool = False) -> None:
+    """Checks that value is a list of ints (or a 1-D buffer of C ints),
+    optionally with no duplicates and/or in ascending order.
+
+    Raises pydantic's ValidationError (a ValueError) for anything else,
+    and ValueError for duplicates or ids out of order."""
+    if isinstance(value, list):
+        _int_list.validate_python(value, strict=True)
+        ids: list[int] | memoryview = value
+    else:
+        ids = int_buffer(value)
+    check_ids(ids, unique=unique, ordered=ordered)
+
+
+def check_int_lists(values: Sequence[Any], *, unique: bool = False, ordered: bool = False) -> None:
+    """check_int_list for each of values, with the plain lists
+    type-checked together in one pass over all their items, which is
+    what we want for many short lists (like the subscribers of each of
+    a user's subscriptions)."""
+    lists = [value for value in values if type(value) is list]
+    if len(lists) < len(values):
+        for value in values:
+            if type(value) is not list:
+                check_int_list(value, unique=unique, ordered=ordered)
+    if not set(map(type, chain.from_iterable(lists))) <= {int}:
+        for value in lists:
+            _int_list.validate_python(value, strict=True)
+    if unique or ordered:
+        for value in lists:
+            check_ids(value, unique=unique, ordered=ordered)
+
+
+def id_list_envelope(model: type[BaseModel], paths: Sequence[Path]) -> type[BaseModel]:
+    """A copy of model without the id lists at paths, which can go
+    through nested models (like ("group", "members"))."""
+    excluded = {path[0] for path in paths if len(path) == 1}
+    nested: dict[str, list[Path]] = {}
+    for path in paths:
+        if len(path) > 1:
+            nested.setdefault(path[0], []).append(path[1:])
+    if not nested:
+        return envelope_model(model, excluded)
+    fields: dict[str, Any] = {}
+    for key, field in model.model_fields.items():
+        if key in nested:
+            assert field.is_required()
+            fields[key] = (id_list_envelope(field.annotation, nested[key]), ...)  # type: ignore[arg-type]
+        elif key not in excluded:
+            fields[key] = (field.annotation, field)
+    return create_model(f"{model.__name__}Envelope", **fields)  # type: ignore[call-overload,no-any-return]
+
+
+class IdListValidator:
+    """Validates events of a model whose lists of ids (at paths like
+    "user_ids" or "group.members") go through check_int_list rather
+    than the model, which only runs to report errors.  Like envelope
+    models, it ignores unknown keys, so callers have to check for extra
+    keys themselves."""
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        paths: Sequence[str],
+        *,
+        unique: bool = False,
+        ordered: bool = False,
+    ) -> None:
+        self.model = model
+        self.paths = [tuple(path.split(".")) for path in paths]
+        self.envelope = id_list_envelope(model, self.paths)
+        self.unique = unique
+        self.ordered = ordered
+
+    def validate(self, event: dict[str, Any]) -> None:
+        try:
+            self.envelope.model_validate(event, strict=True)
+            for path in self.paths:
+                value: Any = event
+                for key in path:
+                    if not isinstance(value, dict) or key not in value:
+                        raise ValueError(f"Missing {'.'.join(path)}")
+                    value = value[key]
+                check_int_list(value, unique=self.unique, ordered=self.ordered)
+        except ValueError:
+            # Let the full model produce the usual error, titled with the
+            # model and with the full path in its loc (duplicates and
+            # ids out of order are ours alone).
+            self.model.model_validate(event, strict=True)
+            raise
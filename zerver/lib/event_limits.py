@@ -0,0 +1,171 @@
+# Limits on the free-form parts of events: fields like a message's
+# `reactions` and `submessages` (list[dict[str, object]]), a user's
+# `profile_data` or an embedded bot's `config_data`, which validation
+# accepts at any size and (for `object`) any depth.  Nothing else
+# bounds what a buggy or hostile sender can put there, and everything
+# downstream (serialization, the queue, clients) pays for it.
+#
+# For each model we work out once where its free-form values are (as
+# paths of keys, with ITEMS for "every item of this list or dict"),
+# and before validation walk just those values, iteratively, counting
+# against the limits.  Each check runs before we look inside the
+# container, so even a huge or very deep value is rejected after
+# O(limit) work.  The walk never raises for values of the wrong type;
+# validation reports those.  Missing and empty values (what most events
+# have) cost a few dict lookups.
+#
+# event_schema.py only checks the limits after set_payload_limits().
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cache
+from typing import Annotated, Any, get_args, get_origin
+
+from pydantic import BaseModel
+
+ITEMS = "*"
+
+Path = tuple[str, ...]
+
+
+class PayloadLimitError(ValueError):
+    pass
+
+
+def is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def inner_annotations(annotation: Any) -> list[Any]:
+    return [arg for arg in get_args(annotation) if arg is not Ellipsis]
+
+
+def contains_model(annotation: Any) -> bool:
+    return is_model(annotation) or any(map(contains_model, inner_annotations(annotation)))
+
+
+def is_free_form(annotation: Any) -> bool:
+    """Whether values of this (model-free) type can have keys or
+    nesting that no schema constrains."""
+    return (
+        annotation is object
+        or get_origin(annotation) is dict
+        or any(map(is_free_form, inner_annotations(annotation)))
+    )
+
+
+def annotation_paths(
+    annotation: Any, prefix: Path, models: frozenset[type[BaseModel]]
+) -> Iterator[Path]:
+    if not contains_model(annotation):
+        if is_free_form(annotation):
+            yield prefix
+        return
+    origin = get_origin(annotation)
+    args = inner_annotations(annotation)
+    if is_model(annotation):
+        if annotation in models:  # recursive models
+            return
+        for key, field in annotation.model_fields.items():
+            yield from annotation_paths(field.annotation, (*prefix, key), models | {annotation})
+    elif origin is Annotated:
+        yield from annotation_paths(args[0], prefix, models)
+    elif origin in (list, tuple, dict):
+        # For dicts, the values; their keys are plain strings.
+        for arg in args[1:] if origin is dict else args:
+            yield from annotation_paths(arg, (*prefix, ITEMS), models)
+    else:  # unions
+        for arg in args:
+            yield from annotation_paths(arg, prefix, models)
+
+
+@cache
+def free_form_paths(model: type[BaseModel]) -> list[Path]:
+    return sorted(set(annotation_paths(model, (), frozenset())))
+
+
+@cache
+def split_paths(model: type[BaseModel]) -> list[tuple[Path, Path, Path]]:
+    """The free-form paths, each with its leading keys (which lead to at
+    most one value) split from the rest."""
+    split = []
+    for path in free_form_paths(model):
+        keys = path[: path.index(ITEMS)] if ITEMS in path else path
+        split.append((path, keys, path[len(keys) :]))
+    return split
+
+
+def resolve(value: Any, path: Path) -> list[Any]:
+    """The values at path in value, skipping anything of the wrong type."""
+    values = [value]
+    for step in path:
+        if step == ITEMS:
+            values = [
+                item
+                for container in values
+                if isinstance(container, list | tuple | dict)
+                for item in (container.values() if isinstance(container, dict) else container)
+            ]
+        else:
+            values = [
+                container[step]
+                for container in values
+                if isinstance(container, dict) and step in container
+            ]
+    return values
+
+
+@dataclass(frozen=True)
+class PayloadLimits:
+    # How deeply containers can nest within a free-form value.
+    max_depth: int = 32
+    # How many items (list items plus dict entries) all of an event's
+    # free-form values can hold together.
+    max_items: int = 100_000
+    # The longest string (or dict key) in a free-form value.
+    max_string_length: int = 1_000_000
+
+    def check(self, event: Any, model: type[BaseModel]) -> None:
+        """Raises PayloadLimitError if the event's free-form values go
+        over the limits."""
+        if type(event) is not dict:
+            return
+        items = 0
+        for path, keys, rest in split_paths(model):
+            value = event
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            # Missing and empty values can't go over a limit, and most
+            # events only have those, so they skip the walk.
+            if not value:
+                continue
+            for item in resolve(value, rest) if rest else [value]:
+                if item and isinstance(item, str | dict | list | tuple):
+                    items = self.check_value(item, path, items)
+
+    def check_value(self, value: Any, path: Path, items: int) -> int:
+        """Walks value, returning the running count of items."""
+        stack = [(value, 1)]
+        while stack:
+            value, depth = stack.pop()
+            if isinstance(value, str):
+                if len(value) > self.max_string_length:
+                    raise PayloadLimitError(
+                        f"{'.'.join(path)}: string longer than {self.max_string_length}"
+                    )
+            elif isinstance(value, dict | list | tuple):
+                if depth > self.max_depth:
+                    raise PayloadLimitError(
+                        f"{'.'.join(path)}: nested more than {self.max_depth} deep"
+                    )
+                items += len(value)
+                if items > self.max_items:
+                    raise PayloadLimitError(f"{'.'.join(path)}: more than {self.max_items} items")
+                if isinstance(value, dict):
+                    stack.extend((key, depth) for key in value)
+                    stack.extend((item, depth + 1) for item in value.values())
+                else:
+                    stack.extend((item, depth + 1) for item in value)
+        return items
+
+
+DEFAULT_PAYLOAD_LIMITS = PayloadLimits()
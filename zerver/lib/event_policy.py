@@ -0,0 +1,250 @@
+# Per-realm validation policies.  A few big realms send most of our
+# events, so rather than validating everything everywhere, we pick how
+# much to check per realm and event type:
+#
+#   full        run the checker
+#   sampled     run the checker on a random sample_rate of the events
+#   shape_only  just check the event's keys against the models for its
+#               type and op, not the values (see check_shape)
+#   off         nothing
+#
+# The config is JSON, like:
+#
+#   {
+#       "default": "full",
+#       "sample_rate": 0.01,
+#       "event_types": {"heartbeat": "off"},
+#       "realms": {
+#           "2": {"default": "sampled", "event_types": {"presence": "shape_only"}}
+#       }
+#   }
+#
+# with realms keyed by id.  A realm's settings fall back to the
+# top-level ones, and event types to the default.  PolicyTable resolves
+# all of that up front into a dict per realm (plus one for the realms
+# not in the config) from event type to Policy, so a lookup is a couple
+# of dict gets.  PolicyFile reloads the table when the file changes,
+# checking at most every few seconds, so workers pick up changes
+# without restarting; a config that doesn't load leaves the previous
+# table in place.
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Literal, get_args, get_origin
+
+from pydantic import BaseModel
+
+from zerver.lib import event_types
+
+FULL = "full"
+SAMPLED = "sampled"
+SHAPE_ONLY = "shape_only"
+OFF = "off"
+MODES = (FULL, SAMPLED, SHAPE_ONLY, OFF)
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_CHECK_INTERVAL = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyConfigError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Policy:
+    mode: str = FULL
+    sample_rate: float = DEFAULT_SAMPLE_RATE
+
+
+@dataclass(frozen=True)
+class RealmPolicies:
+    default: Policy
+    by_event_type: dict[str, Policy]
+
+
+def parse_settings(settings: object, where: str, parent: RealmPolicies | None) -> RealmPolicies:
+    if not isinstance(settings, dict):
+        raise PolicyConfigError(f"{where}: expected an object")
+    allowed = {"default", "sample_rate", "event_types"} | ({"realms"} if parent is None else set())
+    if not settings.keys() <= allowed:
+        raise PolicyConfigError(f"{where}: unknown keys {sorted(settings.keys() - allowed)}")
+
+    sample_rate = settings.get(
+        "sample_rate", DEFAULT_SAMPLE_RATE if parent is None else parent.default.sample_rate
+    )
+    if type(sample_rate) not in (int, float) or not 0 <= sample_rate <= 1:
+        raise PolicyConfigError(f"{where}: sample_rate must be a number from 0 to 1")
+
+    def policy(mode: object, where: str) -> Policy:
+        if mode not in MODES:
+            raise PolicyConfigError(f"{where}: mode must be one of {', '.join(MODES)}")
+        return Policy(str(mode), sample_rate)
+
+    default = policy(
+        settings.get("default", FULL if parent is None else parent.default.mode), f"{where}.default"
+    )
+    event_type_modes = settings.get("event_types", {})
+    if not isinstance(event_type_modes, dict):
+        raise PolicyConfigError(f"{where}.event_types: expected an object")
+    by_event_type = {}
+    if parent is not None:
+        # Inherited per-type modes, with this realm's sample rate.
+        for event_type, inherited in parent.by_event_type.items():
+            by_event_type[event_type] = Policy(inherited.mode, sample_rate)
+    for event_type, mode in event_type_modes.items():
+        by_event_type[event_type] = policy(mode, f"{where}.event_types.{event_type}")
+    return RealmPolicies(default, by_event_type)
+
+
+class PolicyTable:
+    def __init__(self, config: object = None, sample: Callable[[], float] = random.random):
+        """Raises PolicyConfigError for a bad config; None means check
+        everything in full."""
+        self.sample = sample
+        if config is None:
+            config = {}
+        self.other_realms = parse_settings(config, "config", None)
+        assert isinstance(config, dict)
+        self.realms: dict[int, RealmPolicies] = {}
+        realms = config.get("realms", {})
+        if not isinstance(realms, dict):
+            raise PolicyConfigError("config.realms: expected an object")
+        for realm_id, settings in realms.items():
+            try:
+                key = int(realm_id)
+            except ValueError:
+                raise PolicyConfigError(f"config.realms: {realm_id!r} isn't a realm id") from None
+            self.realms[key] = parse_settings(
+                settings, f"config.realms.{realm_id}", self.other_realms
+            )
+
+    def lookup(self, realm_id: int, event_type: str) -> Policy:
+        policies = self.realms.get(realm_id, self.other_realms)
+        return policies.by_event_type.get(event_type, policies.default)
+
+    def check(
+        self,
+        realm_id: int,
+        checker: Callable[..., None],
+        var_name: str,
+        event: dict[str, object],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        event_type = event.get("type") if type(event) is dict else None
+        policy = self.lookup(realm_id, event_type if type(event_type) is str else "")
+        if policy.mode == FULL or (policy.mode == SAMPLED and self.sample() < policy.sample_rate):
+            checker(var_name, event, *args, **kwargs)
+        elif policy.mode == SHAPE_ONLY:
+            check_shape(event)
+
+
+@dataclass(frozen=True)
+class EventShape:
+    allowed: frozenset[str]
+    required: frozenset[str]
+
+
+def literal_values(model: type[BaseModel], key: str) -> tuple[object, ...]:
+    field = model.model_fields.get(key)
+    if field is None or get_origin(field.annotation) is not Literal:
+        return ()
+    return get_args(field.annotation)
+
+
+@cache
+def event_shapes() -> dict[tuple[str, str | None], EventShape]:
+    """(type, op) -> the keys that the models for events of that type
+    and op (None for types without ops) allow, and those they all
+    require."""
+    models: dict[tuple[str, str | None], list[type[BaseModel]]] = {}
+    for name, model in vars(event_types).items():
+        if not (name.startswith("Event") and isinstance(model, type)):
+            continue
+        if not issubclass(model, BaseModel):
+            continue
+        for event_type in literal_values(model, "type"):
+            for op in literal_values(model, "op") or (None,):
+                key = (str(event_type), None if op is None else str(op))
+                models.setdefault(key, []).append(model)
+    return {
+        key: EventShape(
+            frozenset().union(*(model.model_fields for model in group)),
+            frozenset.intersection(*map(required_fields, group)),
+        )
+        for key, group in models.items()
+    }
+
+
+def required_fields(model: type[BaseModel]) -> frozenset[str]:
+    return frozenset(key for key, field in model.model_fields.items() if field.is_required())
+
+
+def check_shape(event: object) -> None:
+    """Checks that the event is a dict whose keys the models for its
+    type and op allow (with the keys they all require), without looking
+    at the values."""
+    if type(event) is not dict:
+        raise ValueError("Event is not a dict")
+    event_type, op = event.get("type"), event.get("op")
+    shapes = event_shapes()
+    shape = None
+    if type(event_type) is str:
+        if type(op) is str:
+            shape = shapes.get((event_type, op))
+        shape = shape or shapes.get((event_type, None))
+    if shape is None:
+        raise ValueError(f"Unknown event type: {event_type!r} (op {op!r})")
+    if not event.keys() <= shape.allowed:
+        raise ValueError(f"Extra fields not allowed: {set(event.keys()) - shape.allowed}")
+    if not shape.required <= event.keys():
+        raise ValueError(f"Missing fields: {set(shape.required - event.keys())}")
+
+
+class PolicyFile:
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Loads the policy table from a JSON file (raising if it can't),
+        and reloads it when the file changes."""
+        self.path = path
+        self.check_interval = check_interval
+        self.clock = clock
+        self.next_check = clock() + check_interval
+        self.stamp = self.file_stamp()
+        self.table = self.load()
+
+    def file_stamp(self) -> tuple[int, int]:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> PolicyTable:
+        with open(self.path, "rb") as f:
+            return PolicyTable(json.load(f))
+
+    def current(self) -> PolicyTable:
+        now = self.clock()
+        if now >= self.next_check:
+            self.next_check = now + self.check_interval
+            self.reload_if_changed()
+        return self.table
+
+    def reload_if_changed(self) -> None:
+        try:
+            stamp = self.file_stamp()
+            if stamp == self.stamp:
+                return
+            self.stamp = stamp
+            self.table = self.load()
+        except (OSError, ValueError) as e:
+            logger.warning("Keeping the previous validation policy: %s: %s", self.path, e)
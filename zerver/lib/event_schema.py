@@ -6,8 +6,21 @@
 #
 # See https://zulip.readthedocs.io/en/latest/subsystems/events-system.html
 from collections.abc import Callable
-from typing import Any, cast
-
+from itertools import chain
+from operator import eq, itemgetter
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+
+from zerver.lib.event_cache import DEFAULT_MAX_BYTES, ValidationCache, fingerprint
+from zerver.lib.event_columnar import COLUMNAR_MIN_ROWS, ColumnarValidator
+from zerver.lib.event_coverage import ShapeCoverage
+from zerver.lib.event_fanout import FanoutValidator, envelope_model
+from zerver.lib.event_fast_check import compile_fast_check, compile_tuple_rows_check
+from zerver.lib.event_int_lists import IdListValidator, check_int_lists, id_list_envelope
+from zerver.lib.event_limits import DEFAULT_PAYLOAD_LIMITS, PayloadLimits
+from zerver.lib.event_policy import DEFAULT_CHECK_INTERVAL, PolicyFile
+from zerver.lib.event_streaming import StreamingValidator
 from zerver.lib.event_types import (
     AllowMessageEditingData,
     AuthenticationData,
@@ -102,20 +115,173 @@ from zerver.lib.event_types import (
     PersonRole,
     PersonTimezone,
     PlanTypeData,
+    Presence,
+    SingleSubscription,
+    UserGroupData,
 )
 from zerver.lib.topic import ORIG_TOPIC, TOPIC_NAME
 from zerver.lib.types import AnonymousSettingGroupDict
 from zerver.models import Realm, RealmUserDefault, Stream, UserProfile
 
 EventModel = Any
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Optional cache of sub-objects we have already validated (like the
+# entries of the realm_emoji map that gets resent on every change);
+# see event_cache.py.
+validation_cache: ValidationCache | None = None
+
+
+def enable_validation_cache(max_bytes: int = DEFAULT_MAX_BYTES) -> ValidationCache:
+    global validation_cache
+    validation_cache = ValidationCache(max_bytes)
+    return validation_cache
+
+
+def disable_validation_cache() -> None:
+    global validation_cache
+    validation_cache = None
+
+
+# Optional record of the models, union branches and optional fields
+# that the events we accept exercise; see event_coverage.py.
+shape_coverage: ShapeCoverage | None = None
+
+
+def enable_shape_coverage() -> ShapeCoverage:
+    global shape_coverage
+    shape_coverage = ShapeCoverage()
+    return shape_coverage
+
+
+def disable_shape_coverage() -> None:
+    global shape_coverage
+    shape_coverage = None
+
+
+# Optional limits on the size and depth of free-form values like a
+# message's reactions, checked before validation; see event_limits.py.
+# They're off by default, since walking those values adds to every
+# check_message.
+payload_limits: PayloadLimits | None = None
+
+
+def set_payload_limits(limits: PayloadLimits | None = DEFAULT_PAYLOAD_LIMITS) -> None:
+    global payload_limits
+    payload_limits = limits
+
+
+# Optional per-realm policy for how much of each event type to
+# validate (in full, sampled, just its keys, or not at all), read from
+# a JSON file that gets reloaded when it changes; see event_policy.py.
+validation_policy: PolicyFile | None = None
+
+
+def enable_validation_policy(
+    path: str, check_interval: float = DEFAULT_CHECK_INTERVAL
+) -> PolicyFile:
+    global validation_policy
+    validation_policy = PolicyFile(path, check_interval)
+    return validation_policy
+
+
+def disable_validation_policy() -> None:
+    global validation_policy
+    validation_policy = None
+
+
+def check_realm_event(
+    realm_id: int,
+    checker: Callable[..., None],
+    var_name: str,
+    event: dict[str, object],
+    *args: Any,
+    **kwargs: Any,
+) -> None:
+    """
+    Runs checker (one of the check_* functions here) on an event sent
+    in the realm, as far as the validation policy says; in full, if
+    there isn't one.
+    """
+    if validation_policy is None:
+        checker(var_name, event, *args, **kwargs)
+    else:
+        validation_policy.current().check(realm_id, checker, var_name, event, *args, **kwargs)
 
 
 def validate_event_with_model_type(event: dict[str, object], model: EventModel) -> None:
     allowed_fields = set(model.model_fields.keys())
     if not set(event.keys()).issubset(allowed_fields):
         raise ValueError(f"Extra fields not allowed: {set(event.keys()) - allowed_fields}")
+    if payload_limits is not None:
+        payload_limits.check(event, model)
+
+    if validation_cache is not None:
+        validation_cache.validate_event(event, model)
+    else:
+        model.model_validate(event, strict=True)
+    if shape_coverage is not None:
+        shape_coverage.record(event, model)
+
+
+def validate_event_with_stand_in(
+    event: dict[str, object], stand_in: EventModel, model: EventModel
+) -> None:
+    """
+    Like validate_event_with_model_type(event, model), for events that
+    a cheaper stand-in model (see single_field_models) accepts exactly
+    when model does.  Errors and shape coverage are model's.
+    """
+    if not set(event.keys()).issubset(stand_in.model_fields.keys()):
+        validate_event_with_model_type(event, model)
+        return
+    if payload_limits is not None:
+        payload_limits.check(event, model)
+
+    try:
+        if validation_cache is not None:
+            validation_cache.validate_event(event, stand_in)
+        else:
+            stand_in.model_validate(event, strict=True)
+    except ValidationError:
+        # Let the full model produce the usual error.
+        model.model_validate(event, strict=True)
+        raise
+    if shape_coverage is not None:
+        shape_coverage.record(event, model)
+
+
+def validate_event_model(event: dict[str, object], model: type[ModelT]) -> ModelT:
+    """
+    Like validate_event_with_model_type, but returns the validated
+    model instance (so it never uses the validation cache, which
+    doesn't build instances).
+
+    Our models turn optional keys into `X | None = None`, but the
+    instance still knows which keys the event had: model_fields_set
+    has every key that was present, including ones set to None, and
+    none of the missing ones.  So checkers can check the shape of the
+    event from the instance alone, and event_model_to_json() writes
+    back just the keys the event had.
+    """
+    allowed_fields = model.model_fields.keys()
+    if not event.keys() <= allowed_fields:
+        raise ValueError(f"Extra fields not allowed: {set(event.keys()) - allowed_fields}")
+    if payload_limits is not None:
+        payload_limits.check(event, model)
+    instance = model.model_validate(event, strict=True)
+    if shape_coverage is not None:
+        shape_coverage.record(event, model)
+    return instance
 
-    model.model_validate(event, strict=True)
+
+def event_model_to_json(instance: BaseModel) -> bytes:
+    """
+    The JSON for an instance from validate_event_model(), without the
+    keys that the event didn't have (at any depth).  The keys come out
+    in field order, not in the event's order.
+    """
+    return instance.__pydantic_serializer__.to_json(instance, exclude_unset=True)
 
 
 def make_checker(base_model: EventModel) -> Callable[[str, dict[str, object]], None]:
@@ -126,12 +292,75 @@ def make_checker(base_model: EventModel) -> Callable[[str, dict[str, object]], N
     return f
 
 
+def make_fast_checker(base_model: EventModel) -> Callable[[str, dict[str, object]], None]:
+    """
+    Like make_checker, for our highest-volume events: a compiled
+    plain-Python check (see event_fast_check.py) accepts the ordinary
+    events, and only the rest go through pydantic.
+    """
+    is_valid = compile_fast_check(base_model)
+    check = make_checker(base_model)
+
+    def f(name: str, event: dict[str, object]) -> None:
+        if not is_valid(event):
+            check(name, event)
+        elif shape_coverage is not None:
+            shape_coverage.record(event, base_model)
+
+    return f
+
+
+def make_streaming_checker(
+    base_model: EventModel, list_key: str
+) -> Callable[[str, dict[str, object]], None]:
+    """
+    For events that resend a whole (possibly huge) list: validates the
+    list one item at a time and stops at the first bad one, without
+    ever holding all the model instances (see event_streaming.py).
+    """
+    validator = StreamingValidator(base_model, list_key)
+
+    def f(name: str, event: dict[str, object]) -> None:
+        validator.validate(event)
+        if shape_coverage is not None:
+            shape_coverage.record(event, base_model)
+
+    return f
+
+
+def make_id_list_checker(
+    base_model: EventModel, *paths: str, unique: bool = False, ordered: bool = False
+) -> Callable[[str, dict[str, object]], None]:
+    """
+    For events with big lists of ids (at paths like "user_ids" or
+    "group.members"): the rest of the event goes through the model, and
+    each id list just once through check_int_list, which also takes
+    arrays of ids and can insist on no duplicates or ascending order;
+    see event_int_lists.py.
+    """
+    validator = IdListValidator(base_model, paths, unique=unique, ordered=ordered)
+    allowed_fields = base_model.model_fields.keys()
+
+    def f(name: str, event: dict[str, object]) -> None:
+        if not event.keys() <= allowed_fields:
+            raise ValueError(f"Extra fields not allowed: {set(event.keys()) - allowed_fields}")
+        if payload_limits is not None:
+            payload_limits.check(event, base_model)
+        validator.validate(event)
+        if shape_coverage is not None:
+            shape_coverage.record(event, base_model)
+
+    return f
+
+
 check_alert_words = make_checker(EventAlertWords)
 check_attachment_add = make_checker(EventAttachmentAdd)
 check_attachment_remove = make_checker(EventAttachmentRemove)
 check_attachment_update = make_checker(EventAttachmentUpdate)
-check_custom_profile_fields = make_checker(EventCustomProfileFields)
-check_default_stream_groups = make_checker(EventDefaultStreamGroups)
+check_custom_profile_fields = make_streaming_checker(EventCustomProfileFields, "fields")
+check_default_stream_groups = make_streaming_checker(
+    EventDefaultStreamGroups, "default_stream_groups"
+)
 check_default_streams = make_checker(EventDefaultStreams)
 check_direct_message = make_checker(EventDirectMessage)
 check_draft_add = make_checker(EventDraftsAdd)
@@ -140,7 +369,6 @@ check_draft_update = make_checker(EventDraftsUpdate)
 check_heartbeat = make_checker(EventHeartbeat)
 check_invites_changed = make_checker(EventInvitesChanged)
 check_message = make_checker(EventMessage)
-check_muted_topics = make_checker(EventMutedTopics)
 check_muted_users = make_checker(EventMutedUsers)
 check_onboarding_steps = make_checker(EventOnboardingSteps)
 check_reaction_add = make_checker(EventReactionAdd)
@@ -151,8 +379,8 @@ check_realm_domains_add = make_checker(EventRealmDomainsAdd)
 check_realm_domains_change = make_checker(EventRealmDomainsChange)
 check_realm_domains_remove = make_checker(EventRealmDomainsRemove)
 check_realm_export_consent = make_checker(EventRealmExportConsent)
-check_realm_linkifiers = make_checker(EventRealmLinkifiers)
-check_realm_playgrounds = make_checker(EventRealmPlaygrounds)
+check_realm_linkifiers = make_streaming_checker(EventRealmLinkifiers, "realm_linkifiers")
+check_realm_playgrounds = make_streaming_checker(EventRealmPlaygrounds, "realm_playgrounds")
 check_realm_user_add = make_checker(EventRealmUserAdd)
 check_realm_user_remove = make_checker(EventRealmUserRemove)
 check_restart = make_checker(EventRestart)
@@ -164,20 +392,29 @@ check_scheduled_message_update = make_checker(EventScheduledMessagesUpdate)
 check_stream_create = make_checker(EventStreamCreate)
 check_stream_delete = make_checker(EventStreamDelete)
 check_submessage = make_checker(EventSubmessage)
-check_subscription_add = make_checker(EventSubscriptionAdd)
-check_subscription_peer_add = make_checker(EventSubscriptionPeerAdd)
-check_subscription_peer_remove = make_checker(EventSubscriptionPeerRemove)
+check_subscription_peer_add = make_id_list_checker(
+    EventSubscriptionPeerAdd, "user_ids", "stream_ids"
+)
+check_subscription_peer_remove = make_id_list_checker(
+    EventSubscriptionPeerRemove, "user_ids", "stream_ids"
+)
 check_subscription_remove = make_checker(EventSubscriptionRemove)
-check_typing_start = make_checker(EventTypingStart)
-check_typing_stop = make_checker(EventTypingStop)
+check_typing_start = make_fast_checker(EventTypingStart)
+check_typing_stop = make_fast_checker(EventTypingStop)
 check_update_message_flags_add = make_checker(EventUpdateMessageFlagsAdd)
 check_update_message_flags_remove = make_checker(EventUpdateMessageFlagsRemove)
-check_user_group_add = make_checker(EventUserGroupAdd)
-check_user_group_add_members = make_checker(EventUserGroupAddMembers)
-check_user_group_add_subgroups = make_checker(EventUserGroupAddSubgroups)
+check_user_group_add = make_id_list_checker(
+    EventUserGroupAdd, "group.members", "group.direct_subgroup_ids"
+)
+check_user_group_add_members = make_id_list_checker(EventUserGroupAddMembers, "user_ids")
+check_user_group_add_subgroups = make_id_list_checker(
+    EventUserGroupAddSubgroups, "direct_subgroup_ids"
+)
 check_user_group_remove = make_checker(EventUserGroupRemove)
-check_user_group_remove_members = make_checker(EventUserGroupRemoveMembers)
-check_user_group_remove_subgroups = make_checker(EventUserGroupRemoveSubgroups)
+check_user_group_remove_members = make_id_list_checker(EventUserGroupRemoveMembers, "user_ids")
+check_user_group_remove_subgroups = make_id_list_checker(
+    EventUserGroupRemoveSubgroups, "direct_subgroup_ids"
+)
 check_user_topic = make_checker(EventUserTopic)
 check_web_reload_client_event = make_checker(EventWebReloadClient)
 
@@ -194,22 +431,21 @@ check_web_reload_client_event = make_checker(EventWebReloadClient)
 # TODO: work through the bottom of this file to try to find ways to
 #       simplify our types or make them more robust
 
-_check_delete_message = make_checker(EventDeleteMessage)
 _check_has_zoom_token = make_checker(EventHasZoomToken)
+_check_muted_topics = make_checker(EventMutedTopics)
 _check_presence = make_checker(EventPresence)
 _check_realm_bot_add = make_checker(EventRealmBotAdd)
 _check_realm_bot_update = make_checker(EventRealmBotUpdate)
 _check_realm_default_update = make_checker(EventRealmUserSettingsDefaultsUpdate)
-_check_realm_emoji_update = make_checker(EventRealmEmojiUpdate)
 _check_realm_export = make_checker(EventRealmExport)
 _check_realm_update = make_checker(EventRealmUpdate)
 _check_realm_update_dict = make_checker(EventRealmUpdateDict)
 _check_realm_user_update = make_checker(EventRealmUserUpdate)
 _check_stream_update = make_checker(EventStreamUpdate)
+_check_subscription_add = make_checker(EventSubscriptionAdd)
 _check_subscription_update = make_checker(EventSubscriptionUpdate)
 _check_update_display_settings = make_checker(EventUpdateDisplaySettings)
 _check_update_global_notifications = make_checker(EventUpdateGlobalNotifications)
-_check_update_message = make_checker(EventUpdateMessage)
 _check_user_group_update = make_checker(EventUserGroupUpdate)
 _check_user_settings_update = make_checker(EventUserSettingsUpdate)
 _check_user_status = make_checker(EventUserStatus)
@@ -236,11 +472,11 @@ def check_delete_message(
     num_message_ids: int,
     is_legacy: bool,
 ) -> None:
-    _check_delete_message(var_name, event)
+    message = validate_event_model(event, EventDeleteMessage)
 
     keys = {"id", "type", "message_type"}
 
-    assert event["message_type"] == message_type
+    assert message.message_type == message_type
 
     if message_type == "stream":
         keys |= {"stream_id", "topic"}
@@ -253,11 +489,11 @@ def check_delete_message(
         assert num_message_ids == 1
         keys.add("message_id")
     else:
-        assert isinstance(event["message_ids"], list)
-        assert num_message_ids == len(event["message_ids"])
+        assert message.message_ids is not None
+        assert num_message_ids == len(message.message_ids)
         keys.add("message_ids")
 
-    assert set(event.keys()) == keys
+    assert message.model_fields_set == keys
 
 
 def check_has_zoom_token(
@@ -288,6 +524,139 @@ def check_presence(
     assert event_presence_value["status"] == status
 
 
+_message_fanout = FanoutValidator(EventMessage, "message")
+
+
+def check_message_fanout(
+    var_name: str,
+    events: list[dict[str, object]],
+    by_message_id: bool = False,
+) -> None:
+    """
+    Checks the copies of a message event that get queued for each
+    recipient, validating the shared `message` only once per object
+    (or, with by_message_id, once per message id); see event_fanout.py.
+    """
+    if payload_limits is not None:
+        # The copies usually share one message dict, so check each one once.
+        messages = {id(event.get("message")): event for event in events if type(event) is dict}
+        for event in messages.values():
+            payload_limits.check(event, EventMessage)
+    _message_fanout.validate(events, by_id="id" if by_message_id else None)
+    if shape_coverage is not None:
+        for event in events:
+            shape_coverage.record(event, EventMessage)
+
+
+_presence_envelopes = ColumnarValidator(envelope_model(EventPresence, {"presence"}))
+_presence_entries = ColumnarValidator(Presence)
+
+
+def presence_batch_is_valid(events: list[dict[str, object]]) -> bool:
+    # Everything here runs in C (map, chain, itemgetter), rather than
+    # in a Python loop over the events.
+    if not set(map(type, events)) <= {dict}:
+        return False
+    if not set(chain.from_iterable(events)) <= EventPresence.model_fields.keys():
+        return False
+    try:
+        presences = list(map(itemgetter("presence"), events))
+    except KeyError:
+        return False
+    if not set(map(type, presences)) <= {dict}:
+        return False
+    if not set(map(type, chain.from_iterable(presences))) <= {str}:
+        return False
+    entries = list(chain.from_iterable(map(dict.values, presences)))
+    try:
+        _presence_envelopes.validate(events)
+        _presence_entries.validate(entries)
+    except ValidationError:
+        return False
+    return True
+
+
+def check_presence_batch(var_name: str, events: list[dict[str, object]]) -> None:
+    """
+    Presence is our biggest event volume, so this validates a batch of
+    presence events (or a few with big `presence` maps) in one go: the
+    events, and then all of their presence entries, column by column.
+    If anything is off, we check the events one by one to get the
+    usual error.
+    """
+    if not presence_batch_is_valid(events):
+        for event in events:
+            _check_presence(var_name, event)
+    elif shape_coverage is not None:
+        for event in events:
+            shape_coverage.record(event, EventPresence)
+
+
+_user_topics = ColumnarValidator(EventUserTopic)
+
+
+def check_user_topic_batch(var_name: str, events: list[dict[str, object]]) -> None:
+    """
+    Replaying a user's topic settings sends a user_topic event per
+    topic, so like check_presence_batch, this checks such a burst
+    column by column, falling back to one event at a time for the
+    usual error.
+    """
+    if set(map(type, events)) <= {dict} and (
+        set(chain.from_iterable(events)) <= EventUserTopic.model_fields.keys()
+    ):
+        try:
+            _user_topics.validate(events)
+        except ValidationError:
+            pass
+        else:
+            if shape_coverage is not None:
+                for event in events:
+                    shape_coverage.record(event, EventUserTopic)
+            return
+    for event in events:
+        check_user_topic(var_name, event)
+
+
+_muted_topics_envelope = envelope_model(EventMutedTopics, {"muted_topics"})
+_muted_topics_annotation = EventMutedTopics.model_fields["muted_topics"].annotation
+_muted_topic_rows = compile_tuple_rows_check(_muted_topics_annotation)
+_muted_topic_list_rows = compile_tuple_rows_check(
+    _muted_topics_annotation, frozenset({tuple, list})
+)
+
+
+def check_muted_topics(var_name: str, event: dict[str, object], list_rows: bool = False) -> None:
+    """
+    Users with years of history have thousands of muted topics, so we
+    check the [stream_name, topic_name, date_muted] rows where they
+    are (see compile_tuple_rows_check), rather than have pydantic
+    build a new tuple for each of them.
+
+    The model wants tuples; list_rows=True also accepts list rows, as
+    in legacy payloads that have been through JSON.
+    """
+    check_rows = _muted_topic_list_rows if list_rows else _muted_topic_rows
+    if event.keys() <= EventMutedTopics.model_fields.keys() and check_rows(
+        event.get("muted_topics")
+    ):
+        try:
+            _muted_topics_envelope.model_validate(event, strict=True)
+        except ValidationError:
+            pass
+        else:
+            if shape_coverage is not None:
+                shape_coverage.record(event, EventMutedTopics)
+            return
+
+    rows = event.get("muted_topics")
+    if list_rows and type(rows) is list:
+        # Only here, to get the model's error, do we copy the rows.
+        rows = [tuple(row) if type(row) is list else row for row in rows]
+        event = dict(event, muted_topics=rows)
+    _check_muted_topics(var_name, event)
+
+
 def check_realm_bot_add(
     var_name: str,
     event: dict[str, object],
@@ -324,6 +693,15 @@ def check_realm_bot_update(
     assert {"user_id", field} == set(event["bot"].keys())
 
 
+def check_realm_emoji_ids(realm_emoji: dict[str, dict[str, object]]) -> None:
+    # map() keeps this loop in C, even for realms with thousands of emoji.
+    if not all(map(eq, realm_emoji, map(itemgetter("id"), realm_emoji.values()))):
+        raise ValueError("realm_emoji keys must match the emoji ids")
+
+
+_check_realm_emoji_update = make_checker(EventRealmEmojiUpdate)
+
+
 def check_realm_emoji_update(var_name: str, event: dict[str, object]) -> None:
     """
     The way we send realm emojis is kinda clumsy--we
@@ -331,12 +709,39 @@ def check_realm_emoji_update(var_name: str, event: dict[str, object]) -> None:
     the fields (including the id).  Ideally we can streamline
     this and just send a list of dicts.  The clients can make
     a Map as needed.
+
+    The key/id check runs on the validated map, after the model, so
+    that the map's entries still go through the validation cache.
     """
     _check_realm_emoji_update(var_name, event)
-
     assert isinstance(event["realm_emoji"], dict)
-    for k, v in event["realm_emoji"].items():
-        assert v["id"] == k
+    check_realm_emoji_ids(event["realm_emoji"])
+
+
+class RealmEmojiUpdateChecker:
+    """
+    Since we resend the whole map whenever one emoji changes, this
+    checks a realm's successive realm_emoji events by validating only
+    the entries that changed since the last map it accepted.
+    """
+
+    def __init__(self) -> None:
+        self.previous: dict[str, bytes] = {}
+
+    def __call__(self, var_name: str, event: dict[str, object]) -> None:
+        realm_emoji = event.get("realm_emoji")
+        if type(realm_emoji) is not dict:
+            check_realm_emoji_update(var_name, event)
+            return
+
+        fingerprints = {key: fingerprint(emoji) for key, emoji in realm_emoji.items()}
+        changed = {
+            key: emoji
+            for key, emoji in realm_emoji.items()
+            if fingerprints[key] is None or fingerprints[key] != self.previous.get(key)
+        }
+        check_realm_emoji_update(var_name, {**event, "realm_emoji": changed})
+        self.previous = {key: value for key, value in fingerprints.items() if value is not None}
 
 
 def check_realm_export(
@@ -439,6 +844,15 @@ def check_realm_update_dict(
         elif any(
             setting_name in event["data"] for setting_name in Realm.REALM_PERMISSION_GROUP_SETTINGS
         ):
+            # These come one setting at a time.
+            [*keys] = event["data"]
+            if len(keys) == 1 and keys[0] in GROUP_SETTING_DATA_TYPES:
+                validate_event_with_stand_in(
+                    cast(dict[str, object], event["data"]),
+                    GROUP_SETTING_DATA_TYPES[keys[0]],
+                    GroupSettingUpdateData,
+                )
+                return
             sub_type = GroupSettingUpdateData
         elif "plan_type" in event["data"]:
             sub_type = PlanTypeData
@@ -517,6 +931,49 @@ def check_stream_update(
         raise AssertionError(f"Unknown property: {prop}")
 
 
+_subscription_envelope = id_list_envelope(SingleSubscription, [("subscribers",)])
+_subscription_rows = TypeAdapter(list[_subscription_envelope])  # type: ignore[valid-type]
+_subscriptions_columnar = ColumnarValidator(_subscription_envelope)
+
+
+def check_subscription_add(
+    var_name: str,
+    event: dict[str, object],
+) -> None:
+    """
+    When a new user joins a big realm, this event can carry hundreds of
+    subscriptions, so we validate those column by column (see
+    event_columnar.py) rather than as one model per subscription, and
+    all their subscribers in one pass (see event_int_lists.py).
+    """
+    subscriptions = event.get("subscriptions")
+    if not isinstance(subscriptions, list):
+        _check_subscription_add(var_name, event)
+        return
+
+    _check_subscription_add(var_name, {**event, "subscriptions": []})
+    try:
+        if len(subscriptions) < COLUMNAR_MIN_ROWS:
+            _subscription_rows.validate_python(subscriptions, strict=True)
+        else:
+            _subscriptions_columnar.validate(subscriptions)
+    except ValidationError:
+        # Let the full model produce the usual error, with the
+        # subscription and field in its loc.
+        _check_subscription_add(var_name, event)
+        raise
+    try:
+        check_int_lists([subscription["subscribers"] for subscription in subscriptions])
+    except (KeyError, ValidationError):
+        # Let the full model produce the usual error ("missing", or with
+        # the subscription in its loc).
+        _check_subscription_add(var_name, event)
+        raise
+    if shape_coverage is not None:
+        for subscription in subscriptions:
+            shape_coverage.record(subscription, SingleSubscription)
+
+
 def check_subscription_update(
     var_name: str, event: dict[str, object], property: str, value: bool
 ) -> None:
@@ -601,9 +1058,8 @@ def check_update_message(
     is_embedded_update_only: bool,
 ) -> None:
     # Always check the basic schema first.
-    _check_update_message(var_name, event)
+    message = validate_event_model(event, EventUpdateMessage)
 
-    actual_keys = set(event.keys())
     expected_keys = {
         "id",
         "type",
@@ -650,15 +1106,44 @@ def check_update_message(
             "content",
             "rendered_content",
         }
-        assert event["user_id"] is None
+        assert message.user_id is None
     else:
-        assert isinstance(event["user_id"], int)
+        assert isinstance(message.user_id, int)
 
-    assert event["rendering_only"] == is_embedded_update_only
-    assert expected_keys == actual_keys
+    assert message.rendering_only == is_embedded_update_only
+    assert expected_keys == message.model_fields_set
+
+
+def single_field_models(model: EventModel) -> dict[str, EventModel]:
+    """
+    For all-optional models like UserGroupData, whose instances only
+    ever carry one of the fields: a model per field, with just that
+    field, validators and all.  Use them through
+    validate_event_with_stand_in, so that errors read the same.
+    """
+    return {
+        key: create_model(f"{model.__name__}_{key}", **{key: (field.annotation, field)})  # type: ignore[call-overload]
+        for key, field in model.model_fields.items()
+    }
+
+
+GROUP_SETTING_DATA_TYPES = single_field_models(GroupSettingUpdateData)
+USER_GROUP_UPDATE_TYPES: dict[str, EventModel] = {
+    key: create_model(
+        f"EventUserGroupUpdate_{key}", __base__=EventUserGroupUpdate, data=(data_model, ...)
+    )
+    for key, data_model in single_field_models(UserGroupData).items()
+}
 
 
 def check_user_group_update(var_name: str, event: dict[str, object], field: str) -> None:
+    # The usual case: data has just the one field, so we validate that
+    # instead of UserGroupData's 9 optional fields.
+    data = event.get("data")
+    if type(data) is dict and len(data) == 1 and field in data and field in USER_GROUP_UPDATE_TYPES:
+        validate_event_with_stand_in(event, USER_GROUP_UPDATE_TYPES[field], EventUserGroupUpdate)
+        return
+
     _check_user_group_update(var_name, event)
 
     assert isinstance(event["data"], dict)
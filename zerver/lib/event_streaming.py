@@ -0,0 +1,88 @@
+# Item-by-item validation for the events that resend a whole list
+# every time one entry changes: custom_profile_fields, realm_linkifiers,
+# realm_playgrounds and default_stream_groups.
+#
+# model_validate() on such an event builds a model instance for every
+# item before we see any of them, which for realms with very large
+# configurations means a big spike in memory.  StreamingValidator
+# instead validates the rest of the event up front, and then the list
+# one item at a time as the caller consumes it, dropping each instance
+# right away.  Errors are reported as the model would report them
+# (same error types and locations, e.g. realm_linkifiers.3.pattern).
+from collections.abc import Iterator
+from typing import Any, get_args
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import InitErrorDetails
+
+from zerver.lib.event_fanout import envelope_model
+
+
+def error_details(error: Any, prefix: tuple[str | int, ...] = ()) -> InitErrorDetails:
+    details = InitErrorDetails(
+        type=error["type"], loc=(*prefix, *error["loc"]), input=error["input"]
+    )
+    if "ctx" in error:
+        details["ctx"] = error["ctx"]
+    return details
+
+
+class StreamingValidator:
+    def __init__(self, model: type[BaseModel], list_key: str) -> None:
+        self.model = model
+        self.list_key = list_key
+        self.allowed_fields = frozenset(model.model_fields)
+        self.field_order = {key: i for i, key in enumerate(model.model_fields)}
+        [item_annotation] = get_args(model.model_fields[list_key].annotation)
+        self.item: TypeAdapter[Any] = TypeAdapter(item_annotation)
+        self.envelope = envelope_model(model, {list_key})
+
+    def iter_items(self, event: dict[str, Any], *, fail_fast: bool = True) -> Iterator[Any]:
+        """Yields the items of event[list_key] as they pass validation
+        (the original items, not model instances).
+
+        With fail_fast, the first invalid item raises its error.
+        Otherwise we go on yielding the valid items, and raise one
+        ValidationError with all the errors at the end, just like
+        model_validate() would have.
+        """
+        if not event.keys() <= self.allowed_fields:
+            raise ValueError(f"Extra fields not allowed: {set(event) - self.allowed_fields}")
+
+        errors: list[InitErrorDetails] = []
+        try:
+            self.envelope.model_validate(event, strict=True)
+        except ValidationError as e:
+            errors.extend(error_details(error) for error in e.errors())
+            if fail_fast:
+                self.raise_errors(errors)
+
+        items = event.get(self.list_key)
+        if type(items) is not list:
+            # Nothing to stream; let the model produce the usual error.
+            self.model.model_validate(event, strict=True)
+        assert isinstance(items, list)
+
+        for index, item in enumerate(items):
+            try:
+                self.item.validate_python(item, strict=True)
+            except ValidationError as e:
+                prefix = (self.list_key, index)
+                errors.extend(error_details(error, prefix) for error in e.errors())
+                if fail_fast:
+                    break
+                continue
+            yield item
+
+        if errors:
+            self.raise_errors(errors)
+
+    def validate(self, event: dict[str, Any], *, fail_fast: bool = True) -> None:
+        for _ in self.iter_items(event, fail_fast=fail_fast):
+            pass
+
+    def raise_errors(self, errors: list[InitErrorDetails]) -> None:
+        # The envelope's errors come first, but the model lists them in
+        # field order.
+        errors.sort(key=lambda error: self.field_order.get(error["loc"][0], -1))
+        raise ValidationError.from_exception_data(self.model.__name__, errors)
@@ -2,7 +2,7 @@ from typing import Annotated, Literal
 
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
-from pydantic import AfterValidator, BaseModel
+from pydantic import AfterValidator, BaseModel, ConfigDict
 
 from zerver.lib.types import AnonymousSettingGroupDict
 
@@ -38,14 +38,22 @@ class Attachment(BaseModel):
     messages: list[AttachmentMessage]
 
 
-class EventAttachmentAdd(BaseModel):
+class EventAttachmentBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["attachment"]
-    op: Literal["add"]
+    op: Literal["add", "update"]
     attachment: Attachment
     upload_space_used: int
     id: int
 
 
+class EventAttachmentAdd(EventAttachmentBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["add"]
+
+
 class AttachmentFieldForEventAttachmentRemove(BaseModel):
     id: int
 
@@ -58,15 +66,13 @@ class EventAttachmentRemove(BaseModel):
     id: int
 
 
-class EventAttachmentUpdate(BaseModel):
-    type: Literal["attachment"]
+class EventAttachmentUpdate(EventAttachmentBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["update"]
-    attachment: Attachment
-    upload_space_used: int
-    id: int
 
 
-class DetailedCustomProfileCore(BaseModel):
+class DetailedCustomProfile(BaseModel):
     id: int
     type: int
     name: str
@@ -75,9 +81,6 @@ class DetailedCustomProfileCore(BaseModel):
     order: int
     required: bool
     editable_by_user: bool
-
-
-class DetailedCustomProfile(DetailedCustomProfileCore):
     # TODO: fix types to avoid optional fields
     display_in_profile_summary: bool | None = None
 
@@ -107,13 +110,10 @@ class EventDefaultStreams(BaseModel):
     id: int
 
 
-class EventDeleteMessageCore(BaseModel):
+class EventDeleteMessage(BaseModel):
     type: Literal["delete_message"]
     message_type: Literal["private", "stream"]
     id: int
-
-
-class EventDeleteMessage(EventDeleteMessageCore):
     # TODO: fix types to avoid optional fields
     message_id: int | None = None
     message_ids: list[int] | None = None
@@ -133,7 +133,9 @@ class DirectMessageDisplayRecipient(BaseModel):
     full_name: str
 
 
-class MessageFieldForEventDirectMessage(BaseModel):
+class MessageFieldForEventBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     avatar_url: str | None
     client: str
     content: str
@@ -151,6 +153,11 @@ class MessageFieldForEventDirectMessage(BaseModel):
     submessages: list[dict[str, object]]
     timestamp: int
     type: str
+
+
+class MessageFieldForEventDirectMessage(MessageFieldForEventBase):
+    model_config = ConfigDict(defer_build=False)
+
     display_recipient: list[DirectMessageDisplayRecipient]
 
 
@@ -161,15 +168,12 @@ class EventDirectMessage(BaseModel):
     id: int
 
 
-class DraftFieldsCore(BaseModel):
+class DraftFields(BaseModel):
     id: int
     type: Literal["", "private", "stream"]
     to: list[int]
     topic: str
     content: str
-
-
-class DraftFields(DraftFieldsCore):
     # TODO: fix types to avoid optional fields
     timestamp: int | None = None
 
@@ -211,24 +215,9 @@ class EventInvitesChanged(BaseModel):
     id: int
 
 
-class MessageFieldForEventMessage(BaseModel):
-    avatar_url: str | None
-    client: str
-    content: str
-    content_type: Literal["text/html"]
-    id: int
-    is_me_message: bool
-    reactions: list[dict[str, object]]
-    recipient_id: int
-    sender_realm_str: str
-    sender_email: str
-    sender_full_name: str
-    sender_id: int
-    subject: str
-    topic_links: list[TopicLink]
-    submessages: list[dict[str, object]]
-    timestamp: int
-    type: str
+class MessageFieldForEventMessage(MessageFieldForEventBase):
+    model_config = ConfigDict(defer_build=False)
+
     display_recipient: str
     stream_id: int
 
@@ -275,22 +264,21 @@ class Presence(BaseModel):
     pushable: bool
 
 
-class EventPresenceCore(BaseModel):
+class EventPresence(BaseModel):
     type: Literal["presence"]
     user_id: int
     server_timestamp: float | int
     presence: dict[str, Presence]
     id: int
-
-
-class EventPresence(EventPresenceCore):
     # TODO: fix types to avoid optional fields
     email: str | None = None
 
 
-class EventReactionAdd(BaseModel):
+class EventReactionBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["reaction"]
-    op: Literal["add"]
+    op: Literal["add", "remove"]
     message_id: int
     emoji_name: str
     emoji_code: str
@@ -299,15 +287,16 @@ class EventReactionAdd(BaseModel):
     id: int
 
 
-class EventReactionRemove(BaseModel):
-    type: Literal["reaction"]
+class EventReactionAdd(EventReactionBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["add"]
+
+
+class EventReactionRemove(EventReactionBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["remove"]
-    message_id: int
-    emoji_name: str
-    emoji_code: str
-    reaction_type: Literal["realm_emoji", "unicode_emoji", "zulip_extra_emoji"]
-    user_id: int
-    id: int
 
 
 class BotServicesOutgoing(BaseModel):
@@ -354,11 +343,8 @@ class EventRealmBotDelete(BaseModel):
     id: int
 
 
-class BotTypeForUpdateCore(BaseModel):
+class BotTypeForUpdate(BaseModel):
     user_id: int
-
-
-class BotTypeForUpdate(BotTypeForUpdateCore):
     # TODO: fix types to avoid optional fields
     api_key: str | None = None
     avatar_url: str | None = None
@@ -390,18 +376,25 @@ class RealmDomain(BaseModel):
     allow_subdomains: bool
 
 
-class EventRealmDomainsAdd(BaseModel):
+class EventRealmDomainsBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["realm_domains"]
-    op: Literal["add"]
+    op: Literal["add", "change"]
     realm_domain: RealmDomain
     id: int
 
 
-class EventRealmDomainsChange(BaseModel):
-    type: Literal["realm_domains"]
+class EventRealmDomainsAdd(EventRealmDomainsBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["add"]
+
+
+class EventRealmDomainsChange(EventRealmDomainsBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["change"]
-    realm_domain: RealmDomain
-    id: int
 
 
 class EventRealmDomainsRemove(BaseModel):
@@ -480,12 +473,9 @@ class AllowMessageEditingData(BaseModel):
     allow_message_editing: bool
 
 
-class AuthenticationMethodDictCore(BaseModel):
+class AuthenticationMethodDict(BaseModel):
     enabled: bool
     available: bool
-
-
-class AuthenticationMethodDict(AuthenticationMethodDictCore):
     # TODO: fix types to avoid optional fields
     unavailable_reason: str | None = None
 
@@ -521,11 +511,7 @@ class NightLogoData(BaseModel):
     night_logo_source: str
 
 
-class GroupSettingUpdateDataCore(BaseModel):
-    pass
-
-
-class GroupSettingUpdateData(GroupSettingUpdateDataCore):
+class GroupSettingUpdateData(BaseModel):
     # TODO: fix types to avoid optional fields
     create_multiuse_invite_group: int | AnonymousSettingGroupDict | None = None
     can_access_all_users_group: int | AnonymousSettingGroupDict | None = None
@@ -634,12 +620,9 @@ class PersonBotOwnerId(BaseModel):
     bot_owner_id: int
 
 
-class CustomProfileFieldCore(BaseModel):
+class CustomProfileField(BaseModel):
     id: int
     value: str | None
-
-
-class CustomProfileField(CustomProfileFieldCore):
     # TODO: fix types to avoid optional fields
     rendered_value: str | None = None
 
@@ -659,9 +642,8 @@ class PersonEmail(BaseModel):
     new_email: str
 
 
-class PersonFullName(BaseModel):
-    user_id: int
-    full_name: str
+class PersonFullName(RemovedUser):
+    pass
 
 
 class PersonIsBillingAdmin(BaseModel):
@@ -733,7 +715,7 @@ class EventSavedSnippetRemove(BaseModel):
     id: int
 
 
-class ScheduledMessageFieldsCore(BaseModel):
+class ScheduledMessageFields(BaseModel):
     scheduled_message_id: int
     type: Literal["private", "stream"]
     to: list[int] | int
@@ -741,9 +723,6 @@ class ScheduledMessageFieldsCore(BaseModel):
     rendered_content: str
     scheduled_delivery_timestamp: int
     failed: bool
-
-
-class ScheduledMessageFields(ScheduledMessageFieldsCore):
     # TODO: fix types to avoid optional fields
     topic: str | None = None
 
@@ -790,21 +769,28 @@ class BasicStreamFields(BaseModel):
     stream_weekly_traffic: int | None
 
 
-class EventStreamCreate(BaseModel):
+class EventStreamBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["stream"]
-    op: Literal["create"]
+    op: Literal["create", "delete"]
     streams: list[BasicStreamFields]
     id: int
 
 
-class EventStreamDelete(BaseModel):
-    type: Literal["stream"]
+class EventStreamCreate(EventStreamBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["create"]
+
+
+class EventStreamDelete(EventStreamBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["delete"]
-    streams: list[BasicStreamFields]
-    id: int
 
 
-class EventStreamUpdateCore(BaseModel):
+class EventStreamUpdate(BaseModel):
     type: Literal["stream"]
     op: Literal["update"]
     property: str
@@ -812,9 +798,6 @@ class EventStreamUpdateCore(BaseModel):
     name: str
     stream_id: int
     id: int
-
-
-class EventStreamUpdate(EventStreamUpdateCore):
     # TODO: fix types to avoid optional fields
     rendered_description: str | None = None
     history_public_to_subscribers: bool | None = None
@@ -869,20 +852,26 @@ class EventSubscriptionAdd(BaseModel):
     id: int
 
 
-class EventSubscriptionPeerAdd(BaseModel):
+class EventSubscriptionPeerBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["subscription"]
-    op: Literal["peer_add"]
+    op: Literal["peer_add", "peer_remove"]
     user_ids: list[int]
     stream_ids: list[int]
     id: int
 
 
-class EventSubscriptionPeerRemove(BaseModel):
-    type: Literal["subscription"]
+class EventSubscriptionPeerAdd(EventSubscriptionPeerBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["peer_add"]
+
+
+class EventSubscriptionPeerRemove(EventSubscriptionPeerBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["peer_remove"]
-    user_ids: list[int]
-    stream_ids: list[int]
-    id: int
 
 
 class RemoveSub(BaseModel):
@@ -911,45 +900,38 @@ class TypingPerson(BaseModel):
     user_id: int
 
 
-class EventTypingStartCore(BaseModel):
+class EventTypingBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["typing"]
-    op: Literal["start"]
+    op: Literal["start", "stop"]
     message_type: Literal["direct", "stream"]
     sender: TypingPerson
     id: int
-
-
-class EventTypingStart(EventTypingStartCore):
     # TODO: fix types to avoid optional fields
     recipients: list[TypingPerson] | None = None
     stream_id: int | None = None
     topic: str | None = None
 
 
-class EventTypingStopCore(BaseModel):
-    type: Literal["typing"]
-    op: Literal["stop"]
-    message_type: Literal["direct", "stream"]
-    sender: TypingPerson
-    id: int
+class EventTypingStart(EventTypingBase):
+    model_config = ConfigDict(defer_build=False)
 
+    op: Literal["start"]
 
-class EventTypingStop(EventTypingStopCore):
-    # TODO: fix types to avoid optional fields
-    recipients: list[TypingPerson] | None = None
-    stream_id: int | None = None
-    topic: str | None = None
+
+class EventTypingStop(EventTypingBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["stop"]
 
 
-class EventUpdateDisplaySettingsCore(BaseModel):
+class EventUpdateDisplaySettings(BaseModel):
     type: Literal["update_display_settings"]
     setting_name: str
     setting: bool | int | str
     user: str
     id: int
-
-
-class EventUpdateDisplaySettings(EventUpdateDisplaySettingsCore):
     # TODO: fix types to avoid optional fields
     language_name: str | None = None
 
@@ -962,7 +944,7 @@ class EventUpdateGlobalNotifications(BaseModel):
     id: int
 
 
-class EventUpdateMessageCore(BaseModel):
+class EventUpdateMessage(BaseModel):
     type: Literal["update_message"]
     user_id: int | None
     edit_timestamp: int
@@ -971,9 +953,6 @@ class EventUpdateMessageCore(BaseModel):
     message_ids: list[int]
     rendering_only: bool
     id: int
-
-
-class EventUpdateMessage(EventUpdateMessageCore):
     # TODO: fix types to avoid optional fields
     stream_id: int | None = None
     stream_name: str | None = None
@@ -999,11 +978,8 @@ class EventUpdateMessageFlagsAdd(BaseModel):
     id: int
 
 
-class MessageDetailsCore(BaseModel):
+class MessageDetails(BaseModel):
     type: Literal["private", "stream"]
-
-
-class MessageDetails(MessageDetailsCore):
     # TODO: fix types to avoid optional fields
     mentioned: bool | None = None
     user_ids: list[int] | None = None
@@ -1012,7 +988,7 @@ class MessageDetails(MessageDetailsCore):
     unmuted_stream_msg: bool | None = None
 
 
-class EventUpdateMessageFlagsRemoveCore(BaseModel):
+class EventUpdateMessageFlagsRemove(BaseModel):
     type: Literal["update_message_flags"]
     op: Literal["remove"]
     operation: Literal["remove"]
@@ -1020,9 +996,6 @@ class EventUpdateMessageFlagsRemoveCore(BaseModel):
     messages: list[int]
     all: bool
     id: int
-
-
-class EventUpdateMessageFlagsRemove(EventUpdateMessageFlagsRemoveCore):
     # TODO: fix types to avoid optional fields
     message_details: dict[str, MessageDetails] | None = None
 
@@ -1052,22 +1025,38 @@ class EventUserGroupAdd(BaseModel):
     id: int
 
 
-class EventUserGroupAddMembers(BaseModel):
+class EventUserGroupMembersBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["user_group"]
-    op: Literal["add_members"]
+    op: Literal["add_members", "remove_members"]
     group_id: int
     user_ids: list[int]
     id: int
 
 
-class EventUserGroupAddSubgroups(BaseModel):
+class EventUserGroupAddMembers(EventUserGroupMembersBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["add_members"]
+
+
+class EventUserGroupSubgroupsBase(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Literal["user_group"]
-    op: Literal["add_subgroups"]
+    op: Literal["add_subgroups", "remove_subgroups"]
     group_id: int
     direct_subgroup_ids: list[int]
     id: int
 
 
+class EventUserGroupAddSubgroups(EventUserGroupSubgroupsBase):
+    model_config = ConfigDict(defer_build=False)
+
+    op: Literal["add_subgroups"]
+
+
 class EventUserGroupRemove(BaseModel):
     type: Literal["user_group"]
     op: Literal["remove"]
@@ -1075,27 +1064,19 @@ class EventUserGroupRemove(BaseModel):
     id: int
 
 
-class EventUserGroupRemoveMembers(BaseModel):
-    type: Literal["user_group"]
+class EventUserGroupRemoveMembers(EventUserGroupMembersBase):
+    model_config = ConfigDict(defer_build=False)
+
     op: Literal["remove_members"]
-    group_id: int
-    user_ids: list[int]
-    id: int
 
 
-class EventUserGroupRemoveSubgroups(BaseModel):
-    type: Literal["user_group"]
-    op: Literal["remove_subgroups"]
-    group_id: int
-    direct_subgroup_ids: list[int]
-    id: int
-
+class EventUserGroupRemoveSubgroups(EventUserGroupSubgroupsBase):
+    model_config = ConfigDict(defer_build=False)
 
-class UserGroupDataCore(BaseModel):
-    pass
+    op: Literal["remove_subgroups"]
 
 
-class UserGroupData(UserGroupDataCore):
+class UserGroupData(BaseModel):
     # TODO: fix types to avoid optional fields
     name: str | None = None
     description: str | None = None
@@ -1116,26 +1097,20 @@ class EventUserGroupUpdate(BaseModel):
     id: int
 
 
-class EventUserSettingsUpdateCore(BaseModel):
+class EventUserSettingsUpdate(BaseModel):
     type: Literal["user_settings"]
     op: Literal["update"]
     property: str
     value: bool | int | str
     id: int
-
-
-class EventUserSettingsUpdate(EventUserSettingsUpdateCore):
     # TODO: fix types to avoid optional fields
     language_name: str | None = None
 
 
-class EventUserStatusCore(BaseModel):
+class EventUserStatus(BaseModel):
     type: Literal["user_status"]
     user_id: int
     id: int
-
-
-class EventUserStatus(EventUserStatusCore):
     # TODO: fix types to avoid optional fields
     away: bool | None = None
     status_text: str | None = None